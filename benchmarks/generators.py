@@ -0,0 +1,87 @@
+# Copyright (c) 2022, Skolkovo Institute of Science and Technology (Skoltech)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from __future__ import annotations
+
+from typing import Any, Tuple
+from nptyping import NDArray
+
+import numpy as np
+
+# Largest label of sparse label sets, labels are spread over this range
+SPARSE_LABEL_RANGE = 1 << 30
+
+
+def __plane_labels(
+    planes_amount: int,
+    sparse_labels: bool,
+    generator: np.random.Generator,
+) -> NDArray[Any, np.int64]:
+    """
+    :param planes_amount: amount of planes
+    :param sparse_labels: spread labels over a wide range instead of numbering planes from one
+    :param generator: source of random numbers
+    :return: label of every plane, all different from zero
+    """
+    if not sparse_labels:
+        return np.arange(1, planes_amount + 1)
+
+    return generator.choice(SPARSE_LABEL_RANGE - 1, planes_amount, replace=False) + 1
+
+
+def synthetic_frame(
+    points_amount: int,
+    planes_amount: int,
+    unsegmented_fraction: np.float64 = 0.1,
+    sparse_labels: bool = False,
+    noise_fraction: np.float64 = 0.05,
+    seed: int = 0,
+) -> Tuple[NDArray[Any, np.int64], NDArray[Any, np.int64]]:
+    """
+    Generates labels of a segmented frame: ground truth planes of random sizes and
+    their prediction with split and merged planes, noisy borders and missed points
+    :param points_amount: amount of points in the frame
+    :param planes_amount: amount of ground truth planes
+    :param unsegmented_fraction: share of points labeled as unsegmented (zero) in both labels
+    :param sparse_labels: spread labels over a wide range instead of numbering planes from one
+    :param noise_fraction: share of points assigned to a random predicted plane
+    :param seed: seed of random numbers, equal seeds give equal frames
+    :return: predicted and ground truth labels of points
+    """
+    generator = np.random.default_rng(seed)
+
+    plane_sizes = generator.dirichlet(np.ones(planes_amount)) * points_amount
+    plane_borders = np.cumsum(plane_sizes).astype(np.int64)
+    gt_planes = np.searchsorted(plane_borders, np.arange(points_amount), side="right")
+    gt_planes = np.minimum(gt_planes, planes_amount - 1)
+
+    # Every tenth plane is split in two and every tenth pair of neighbours is merged
+    pred_planes = gt_planes.copy()
+    split = (gt_planes % 10 == 0) & (generator.random(points_amount) < 0.5)
+    pred_planes[split] += planes_amount
+    merged = gt_planes % 10 == 5
+    pred_planes[merged] -= 1
+    noisy = generator.random(points_amount) < noise_fraction
+    pred_planes[noisy] = generator.integers(0, planes_amount, np.count_nonzero(noisy))
+
+    gt_labels = __plane_labels(planes_amount, sparse_labels, generator)[gt_planes]
+    pred_labels = __plane_labels(2 * planes_amount, sparse_labels, generator)[
+        pred_planes
+    ]
+    gt_labels[generator.random(points_amount) < unsegmented_fraction] = 0
+    pred_labels[generator.random(points_amount) < unsegmented_fraction] = 0
+
+    # Points of a real frame are not ordered by planes
+    order = generator.permutation(points_amount)
+
+    return pred_labels[order], gt_labels[order]
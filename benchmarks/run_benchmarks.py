@@ -0,0 +1,304 @@
+# Copyright (c) 2022, Skolkovo Institute of Science and Technology (Skoltech)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Measures time and peak memory of evops metrics on synthetic frames while one
+parameter of the frames is swept at a time, and compares them with baselines
+saved by previous runs. Runs offline with numpy and evops only.
+
+    python benchmarks/run_benchmarks.py --quick --save-baseline main
+    python benchmarks/run_benchmarks.py --quick --compare main
+
+The installed evops is measured, and entry points missing from it are skipped,
+so a baseline of a released version is saved from an environment with only that
+version installed, e.g. for evops 0.1.3, which has the single metric functions:
+
+    python -m venv /tmp/evops-0.1.3
+    /tmp/evops-0.1.3/bin/pip install evops==0.1.3
+    /tmp/evops-0.1.3/bin/python benchmarks/run_benchmarks.py --quick --save-baseline 0.1.3
+    python benchmarks/run_benchmarks.py --quick --compare 0.1.3
+
+Baselines are saved to benchmarks/baselines and depend on the machine, so they
+are compared only with runs on the same machine.
+"""
+from __future__ import annotations
+
+from typing import Any, Callable, Dict, List, Optional
+from nptyping import NDArray
+
+import argparse
+import json
+import os
+import platform
+import sys
+import time
+import tracemalloc
+
+import numpy as np
+
+import evops
+import evops.metrics
+import evops.metrics.constants
+from evops.metrics import dice, fScore, iou, mean, multi_value, precision, recall
+
+from generators import synthetic_frame
+
+BASELINES_DIRECTORY = os.path.join(os.path.dirname(__file__), "baselines")
+
+# Parameters of the frame every sweep starts from
+DEFAULT_FRAME = {
+    "points_amount": 300_000,
+    "planes_amount": 100,
+    "unsegmented_fraction": 0.1,
+    "sparse_labels": False,
+}
+
+# Every sweep changes one parameter of the default frame
+SWEEPS = {
+    "points": ("points_amount", [10_000, 100_000, 1_000_000, 10_000_000]),
+    "planes": ("planes_amount", [10, 100, 1000, 10_000]),
+    "sparse_labels": ("sparse_labels", [False, True]),
+    "unsegmented_fraction": ("unsegmented_fraction", [0.0, 0.1, 0.5, 0.9]),
+}
+
+# Quick runs skip the largest frames
+QUICK_LIMITS = {"points_amount": 1_000_000, "planes_amount": 1000}
+
+# Settings of every benchmark
+UNSEGMENTED_LABEL = 0
+IOU_THRESHOLD = 0.75
+
+# Metrics of every evops version, reading settings from evops.metrics.constants
+LEGACY_BENCHMARKS = {
+    "precision": lambda pred, gt: precision(pred, gt, "iou"),
+    "recall": lambda pred, gt: recall(pred, gt, "iou"),
+    "fScore": lambda pred, gt: fScore(pred, gt, "iou"),
+    "mean_iou": lambda pred, gt: mean(pred, gt, iou),
+    "mean_dice": lambda pred, gt: mean(pred, gt, dice),
+    "multi_value": lambda pred, gt: multi_value(pred, gt),
+}
+
+
+def __config_benchmarks() -> Dict[str, Callable[[NDArray, NDArray], Any]]:
+    """
+    :return: benchmarks of the entry points taking settings of evaluation
+        that the installed evops has, none for evops 0.1.3
+    """
+    metrics = evops.metrics
+    if not hasattr(metrics, "EvaluationConfig"):
+        return {}
+
+    config = metrics.EvaluationConfig(
+        unsegmented_labels=UNSEGMENTED_LABEL, iou_threshold=IOU_THRESHOLD
+    )
+    benchmarks = {
+        "evaluate": lambda pred, gt: metrics.evaluate(pred, gt, config=config),
+        "evaluate_batch": lambda pred, gt: metrics.evaluate_batch(
+            pred, gt, np.linspace(0, pred.size, 5).astype(np.int64), config=config
+        ),
+        "precision_recall_curve": lambda pred, gt: metrics.precision_recall_curve(
+            pred, gt, config=config
+        ),
+        "match_optimal": lambda pred, gt: metrics.match(
+            pred, gt, config=config.replace(matching="optimal", iou_threshold=0.25)
+        ),
+    }
+    entry_points = {"match_optimal": "match"}
+
+    return {
+        name: benchmark
+        for name, benchmark in benchmarks.items()
+        if hasattr(metrics, entry_points.get(name, name))
+    }
+
+
+BENCHMARKS = {**LEGACY_BENCHMARKS, **__config_benchmarks()}
+
+
+def __measure(
+    benchmark: Callable[[NDArray, NDArray], Any],
+    pred_labels: NDArray[Any, np.int64],
+    gt_labels: NDArray[Any, np.int64],
+    repeat: int,
+) -> Dict[str, np.float64]:
+    """
+    :param benchmark: metric function of predicted and ground truth labels
+    :param repeat: amount of timed runs, the fastest one is reported
+    :return: time in seconds and peak of allocated memory in bytes
+    """
+    times = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        benchmark(pred_labels, gt_labels)
+        times.append(time.perf_counter() - start)
+
+    # Memory is traced in a separate run as tracing slows allocations down
+    tracemalloc.start()
+    benchmark(pred_labels, gt_labels)
+    peak_memory = tracemalloc.get_traced_memory()[1]
+    tracemalloc.stop()
+
+    return {"seconds": min(times), "peak_bytes": peak_memory}
+
+
+def __run(
+    sweeps: List[str],
+    metrics: List[str],
+    repeat: int,
+    quick: bool,
+) -> List[Dict[str, Any]]:
+    """
+    :return: parameters of the frame, metric name, time and memory of every measurement
+    """
+    results = []
+    for sweep in sweeps:
+        parameter, values = SWEEPS[sweep]
+        for value in values:
+            frame = dict(DEFAULT_FRAME, **{parameter: value})
+            if quick and any(
+                frame[name] > limit for name, limit in QUICK_LIMITS.items()
+            ):
+                continue
+            pred_labels, gt_labels = synthetic_frame(**frame)
+            for metric in metrics:
+                measurement = __measure(
+                    BENCHMARKS[metric], pred_labels, gt_labels, repeat
+                )
+                results.append(
+                    {"sweep": sweep, "frame": frame, "metric": metric, **measurement}
+                )
+                print(
+                    "{:<22} {:<28} {:<22} {:>10.2f} ms {:>10.1f} MB".format(
+                        sweep,
+                        "{}={}".format(parameter, value),
+                        metric,
+                        measurement["seconds"] * 1000,
+                        measurement["peak_bytes"] / 2**20,
+                    ),
+                    flush=True,
+                )
+
+    return results
+
+
+def __result_key(result: Dict[str, Any]) -> str:
+    return json.dumps([result["sweep"], result["frame"], result["metric"]])
+
+
+def __compare(
+    results: List[Dict[str, Any]],
+    baseline: Dict[str, Any],
+    max_slowdown: np.float64,
+) -> bool:
+    """
+    :param results: current measurements
+    :param baseline: measurements saved by a previous run
+    :param max_slowdown: largest allowed ratio of current and baseline times
+    :return: true if no measurement is slower than allowed
+    """
+    baseline_results = {__result_key(result): result for result in baseline["results"]}
+    passed = True
+    print("\nComparison with evops {}".format(baseline["environment"]["evops"]))
+    for result in results:
+        previous = baseline_results.get(__result_key(result))
+        if previous is None:
+            continue
+        slowdown = result["seconds"] / max(previous["seconds"], 1e-9)
+        memory_ratio = result["peak_bytes"] / max(previous["peak_bytes"], 1)
+        regressed = slowdown > max_slowdown
+        passed = passed and not regressed
+        print(
+            "{:<22} {:<60} time x{:<8.2f} memory x{:<8.2f} {}".format(
+                result["metric"],
+                json.dumps(result["frame"]),
+                slowdown,
+                memory_ratio,
+                "REGRESSION" if regressed else "",
+            )
+        )
+
+    return passed
+
+
+def __environment() -> Dict[str, str]:
+    return {
+        "evops": evops.__version__,
+        "numpy": np.__version__,
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "processor": platform.processor() or platform.machine(),
+    }
+
+
+def main(arguments: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--sweeps", nargs="+", choices=SWEEPS, default=list(SWEEPS))
+    parser.add_argument(
+        "--metrics", nargs="+", choices=BENCHMARKS, default=list(BENCHMARKS)
+    )
+    parser.add_argument("--repeat", type=int, default=3, help="timed runs per case")
+    parser.add_argument(
+        "--quick", action="store_true", help="skip frames over 1M points or 1k planes"
+    )
+    parser.add_argument("--output", help="path to save the results as JSON")
+    parser.add_argument("--save-baseline", metavar="NAME", help="save as a baseline")
+    parser.add_argument("--compare", metavar="NAME", help="compare with a baseline")
+    parser.add_argument(
+        "--max-slowdown",
+        type=float,
+        default=1.25,
+        help="time ratio to the baseline reported as a regression",
+    )
+    arguments = parser.parse_args(arguments)
+
+    constants = (
+        evops.metrics.constants.UNSEGMENTED_LABEL,
+        evops.metrics.constants.IOU_THRESHOLD,
+    )
+    evops.metrics.constants.UNSEGMENTED_LABEL = UNSEGMENTED_LABEL
+    evops.metrics.constants.IOU_THRESHOLD = IOU_THRESHOLD
+    try:
+        report = {
+            "environment": __environment(),
+            "results": __run(
+                arguments.sweeps, arguments.metrics, arguments.repeat, arguments.quick
+            ),
+        }
+    finally:
+        (
+            evops.metrics.constants.UNSEGMENTED_LABEL,
+            evops.metrics.constants.IOU_THRESHOLD,
+        ) = constants
+
+    paths = [arguments.output] if arguments.output else []
+    if arguments.save_baseline:
+        os.makedirs(BASELINES_DIRECTORY, exist_ok=True)
+        paths.append(
+            os.path.join(BASELINES_DIRECTORY, arguments.save_baseline + ".json")
+        )
+    for path in paths:
+        with open(path, "w") as file:
+            json.dump(report, file, indent=2)
+
+    if arguments.compare:
+        path = os.path.join(BASELINES_DIRECTORY, arguments.compare + ".json")
+        with open(path) as file:
+            baseline = json.load(file)
+        if not __compare(report["results"], baseline, arguments.max_slowdown):
+            return 1
+
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
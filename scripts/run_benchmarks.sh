@@ -0,0 +1,5 @@
+#!/bin/bash
+
+# Baselines are saved to benchmarks/baselines, e.g. with --save-baseline main,
+# and runs are compared with them using --compare main
+python3 benchmarks/run_benchmarks.py "$@"
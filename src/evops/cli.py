@@ -0,0 +1,365 @@
+# Copyright (c) 2022, Skolkovo Institute of Science and Technology (Skoltech)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+"""
+Evaluates a dataset of label files from the command line, writing the values
+of every frame as soon as they are computed, so interrupted runs are resumed
+
+    evops --pred-dir results --gt-dir dataset/labels --output results.csv
+    evops --manifest frames.csv --output results.jsonl --workers 8 --resume
+"""
+from functools import partial
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    TextIO,
+    Tuple,
+)
+
+import argparse
+import csv
+import json
+import os
+import sys
+
+import numpy as np
+
+from evops.utils.EvaluationConfig import EvaluationConfig
+from evops.utils.Matching import MATCHING_STRATEGIES
+
+OUTPUT_FORMATS = (".csv", ".jsonl")
+# Nested values are written to columns named by the path to them
+COLUMN_SEPARATOR = "."
+
+
+def __directory_files(directory: str) -> Dict[str, str]:
+    """
+    :param directory: directory with label files, possibly in subdirectories
+    :return: paths to files by their paths relative to the directory without extensions
+    """
+    files = {}
+    for root, _, names in os.walk(directory):
+        for name in names:
+            path = os.path.join(root, name)
+            frame = os.path.splitext(os.path.relpath(path, directory))[0]
+            frame = frame.replace(os.sep, "/")
+            assert (
+                frame not in files
+            ), "Files {} and {} have the same frame name {}, keep one of them".format(
+                files.get(frame), path, frame
+            )
+            files[frame] = path
+
+    return files
+
+
+def __directory_frames(
+    pred_directory: str, gt_directory: str
+) -> List[Tuple[str, str, str]]:
+    """
+    :param pred_directory: directory with predicted label files
+    :param gt_directory: directory with reference label files
+    :return: name, predicted and reference label file of every frame, files of
+        a frame have the same relative path up to extension
+    """
+    pred_files = __directory_files(pred_directory)
+    gt_files = __directory_files(gt_directory)
+    missed = len(gt_files.keys() - pred_files.keys())
+    if missed != 0:
+        print(
+            "{} ground truth frames have no predictions".format(missed),
+            file=sys.stderr,
+        )
+
+    return [
+        (frame, pred_files[frame], gt_files[frame])
+        for frame in sorted(pred_files.keys() & gt_files.keys())
+    ]
+
+
+def __manifest_frames(manifest: str) -> List[Tuple[str, str, str]]:
+    """
+    :param manifest: CSV file with a row of predicted label file, reference label file
+        and optionally frame name for every frame, relative paths start at its directory
+    :return: name, predicted and reference label file of every frame
+    """
+    directory = os.path.dirname(os.path.abspath(manifest))
+    frames = []
+    with open(manifest, newline="") as file:
+        for row in csv.reader(file):
+            if len(row) == 0 or row[0].startswith("#"):
+                continue
+            assert len(row) in (
+                2,
+                3,
+            ), "Incorrect manifest row, expected pred,gt[,frame]"
+            pred_path, gt_path = (os.path.join(directory, path) for path in row[:2])
+            frames.append((row[2] if len(row) == 3 else row[0], pred_path, gt_path))
+    names = [name for name, _, _ in frames]
+    assert len(set(names)) == len(
+        names
+    ), "Incorrect manifest, frame names must be unique"
+
+    return frames
+
+
+def __flatten(report: Dict[str, Any], prefix: str = "") -> Dict[str, Any]:
+    """
+    :param report: evaluate() values of a frame
+    :param prefix: path to the values in outer dictionaries
+    :return: values by column names, converted to built-in types
+    """
+    row = {}
+    for name, value in report.items():
+        if isinstance(value, dict):
+            row.update(__flatten(value, prefix + name + COLUMN_SEPARATOR))
+        else:
+            row[prefix + name] = (
+                value.item() if isinstance(value, np.generic) else value
+            )
+
+    return row
+
+
+def __unflatten(row: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    :param row: values of a frame by column names, without the frame name
+    :return: evaluate() values of the frame
+    """
+    report = {}
+    for column, value in row.items():
+        *path, name = column.split(COLUMN_SEPARATOR)
+        values = report
+        for key in path:
+            values = values.setdefault(key, {})
+        # Empty CSV cells are missing values
+        if value == "":
+            value = None
+        elif isinstance(value, str):
+            value = (
+                float(value)
+                if any(symbol in value for symbol in ".eEn")
+                else int(value)
+            )
+        values[name] = value
+
+    return report
+
+
+def __read_rows(output: str) -> Tuple[List[Dict[str, Any]], Optional[List[str]]]:
+    """
+    :param output: path to the output of an interrupted run, its incomplete last row is removed
+    :return: rows written by the run and CSV columns
+    """
+    if not os.path.exists(output):
+        return [], None
+
+    with open(output, "rb+") as file:
+        content = file.read()
+        file.truncate(content.rfind(b"\n") + 1)
+
+    with open(output, newline="") as file:
+        if output.endswith(".csv"):
+            reader = csv.DictReader(file)
+            return list(reader), reader.fieldnames
+
+        return [json.loads(line) for line in file if line.strip()], None
+
+
+def __row_writer(
+    file: TextIO, csv_format: bool, csv_columns: Optional[List[str]]
+) -> Callable[[Dict[str, Any]], None]:
+    """
+    :param file: output opened for appending
+    :param csv_format: write CSV rows instead of JSON lines
+    :param csv_columns: columns of CSV output written before, if any
+    :return: function appending a row, every row is flushed so the output
+        is complete up to the last evaluated frame when a run is interrupted
+    """
+    csv_writer = None if csv_columns is None else csv.DictWriter(file, csv_columns)
+
+    def write(row: Dict[str, Any]):
+        nonlocal csv_writer
+        if not csv_format:
+            file.write(json.dumps(row) + "\n")
+        else:
+            if csv_writer is None:
+                csv_writer = csv.DictWriter(file, list(row.keys()))
+                csv_writer.writeheader()
+            csv_writer.writerow(row)
+        file.flush()
+
+    return write
+
+
+def __parse_arguments(arguments: Optional[Sequence[str]]) -> argparse.Namespace:
+    defaults = EvaluationConfig()
+    parser = argparse.ArgumentParser(
+        prog="evops", description=__doc__.strip().splitlines()[0]
+    )
+    frames = parser.add_mutually_exclusive_group(required=True)
+    frames.add_argument("--pred-dir", help="directory with predicted label files")
+    frames.add_argument(
+        "--manifest", help="CSV file with rows of pred,gt[,frame] label file paths"
+    )
+    parser.add_argument("--gt-dir", help="directory with reference label files")
+    parser.add_argument(
+        "--output",
+        required=True,
+        help="output file: {}".format(", ".join(OUTPUT_FORMATS)),
+    )
+    parser.add_argument(
+        "--resume", action="store_true", help="skip frames already in the output"
+    )
+    parser.add_argument(
+        "--metrics", nargs="+", help="names of evaluated metrics, all by default"
+    )
+    parser.add_argument(
+        "--workers", type=int, help="amount of workers, CPU count by default"
+    )
+    parser.add_argument("--executor", choices=("process", "thread"), default="process")
+    parser.add_argument("--chunk-size", type=int, default=1)
+    parser.add_argument(
+        "--unsegmented-labels",
+        type=int,
+        nargs="*",
+        default=list(defaults.unsegmented_labels),
+    )
+    parser.add_argument("--iou-threshold", type=float, default=defaults.iou_threshold)
+    parser.add_argument(
+        "--overlap-threshold", type=float, default=defaults.overlap_threshold
+    )
+    parser.add_argument(
+        "--matching", choices=MATCHING_STRATEGIES, default=defaults.matching
+    )
+    parser.add_argument("--field", help="PCD or PLY field with labels")
+    parser.add_argument(
+        "--dtype", type=np.dtype, default="uint32", help="type of raw binary labels"
+    )
+    parser.add_argument(
+        "--label-field", choices=("full", "semantic", "instance"), default="full"
+    )
+    arguments = parser.parse_args(arguments)
+
+    if arguments.pred_dir is not None and arguments.gt_dir is None:
+        parser.error("--gt-dir is required with --pred-dir")
+    if not arguments.output.endswith(OUTPUT_FORMATS):
+        parser.error(
+            "--output must be one of {} files".format(", ".join(OUTPUT_FORMATS))
+        )
+    if arguments.metrics is not None:
+        # Checked after parsing, the names are kept with the evaluation modules
+        # that have to be initialized by evops.metrics first
+        import evops.metrics
+        from evops.utils.MetricsUtils import __metric_names as metric_names
+
+        unknown = [name for name in arguments.metrics if name not in metric_names]
+        if len(unknown) != 0:
+            parser.error(
+                "--metrics must be some of {}, got {}".format(
+                    ", ".join(metric_names), ", ".join(unknown)
+                )
+            )
+    if arguments.workers is not None and arguments.workers < 0:
+        parser.error("--workers must not be negative")
+    if arguments.chunk_size <= 0:
+        parser.error("--chunk-size must be positive")
+    if arguments.resume is False and os.path.exists(arguments.output):
+        parser.error("{} exists, pass --resume to continue it".format(arguments.output))
+
+    return arguments
+
+
+def main(arguments: Optional[Sequence[str]] = None) -> int:
+    """
+    :param arguments: command line arguments, sys.argv by default
+    :return: exit status
+    """
+    arguments = __parse_arguments(arguments)
+    # Evaluation modules are imported after parsing, so usage errors return at once
+    from evops.metrics.BatchBenchmark import __dataset_report as dataset_report
+    from evops.metrics.DatasetBenchmark import __iterate_dataset as iterate_dataset
+    from evops.metrics.DatasetBenchmark import __stack_reports as stack_reports
+    from evops.metrics.FilesBenchmark import (
+        __evaluate_file_pairs as evaluate_file_pairs,
+    )
+
+    if arguments.manifest is not None:
+        frames = __manifest_frames(arguments.manifest)
+    else:
+        frames = __directory_frames(arguments.pred_dir, arguments.gt_dir)
+    config = EvaluationConfig(
+        unsegmented_labels=arguments.unsegmented_labels,
+        iou_threshold=arguments.iou_threshold,
+        overlap_threshold=arguments.overlap_threshold,
+        matching=arguments.matching,
+    )
+
+    rows, csv_columns = __read_rows(arguments.output)
+    written: Set[str] = {str(row["frame"]) for row in rows}
+    frames = [frame for frame in frames if frame[0] not in written]
+
+    with open(arguments.output, "a", newline="") as file:
+        write = __row_writer(file, arguments.output.endswith(".csv"), csv_columns)
+        reports = iterate_dataset(
+            ((pred_path, gt_path) for _, pred_path, gt_path in frames),
+            config,
+            arguments.metrics,
+            arguments.workers,
+            arguments.executor,
+            arguments.chunk_size,
+            partial(
+                evaluate_file_pairs,
+                field=arguments.field,
+                dtype=arguments.dtype,
+                label_field=arguments.label_field,
+            ),
+        )
+        for (frame, _, _), report in zip(frames, reports):
+            row = {"frame": frame, **__flatten(report)}
+            assert (
+                len(rows) == 0 or row.keys() == rows[0].keys()
+            ), "{} has columns of other metrics, resume it with the same --metrics".format(
+                arguments.output
+            )
+            write(row)
+            rows.append(row)
+
+    print(
+        "Evaluated {} frames, {} frames were already in {}".format(
+            len(frames), len(written), arguments.output
+        ),
+        file=sys.stderr,
+    )
+    reports = [
+        __unflatten({name: value for name, value in row.items() if name != "frame"})
+        for row in rows
+    ]
+    complete = [report for report in reports if None not in __flatten(report).values()]
+    if len(complete) != len(reports):
+        print(
+            "{} frames with missing values are left out of the summary".format(
+                len(reports) - len(complete)
+            ),
+            file=sys.stderr,
+        )
+    if len(complete) != 0:
+        frames_report = stack_reports(complete)
+        print(json.dumps(__flatten(dataset_report(frames_report)), indent=2))
+
+    return 0
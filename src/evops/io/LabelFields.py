@@ -0,0 +1,74 @@
+# Copyright (c) 2022, Skolkovo Institute of Science and Technology (Skoltech)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from __future__ import annotations
+
+from typing import Any, Optional, Sequence
+from nptyping import NDArray
+
+import numpy as np
+
+from evops.utils.LabelEncoding import pack_rgb
+
+# Names of fields with labels of points, in the order they are looked for
+LABEL_FIELDS = ("label", "instance", "segment", "object", "class")
+# Fields with packed colors of points, used when there are no label fields
+COLOR_FIELDS = ("rgb", "rgba")
+# Separate color fields, packed into one label
+CHANNEL_FIELDS = ("red", "green", "blue")
+
+
+def __label_field_name(
+    field_names: Sequence[str],
+    field: Optional[str],
+) -> str:
+    """
+    :param field_names: names of fields of points in the file
+    :param field: name of the field with labels, looked for among LABEL_FIELDS
+        and color fields if None
+    :return: name of the field to read labels from, 'rgb' for separate color fields
+    """
+    has_channels = all(name in field_names for name in CHANNEL_FIELDS)
+    if field is None:
+        for name in LABEL_FIELDS + COLOR_FIELDS:
+            if name in field_names:
+                return name
+        field = "rgb"
+
+    assert field in field_names or (
+        field == "rgb" and has_channels
+    ), "Label field {} not found, fields of points are {}".format(
+        field, ", ".join(field_names)
+    )
+
+    return field
+
+
+def __point_labels(
+    values: NDArray[Any, np.int32],
+    field: str,
+) -> NDArray[Any, np.int32]:
+    """
+    :param values: values of the label field of every point
+    :param field: name of the field
+    :return: labels as integers, values of integer fields are returned without copying
+    """
+    if field in COLOR_FIELDS:
+        return pack_rgb(values)
+    if np.issubdtype(values.dtype, np.integer):
+        return values
+
+    labels = values.astype(np.int64)
+    assert np.array_equal(labels, values), "Label field values must be integers"
+
+    return labels
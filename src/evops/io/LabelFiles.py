@@ -0,0 +1,169 @@
+# Copyright (c) 2022, Skolkovo Institute of Science and Technology (Skoltech)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from __future__ import annotations
+
+from typing import Any, Optional
+from nptyping import NDArray
+
+import hashlib
+import os
+import tempfile
+
+import numpy as np
+
+from evops.io.LabelFields import __point_labels
+from evops.io.PcdReader import __read_pcd
+from evops.io.PlyReader import __read_ply
+
+TEXT_EXTENSIONS = (".txt", ".csv")
+
+
+def __is_number(value: str) -> bool:
+    try:
+        float(value)
+    except ValueError:
+        return False
+
+    return True
+
+
+def __read_text(path: str, column: int = -1) -> NDArray[Any, np.int64]:
+    """
+    :param path: path to a text file with a row of values for every point
+    :param column: column of labels
+    :return: labels of points
+    """
+    with open(path) as file:
+        first_row = file.readline()
+        delimiter = "," if "," in first_row else None
+        values = first_row.replace(",", " ").split()
+        # A first row with a non-numeric label is a header, e.g. x,y,z,label
+        header = len(values) != 0 and not __is_number(values[column])
+        if header:
+            values = file.readline().replace(",", " ").split()
+    # Integer labels are parsed exactly, other values as floats
+    integer = len(values) != 0 and values[column].lstrip("+-").isdigit()
+
+    values = np.loadtxt(
+        path,
+        np.int64 if integer else np.float64,
+        delimiter=delimiter,
+        skiprows=int(header),
+        usecols=column,
+        ndmin=1,
+    )
+
+    return __point_labels(values, "label")
+
+
+def __read_labels(
+    path: str,
+    field: Optional[str] = None,
+    dtype: np.dtype = np.uint32,
+    column: int = -1,
+) -> NDArray[Any, np.int32]:
+    """
+    :param path: path to a .npy, .pcd, .ply, text or raw binary label file
+    :param field: name of the PCD or PLY field with labels, found automatically if None
+    :param dtype: type of labels in raw binary files
+    :param column: column of labels in text files
+    :return: labels of points, mapped from binary files without reading them
+    """
+    extension = os.path.splitext(path)[1].lower()
+    if extension == ".npy":
+        return np.load(path, mmap_mode="r").reshape(-1)
+    if extension == ".pcd":
+        return __read_pcd(path, field)
+    if extension == ".ply":
+        return __read_ply(path, field)
+    if extension in TEXT_EXTENSIONS:
+        return __read_text(path, column)
+
+    return np.memmap(path, dtype=dtype, mode="r")
+
+
+def __compact_labels(labels: NDArray[Any, np.int32]) -> NDArray[Any, np.int32]:
+    """
+    :param labels: integer labels of points
+    :return: labels converted to the smallest integer type holding all of them
+    """
+    if labels.size == 0:
+        return np.asarray(labels)
+
+    min_label, max_label = int(labels.min()), int(labels.max())
+    if min_label < 0:
+        # Negative of the maximum is fitted to get a signed type for it
+        dtype = np.result_type(
+            np.min_scalar_type(min_label), np.min_scalar_type(-max_label - 1)
+        )
+    else:
+        dtype = np.min_scalar_type(max_label)
+    if not np.issubdtype(dtype, np.integer):
+        return np.asarray(labels)
+
+    return labels.astype(dtype)
+
+
+def __write_labels(path: str, labels: NDArray[Any, np.int32]):
+    """
+    :param path: path to the .npy file, replaced at once so readers never see a partial file
+    :param labels: integer labels of points
+    """
+    directory = os.path.dirname(os.path.abspath(path))
+    os.makedirs(directory, exist_ok=True)
+    # Every writer gets its own temporary file, so threads and processes
+    # writing the same copy at once do not collide
+    descriptor, temporary_path = tempfile.mkstemp(
+        prefix=os.path.basename(path) + ".", suffix=".tmp", dir=directory
+    )
+    try:
+        with os.fdopen(descriptor, "wb") as file:
+            np.save(file, __compact_labels(labels))
+        os.replace(temporary_path, path)
+    except BaseException:
+        os.remove(temporary_path)
+        raise
+
+
+def __cached_labels(
+    path: str,
+    field: Optional[str],
+    dtype: np.dtype,
+    column: int,
+    cache_directory: str,
+) -> NDArray[Any, np.int32]:
+    """
+    :param cache_directory: directory with compact copies of label files
+    :return: labels of points mapped from the copy of the file, which is
+        written on the first read and used while the file is unchanged
+    """
+    status = os.stat(path)
+    key = repr(
+        (
+            os.path.abspath(path),
+            status.st_size,
+            status.st_mtime_ns,
+            field,
+            np.dtype(dtype).str,
+            column,
+        )
+    )
+    cache_path = os.path.join(
+        cache_directory,
+        hashlib.blake2b(key.encode(), digest_size=16).hexdigest() + ".npy",
+    )
+    if not os.path.exists(cache_path):
+        __write_labels(cache_path, __read_labels(path, field, dtype, column))
+
+    return np.load(cache_path, mmap_mode="r")
@@ -0,0 +1,105 @@
+# Copyright (c) 2022, Skolkovo Institute of Science and Technology (Skoltech)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from __future__ import annotations
+
+from typing import Any, BinaryIO, Dict, List, Optional
+from nptyping import NDArray
+
+import numpy as np
+
+from evops.io.LabelFields import CHANNEL_FIELDS, __label_field_name, __point_labels
+from evops.utils.LabelEncoding import pack_rgb
+
+__pcd_types = {"I": "<i", "U": "<u", "F": "<f"}
+
+
+def __read_pcd_header(file: BinaryIO) -> Dict[str, List[str]]:
+    """
+    :param file: PCD file opened in binary mode, left at the start of point data
+    :return: values of every header entry
+    """
+    header = {}
+    while True:
+        line = file.readline()
+        assert line, "Incorrect PCD file, DATA entry not found"
+        words = line.decode("ascii").split("#")[0].split()
+        if len(words) == 0:
+            continue
+        header[words[0].upper()] = words[1:]
+        if words[0].upper() == "DATA":
+            return header
+
+
+def __read_pcd(
+    path: str,
+    field: Optional[str] = None,
+) -> NDArray[Any, np.int32]:
+    """
+    :param path: path to an ascii or binary PCD file
+    :param field: name of the field with labels, found automatically if None
+    :return: labels of points, mapped from binary files without reading them
+    """
+    with open(path, "rb") as file:
+        header = __read_pcd_header(file)
+        names = header["FIELDS"]
+        sizes = [int(size) for size in header["SIZE"]]
+        types = [
+            np.dtype(__pcd_types[kind] + str(size))
+            for kind, size in zip(header["TYPE"], sizes)
+        ]
+        counts = [int(count) for count in header.get("COUNT", ["1"] * len(names))]
+        if "POINTS" in header:
+            points = int(header["POINTS"][0])
+        else:
+            points = int(header["WIDTH"][0]) * int(header["HEIGHT"][0])
+        data = header["DATA"][0].lower()
+        assert data in (
+            "ascii",
+            "binary",
+        ), "Compressed PCD files are not supported, save them as binary"
+
+        name = __label_field_name(names, field)
+        read_names = [name] if name in names else list(CHANNEL_FIELDS)
+        indices = [names.index(read_name) for read_name in read_names]
+        if data == "ascii":
+            columns_amount = sum(counts)
+            values = np.fromfile(
+                file, np.float64, count=points * columns_amount, sep=" "
+            ).reshape(points, columns_amount)
+            columns = [
+                values[:, sum(counts[:index])].astype(types[index]) for index in indices
+            ]
+        else:
+            data_offset = file.tell()
+
+    if data != "ascii":
+        # Only the label fields are described, other fields are skipped by offsets
+        point_type = np.dtype(
+            {
+                "names": read_names,
+                "formats": [types[index] for index in indices],
+                "offsets": [
+                    sum(size * count for size, count in zip(sizes, counts[:index]))
+                    for index in indices
+                ],
+                "itemsize": sum(size * count for size, count in zip(sizes, counts)),
+            }
+        )
+        values = np.memmap(path, point_type, mode="r", offset=data_offset, shape=points)
+        columns = [values[read_name] for read_name in read_names]
+
+    if len(columns) == len(CHANNEL_FIELDS):
+        return pack_rgb(np.stack(columns, axis=1))
+
+    return __point_labels(columns[0], name)
@@ -0,0 +1,122 @@
+# Copyright (c) 2022, Skolkovo Institute of Science and Technology (Skoltech)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from __future__ import annotations
+
+from typing import Any, List, Optional, Tuple
+from nptyping import NDArray
+
+import numpy as np
+
+from evops.io.LabelFields import CHANNEL_FIELDS, __label_field_name, __point_labels
+from evops.utils.LabelEncoding import pack_rgb
+
+__ply_types = {
+    "char": "i1",
+    "int8": "i1",
+    "uchar": "u1",
+    "uint8": "u1",
+    "short": "i2",
+    "int16": "i2",
+    "ushort": "u2",
+    "uint16": "u2",
+    "int": "i4",
+    "int32": "i4",
+    "uint": "u4",
+    "uint32": "u4",
+    "float": "f4",
+    "float32": "f4",
+    "double": "f8",
+    "float64": "f8",
+}
+__ply_byte_orders = {"binary_little_endian": "<", "binary_big_endian": ">"}
+
+
+def __read_ply(
+    path: str,
+    field: Optional[str] = None,
+) -> NDArray[Any, np.int32]:
+    """
+    :param path: path to an ascii or binary PLY file with vertices as the first element
+    :param field: name of the vertex property with labels, found automatically if None
+    :return: labels of points, mapped from binary files without reading them
+    """
+    with open(path, "rb") as file:
+        assert file.readline().strip() == b"ply", "Incorrect PLY file"
+        data_format = None
+        elements: List[Tuple[str, int, List[Tuple[str, str]]]] = []
+        while True:
+            line = file.readline()
+            assert line, "Incorrect PLY file, end_header not found"
+            words = line.decode("ascii").split()
+            if len(words) == 0 or words[0] in ("comment", "obj_info"):
+                continue
+            if words[0] == "end_header":
+                break
+            if words[0] == "format":
+                data_format = words[1]
+            elif words[0] == "element":
+                elements.append((words[1], int(words[2]), []))
+            elif words[0] == "property":
+                elements[-1][2].append((words[-1], words[1]))
+
+        assert (
+            len(elements) != 0 and elements[0][0] == "vertex"
+        ), "PLY files with vertices after other elements are not supported"
+        _, points, properties = elements[0]
+        assert all(
+            kind != "list" for _, kind in properties
+        ), "PLY vertices with list properties are not supported"
+        names = [name for name, _ in properties]
+        name = __label_field_name(names, field)
+        read_names = [name] if name in names else list(CHANNEL_FIELDS)
+
+        if data_format == "ascii":
+            values = np.fromfile(
+                file, np.float64, count=points * len(names), sep=" "
+            ).reshape(points, len(names))
+            columns = [
+                values[:, names.index(read_name)].astype(
+                    __ply_types[properties[names.index(read_name)][1]]
+                )
+                for read_name in read_names
+            ]
+        else:
+            assert data_format in __ply_byte_orders, "Incorrect PLY format {}".format(
+                data_format
+            )
+            byte_order = __ply_byte_orders[data_format]
+            types = [np.dtype(byte_order + __ply_types[kind]) for _, kind in properties]
+            offsets = np.cumsum([0] + [point_type.itemsize for point_type in types])
+            # Only the label properties are described, other ones are skipped by offsets
+            vertex_type = np.dtype(
+                {
+                    "names": read_names,
+                    "formats": [
+                        types[names.index(read_name)] for read_name in read_names
+                    ],
+                    "offsets": [
+                        int(offsets[names.index(read_name)]) for read_name in read_names
+                    ],
+                    "itemsize": int(offsets[-1]),
+                }
+            )
+            vertices = np.memmap(
+                path, vertex_type, mode="r", offset=file.tell(), shape=points
+            )
+            columns = [vertices[read_name] for read_name in read_names]
+
+    if len(columns) == len(CHANNEL_FIELDS):
+        return pack_rgb(np.stack(columns, axis=1))
+
+    return __point_labels(columns[0], name)
@@ -0,0 +1,2 @@
+import evops.io.io
+from evops.io.io import *
@@ -0,0 +1,63 @@
+# Copyright (c) 2022, Skolkovo Institute of Science and Technology (Skoltech)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from __future__ import annotations
+
+from typing import Any, Optional, Union
+from nptyping import NDArray
+
+import os
+import numpy as np
+
+from evops.io.LabelFiles import __cached_labels, __read_labels, __write_labels
+
+
+def read_labels(
+    path: Union[str, os.PathLike],
+    field: Optional[str] = None,
+    dtype: np.dtype = np.uint32,
+    column: int = -1,
+    cache_directory: Optional[Union[str, os.PathLike]] = None,
+) -> NDArray[Any, np.int32]:
+    """
+    :param path: path to a label file: .npy, ascii or binary .pcd and .ply, text .txt
+        and .csv, or raw binary labels with any other extension, e.g. .label
+    :param field: name of the PCD or PLY field with labels, the first of 'label',
+        'instance', 'segment', 'object', 'class' or packed colors by default
+    :param dtype: type of labels in raw binary files
+    :param column: column of labels in text files
+    :param cache_directory: directory to keep compact binary copies of read files in,
+        copies are mapped instead of parsing the files again while they are unchanged
+    :return: integer labels of points, mapped from binary files without reading them
+    """
+    path = os.fspath(path)
+    assert os.path.isfile(path), "Label file {} not found".format(path)
+
+    if cache_directory is not None:
+        return __cached_labels(path, field, dtype, column, os.fspath(cache_directory))
+
+    return __read_labels(path, field, dtype, column)
+
+
+def write_labels(
+    path: Union[str, os.PathLike],
+    labels: NDArray[Any, np.int32],
+):
+    """
+    :param path: path to the .npy file
+    :param labels: integer labels of points, saved with the smallest type holding them
+    """
+    labels = np.asarray(labels)
+    assert np.issubdtype(labels.dtype, np.integer), "Labels must be integers"
+
+    __write_labels(os.fspath(path), labels.reshape(-1))
@@ -0,0 +1,225 @@
+# Copyright (c) 2022, Skolkovo Institute of Science and Technology (Skoltech)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from __future__ import annotations
+
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Dict, List, Optional, Tuple, Union
+from nptyping import NDArray
+
+import asyncio
+import os
+
+import numpy as np
+
+from evops.metrics.DatasetBenchmark import (
+    __evaluate_requests as evaluate_requests,
+    __with_cache as with_cache,
+)
+from evops.utils.CheckInput import (
+    __async_evaluator_asserts as async_evaluator_asserts,
+    __iou_dice_mean_bechmark_asserts as frame_asserts,
+    __mean_benchmark_asserts as mean_benchmark_asserts,
+)
+from evops.utils.EvaluationConfig import EvaluationConfig
+from evops.utils.ResultCache import ResultCache
+
+
+class AsyncEvaluator:
+    """
+    Evaluates frames submitted concurrently by coroutines, e.g. by handlers of
+    an evaluation service. Requests arriving within max_delay of each other are
+    evaluated in one batch on an executor, so the event loop is never blocked and
+    several batches run at once without waiting for each other. Requests wait
+    for a free place when max_pending requests are queued already.
+
+    The evaluator is bound to the event loop it is first used in and should be
+    closed with close() or used as an async context manager.
+    """
+
+    __executors = {"process": ProcessPoolExecutor, "thread": ThreadPoolExecutor}
+
+    def __init__(
+        self,
+        config: Optional[EvaluationConfig] = None,
+        max_batch_size: int = 32,
+        max_delay: float = 0.002,
+        max_pending: int = 256,
+        workers: Optional[int] = None,
+        executor: Union[str, Executor] = "thread",
+        timeout: Optional[float] = None,
+        **changes: Any,
+    ):
+        """
+        :param config: settings of evaluation, current constants by default
+        :param max_batch_size: maximal amount of frames evaluated at once
+        :param max_delay: time in seconds a batch waits for more requests
+        :param max_pending: amount of queued requests at which new requests wait
+        :param workers: amount of batches evaluated at once, CPU count by default
+        :param executor: {'process', 'thread'} or an executor to evaluate batches in
+        :param timeout: default time limit of a request in seconds, unlimited by default
+        :param changes: values of settings that differ from config
+        """
+        async_evaluator_asserts(
+            max_batch_size, max_delay, max_pending, workers, executor
+        )
+        if config is None:
+            config = EvaluationConfig.from_constants()
+        self.config = config.replace(**changes)
+        self.max_batch_size = max_batch_size
+        self.max_delay = max_delay
+        self.max_pending = max_pending
+        self.workers = workers or os.cpu_count() or 1
+        self.timeout = timeout
+        self.batches = 0
+        self.__executor = executor
+        self.__pool = None
+        self.__queue = None
+        self.__slots = None
+        self.__batcher = None
+        self.__running = set()
+
+    async def __aenter__(self) -> "AsyncEvaluator":
+        return self
+
+    async def __aexit__(self, *exception: Any):
+        await self.close()
+
+    async def evaluate(
+        self,
+        pred_labels: NDArray[Any, np.int32],
+        gt_labels: NDArray[Any, np.int32],
+        timeout: Optional[float] = None,
+    ) -> Dict[str, Any]:
+        """
+        :param pred_labels: labels of points obtained as a result of segmentation,
+            organized (h, w) label images are evaluated as arrays of their points
+        :param gt_labels: reference labels of point cloud or their GroundTruth
+        :param timeout: time limit of the request in seconds, including waiting
+            in the queue, timeout of the evaluator by default
+        :return: evaluate() values for the settings of the evaluator
+        """
+        mean_benchmark_asserts(pred_labels, gt_labels)
+        pred_labels = AsyncEvaluator.__flat(pred_labels)
+        gt_labels = AsyncEvaluator.__flat(gt_labels)
+        # Batches are checked by the workers as flat frames, so invalid requests
+        # fail here instead of failing the batch
+        frame_asserts(pred_labels, gt_labels)
+        assert (
+            pred_labels.size == gt_labels.size
+        ), "Predicted and ground truth label arrays must have the same size"
+        assert (
+            self.__batcher is None or not self.__batcher.done()
+        ), "AsyncEvaluator is closed"
+
+        return await asyncio.wait_for(
+            self.__submit(pred_labels, gt_labels),
+            timeout if timeout is not None else self.timeout,
+        )
+
+    @staticmethod
+    def __flat(labels: Any) -> Any:
+        return labels.reshape(-1) if isinstance(labels, np.ndarray) else labels
+
+    async def close(self):
+        """
+        Stops accepting requests, cancels queued ones and waits for running batches
+        """
+        if self.__batcher is not None:
+            self.__batcher.cancel()
+            await asyncio.gather(self.__batcher, return_exceptions=True)
+            while not self.__queue.empty():
+                self.__queue.get_nowait()[2].cancel()
+            await asyncio.gather(*self.__running, return_exceptions=True)
+        if self.__pool is not None and isinstance(self.__executor, str):
+            self.__pool.shutdown(wait=False)
+        self.__pool = None
+
+    async def __submit(
+        self,
+        pred_labels: NDArray[Any, np.int32],
+        gt_labels: NDArray[Any, np.int32],
+    ) -> Dict[str, Any]:
+        loop = asyncio.get_running_loop()
+        if self.__batcher is None:
+            self.__start(loop)
+
+        result = loop.create_future()
+        await self.__queue.put((pred_labels, gt_labels, result))
+
+        # Cancelling the wait cancels the result too, so a request that timed out
+        # while queued is skipped by the batcher
+        return await result
+
+    def __start(self, loop: asyncio.AbstractEventLoop):
+        self.__queue = asyncio.Queue(self.max_pending)
+        self.__slots = asyncio.Semaphore(self.workers)
+        if isinstance(self.__executor, str):
+            self.__pool = AsyncEvaluator.__executors[self.__executor](self.workers)
+        else:
+            self.__pool = self.__executor
+        self.__batcher = loop.create_task(self.__batch_requests())
+
+    async def __batch_requests(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            batch = [await self.__queue.get()]
+            deadline = loop.time() + self.max_delay
+            while len(batch) < self.max_batch_size:
+                if self.__queue.empty():
+                    remaining = deadline - loop.time()
+                    if remaining <= 0:
+                        break
+                    try:
+                        batch.append(
+                            await asyncio.wait_for(self.__queue.get(), remaining)
+                        )
+                    except asyncio.TimeoutError:
+                        break
+                else:
+                    batch.append(self.__queue.get_nowait())
+
+            batch = [request for request in batch if not request[2].done()]
+            if len(batch) == 0:
+                continue
+            await self.__slots.acquire()
+            task = loop.create_task(self.__evaluate_batch(batch))
+            self.__running.add(task)
+            task.add_done_callback(self.__running.discard)
+
+    async def __evaluate_batch(self, batch: List[Tuple[Any, Any, asyncio.Future]]):
+        loop = asyncio.get_running_loop()
+        try:
+            # Batches use the cache active when the first request was submitted
+            results = await loop.run_in_executor(
+                self.__pool,
+                with_cache,
+                ResultCache.active(),
+                evaluate_requests,
+                [(pred_labels, gt_labels) for pred_labels, gt_labels, _ in batch],
+                self.config,
+            )
+            self.batches += 1
+            for (_, _, result), (succeeded, value) in zip(batch, results):
+                if result.done():
+                    continue
+                if succeeded:
+                    result.set_result(value)
+                else:
+                    result.set_exception(value)
+        except Exception as error:
+            for _, _, result in batch:
+                if not result.done():
+                    result.set_exception(error)
+        finally:
+            self.__slots.release()
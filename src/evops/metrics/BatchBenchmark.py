@@ -0,0 +1,176 @@
+# Copyright (c) 2022, Skolkovo Institute of Science and Technology (Skoltech)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from __future__ import annotations
+
+from typing import Any, Dict, Optional, Sequence, Union
+from nptyping import NDArray
+
+import numpy as np
+
+from evops.utils.BatchContingency import BatchContingency
+from evops.utils.EvaluationConfig import EvaluationConfig
+
+
+def __ratio(numerator: Any, denominator: Any) -> Any:
+    return np.divide(
+        numerator,
+        denominator,
+        out=np.zeros(np.shape(numerator), np.float64),
+        where=np.asarray(denominator) != 0,
+    )
+
+
+def __frames_mean(values: NDArray[Any, np.float64]) -> np.float64:
+    return values.mean() if values.size != 0 else np.float64(0)
+
+
+def __multi_value_ratios(
+    counts: Dict[str, Any],
+    predicted_amount: Any,
+    gt_amount: Any,
+) -> Dict[str, Any]:
+    """
+    :param counts: amounts of correctly segmented, under_segmented, over_segmented, missed and noise planes
+    :param predicted_amount: amount of predicted planes
+    :param gt_amount: amount of ground truth planes
+    :return: precision, recall, under_segmented, over_segmented, missed, noise
+    """
+    return {
+        "precision": __ratio(counts["correctly_segmented"], predicted_amount),
+        "recall": __ratio(counts["correctly_segmented"], gt_amount),
+        "under_segmented": __ratio(counts["under_segmented"], predicted_amount),
+        "over_segmented": __ratio(counts["over_segmented"], gt_amount),
+        "missed": __ratio(counts["missed"], gt_amount),
+        "noise": __ratio(counts["noise"], predicted_amount),
+    }
+
+
+def __frames_statistics(
+    contingency: BatchContingency,
+    config: EvaluationConfig,
+) -> Dict[str, Any]:
+    """
+    :param contingency: overlap counts of predicted and ground truth planes of all frames
+    :param config: settings of evaluation
+    :return: plane counts and mean metric values of every frame, from which
+        all evaluate() values are derived
+    """
+    return {
+        "mean_iou": contingency.mean("iou"),
+        "mean_dice": contingency.mean("dice"),
+        "multi_value_counts": contingency.multi_value_counts(config.overlap_threshold),
+        "true_positive": contingency.true_positive(
+            config.iou_threshold, config.matching
+        ),
+        "predicted_amount": contingency.pred_amount,
+        "gt_amount": contingency.gt_amount,
+    }
+
+
+def __statistics_report(statistics: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    :param statistics: plane counts and mean metric values of every frame
+    :return: arrays of evaluate() values for every frame
+    """
+    true_positive = statistics["true_positive"]
+    predicted_amount = statistics["predicted_amount"]
+    gt_amount = statistics["gt_amount"]
+    multi_value_counts = statistics["multi_value_counts"]
+
+    return {
+        "precision": __ratio(true_positive, predicted_amount),
+        "recall": __ratio(true_positive, gt_amount),
+        "fScore": __ratio(2 * true_positive, predicted_amount + gt_amount),
+        "mean_iou": statistics["mean_iou"],
+        "mean_dice": statistics["mean_dice"],
+        "multi_value": __multi_value_ratios(
+            multi_value_counts, predicted_amount, gt_amount
+        ),
+        "multi_value_counts": multi_value_counts,
+        "true_positive": true_positive,
+        "predicted_amount": predicted_amount,
+        "gt_amount": gt_amount,
+    }
+
+
+def __frames_report(
+    contingency: BatchContingency,
+    config: EvaluationConfig,
+) -> Dict[str, Any]:
+    """
+    :param contingency: overlap counts of predicted and ground truth planes of all frames
+    :param config: settings of evaluation
+    :return: arrays of evaluate() values for every frame
+    """
+    return __statistics_report(__frames_statistics(contingency, config))
+
+
+def __dataset_report(frames: Dict[str, Any]) -> Dict[str, Any]:
+    """
+    :param frames: arrays of evaluate() values for every frame, possibly for a part of metrics
+    :return: means of the values over frames, micro averages over the planes of all frames
+        and total plane counts
+    """
+    total_predicted = frames["predicted_amount"].sum()
+    total_gt = frames["gt_amount"].sum()
+    dataset = {
+        name: __frames_mean(frames[name])
+        for name in ("precision", "recall", "fScore", "mean_iou", "mean_dice")
+        if name in frames
+    }
+    dataset["micro"] = {}
+    dataset["predicted_amount"] = total_predicted
+    dataset["gt_amount"] = total_gt
+
+    if "true_positive" in frames:
+        total_tp = frames["true_positive"].sum()
+        dataset["micro"]["precision"] = __ratio(total_tp, total_predicted)[()]
+        dataset["micro"]["recall"] = __ratio(total_tp, total_gt)[()]
+        dataset["micro"]["fScore"] = __ratio(2 * total_tp, total_predicted + total_gt)[
+            ()
+        ]
+        dataset["true_positive"] = total_tp
+
+    if "multi_value" in frames:
+        total_counts = {
+            name: count.sum() for name, count in frames["multi_value_counts"].items()
+        }
+        dataset["multi_value"] = {
+            name: __frames_mean(values)
+            for name, values in frames["multi_value"].items()
+        }
+        dataset["micro"]["multi_value"] = {
+            name: value[()]
+            for name, value in __multi_value_ratios(
+                total_counts, total_predicted, total_gt
+            ).items()
+        }
+        dataset["multi_value_counts"] = total_counts
+
+    return dataset
+
+
+def __evaluate_batch(
+    pred_labels: Union[NDArray[Any, np.int32], Sequence[NDArray[Any, np.int32]]],
+    gt_labels: Union[NDArray[Any, np.int32], Sequence[NDArray[Any, np.int32]]],
+    frame_offsets: Optional[NDArray[Any, np.int64]],
+    config: EvaluationConfig,
+) -> Dict[str, Any]:
+    contingency = BatchContingency(
+        pred_labels, gt_labels, frame_offsets, config.unsegmented_labels
+    )
+
+    frames = __frames_report(contingency, config)
+
+    return {"frames": frames, "dataset": __dataset_report(frames)}
@@ -0,0 +1,167 @@
+# Copyright (c) 2022, Skolkovo Institute of Science and Technology (Skoltech)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from __future__ import annotations
+
+from typing import Any, Dict, Union
+from nptyping import NDArray
+
+import numpy as np
+
+from evops.metrics.BatchBenchmark import __dataset_report, __frames_report
+from evops.utils.BatchContingency import BatchContingency
+from evops.utils.EvaluationConfig import EvaluationConfig
+from evops.utils.LabelEncoding import count_labels, encode_labels, is_unsegmented
+
+
+def __flat_labels(labels: Any) -> NDArray[Any, np.int32]:
+    if hasattr(labels, "labels_array"):
+        labels = labels.labels_array()
+
+    return np.asarray(labels).reshape(-1)
+
+
+def __point_classes(
+    gt_labels: NDArray[Any, np.int32],
+    classes: Union[NDArray[Any, Any], Dict[Any, Any]],
+) -> Any:
+    """
+    :param gt_labels: reference labels of points
+    :param classes: class of every point or class of every reference label
+    :return: sorted classes, index of the class of every point or -1 for points
+        of reference labels without a class
+    """
+    if not isinstance(classes, dict):
+        return encode_labels(__flat_labels(classes))
+
+    gt_unique, gt_codes = encode_labels(gt_labels)
+    labelled = [label in classes for label in gt_unique.tolist()]
+    class_values, class_codes = np.unique(
+        np.array(
+            [
+                classes[label]
+                for label, found in zip(gt_unique.tolist(), labelled)
+                if found
+            ]
+        ),
+        return_inverse=True,
+    )
+    label_classes = np.full(gt_unique.size, -1, np.int64)
+    label_classes[np.flatnonzero(labelled)] = class_codes.reshape(-1)
+
+    return class_values, label_classes[gt_codes]
+
+
+def __class_pairs(
+    pred_labels: NDArray[Any, np.int32],
+    gt_labels: NDArray[Any, np.int32],
+    point_classes: NDArray[Any, np.int64],
+    classes_amount: int,
+    unsegmented_labels: Any,
+) -> Any:
+    """
+    Every class is a frame made of the points of the class and the points without
+    a class. Predicted planes of a frame keep their full size, their points outside
+    of the class overlap unsegmented ground truth
+    :param pred_labels: labels of points obtained as a result of segmentation
+    :param gt_labels: reference labels of points
+    :param point_classes: index of the class of every point or -1 for points without a class
+    :param classes_amount: amount of classes
+    :param unsegmented_labels: labels of points outside of planes
+    :return: frame, predicted label code, reference label code and amount of points
+        of every pair of labels, unsegmented labels are coded as -1
+    """
+    pred_unique, pred_codes = encode_labels(pred_labels)
+    gt_unique, gt_codes = encode_labels(gt_labels)
+    pred_codes[is_unsegmented(pred_unique, unsegmented_labels)[pred_codes]] = -1
+    gt_codes[is_unsegmented(gt_unique, unsegmented_labels)[gt_codes]] = -1
+
+    segmented = pred_codes >= 0
+    classified = point_classes >= 0
+    inside = segmented & classified
+    pred_sizes = np.bincount(pred_codes[segmented], minlength=pred_unique.size)
+    class_keys, class_sizes = count_labels(
+        pred_codes[inside] * classes_amount + point_classes[inside],
+        pred_unique.size * classes_amount,
+    )
+    unclassified_pred = np.flatnonzero(
+        np.bincount(pred_codes[segmented & ~classified], minlength=pred_unique.size)
+    )
+    # Planes with points without a class are present in every frame
+    frame_keys = np.union1d(
+        class_keys,
+        (
+            unclassified_pred[:, np.newaxis] * classes_amount
+            + np.arange(classes_amount)
+        ).reshape(-1),
+    )
+    frame_sizes = np.zeros(frame_keys.size, np.int64)
+    frame_sizes[np.searchsorted(frame_keys, class_keys)] = class_sizes
+    frame_pred = frame_keys // max(classes_amount, 1)
+
+    return (
+        np.concatenate(
+            (point_classes[classified], frame_keys % max(classes_amount, 1))
+        ),
+        np.concatenate((pred_codes[classified], frame_pred)),
+        np.concatenate((gt_codes[classified], np.full(frame_keys.size, -1))),
+        np.concatenate(
+            (
+                np.ones(np.count_nonzero(classified), np.int64),
+                pred_sizes[frame_pred] - frame_sizes,
+            )
+        ),
+    )
+
+
+def __evaluate_classes(
+    pred_labels: Any,
+    gt_labels: Any,
+    classes: Union[NDArray[Any, Any], Dict[Any, Any]],
+    config: EvaluationConfig,
+) -> Dict[str, Any]:
+    """
+    Every class is evaluated as a frame made of the points of the class,
+    so overlaps of all classes are counted together in one pass over points.
+    Predicted planes are evaluated with all their points, points of other
+    classes and points without a class count as unsegmented ground truth
+    :param pred_labels: labels of points obtained as a result of segmentation
+    :param gt_labels: reference labels of points or their GroundTruth
+    :param classes: class of every point or class of every reference label
+    :param config: settings of evaluation
+    :return: sorted "classes", "per_class" arrays of evaluate() values for every
+        class and "dataset" with their means over classes, micro averages over
+        the planes of all classes and total plane counts
+    """
+    pred_labels = __flat_labels(pred_labels)
+    gt_labels = __flat_labels(gt_labels)
+    class_values, point_classes = __point_classes(gt_labels, classes)
+
+    contingency = BatchContingency.from_counts(
+        *__class_pairs(
+            pred_labels,
+            gt_labels,
+            point_classes,
+            class_values.size,
+            config.unsegmented_labels,
+        ),
+        class_values.size,
+        -1,
+    )
+    per_class = __frames_report(contingency, config)
+
+    return {
+        "classes": class_values,
+        "per_class": per_class,
+        "dataset": __dataset_report(per_class),
+    }
@@ -0,0 +1,57 @@
+# Copyright (c) 2022, Skolkovo Institute of Science and Technology (Skoltech)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from __future__ import annotations
+
+from typing import Any, Dict
+from nptyping import NDArray
+
+import numpy as np
+
+from evops.metrics.BatchBenchmark import __multi_value_ratios, __ratio
+from evops.utils.ContingencyMatrix import ContingencyMatrix
+from evops.utils.EvaluationConfig import EvaluationConfig
+
+
+def __precision_recall_curve(
+    pred_labels: NDArray[Any, np.int32],
+    gt_labels: NDArray[Any, np.int32],
+    iou_thresholds: NDArray[Any, np.float64],
+    config: EvaluationConfig,
+) -> Dict[str, NDArray[Any, np.float64]]:
+    contingency = ContingencyMatrix(pred_labels, gt_labels, config.unsegmented_labels)
+    true_positive = contingency.true_positive_curve(iou_thresholds, config.matching)
+    predicted_amount = contingency.pred_labels.size
+    gt_amount = contingency.gt_labels.size
+
+    return {
+        "iou_thresholds": np.asarray(iou_thresholds, np.float64),
+        "precision": __ratio(true_positive, predicted_amount),
+        "recall": __ratio(true_positive, gt_amount),
+        "fScore": __ratio(2 * true_positive, predicted_amount + gt_amount),
+        "true_positive": true_positive,
+    }
+
+
+def __multi_value_curve(
+    pred_labels: NDArray[Any, np.int32],
+    gt_labels: NDArray[Any, np.int32],
+    overlap_thresholds: NDArray[Any, np.float64],
+    config: EvaluationConfig,
+) -> Dict[str, NDArray[Any, np.float64]]:
+    contingency = ContingencyMatrix(pred_labels, gt_labels, config.unsegmented_labels)
+    counts = contingency.multi_value_counts_curve(overlap_thresholds)
+
+    return __multi_value_ratios(
+        counts, contingency.pred_labels.size, contingency.gt_labels.size
+    )
@@ -0,0 +1,216 @@
+# Copyright (c) 2022, Skolkovo Institute of Science and Technology (Skoltech)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from __future__ import annotations
+
+from collections import deque
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from functools import partial
+from itertools import islice
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
+from nptyping import NDArray
+
+import os
+import numpy as np
+
+from evops.metrics.BatchBenchmark import __dataset_report
+from evops.metrics.EvaluationBenchmark import __contingency_report
+from evops.utils.CheckInput import __iou_dice_mean_bechmark_asserts
+from evops.utils.ContingencyMatrix import ContingencyMatrix
+from evops.utils.EvaluationConfig import EvaluationConfig
+from evops.utils.ResultCache import ResultCache
+
+__executors = {"process": ProcessPoolExecutor, "thread": ThreadPoolExecutor}
+
+
+def __evaluate_frames(
+    frames: List[Tuple[NDArray[Any, np.int32], NDArray[Any, np.int32]]],
+    config: EvaluationConfig,
+    metrics: Optional[Sequence[str]],
+) -> List[Dict[str, Any]]:
+    """
+    Evaluates a chunk of frames in a worker, all settings are passed explicitly
+    as module constants of the caller are not visible in worker processes
+    :param frames: list of pairs of predicted and reference labels
+    :param config: settings of evaluation
+    :param metrics: names of metrics to compute, all metrics by default
+    :return: evaluate() values of every frame
+    """
+    cache = ResultCache.active()
+    reports = []
+    for pred_labels, gt_labels in frames:
+        __iou_dice_mean_bechmark_asserts(pred_labels, gt_labels)
+        evaluate_frame = partial(
+            __evaluate_frame, pred_labels, gt_labels, config, metrics
+        )
+        if cache is None:
+            reports.append(evaluate_frame())
+        else:
+            reports.append(
+                cache.compute(
+                    "frame", evaluate_frame, pred_labels, gt_labels, config, metrics
+                )
+            )
+
+    return reports
+
+
+def __evaluate_frame(
+    pred_labels: NDArray[Any, np.int32],
+    gt_labels: NDArray[Any, np.int32],
+    config: EvaluationConfig,
+    metrics: Optional[Sequence[str]],
+) -> Dict[str, Any]:
+    contingency = ContingencyMatrix(pred_labels, gt_labels, config.unsegmented_labels)
+
+    return __contingency_report(contingency, config, metrics)
+
+
+def __evaluate_requests(
+    frames: List[Tuple[NDArray[Any, np.int32], NDArray[Any, np.int32]]],
+    config: EvaluationConfig,
+) -> List[Tuple[bool, Any]]:
+    """
+    Evaluates frames of independent requests in a worker, so an error in one
+    frame fails only the request of that frame
+    :param frames: list of pairs of predicted and reference labels
+    :param config: settings of evaluation
+    :return: success flag and evaluate() values or the raised error of every frame
+    """
+    results = []
+    for frame in frames:
+        try:
+            results.append((True, __evaluate_frames([frame], config, None)[0]))
+        except Exception as error:
+            results.append((False, error))
+
+    return results
+
+
+def __with_cache(
+    cache: Optional[ResultCache],
+    function: Callable[..., Any],
+    *args: Any,
+) -> Any:
+    """
+    Calls a function in a worker thread or process with the cache of the caller
+    active, as the active cache is not shared with workers
+    :param cache: active cache of the caller or None
+    :param function: function to call
+    :param args: arguments of the function
+    :return: result of the function
+    """
+    if cache is None:
+        return function(*args)
+    with cache:
+        return function(*args)
+
+
+def __iterate_dataset(
+    frames: Iterable[Tuple[NDArray[Any, np.int32], NDArray[Any, np.int32]]],
+    config: EvaluationConfig,
+    metrics: Optional[Sequence[str]] = None,
+    workers: Optional[int] = None,
+    executor: Union[str, Executor] = "process",
+    chunk_size: int = 1,
+    evaluate_chunk: Callable[..., List[Dict[str, Any]]] = __evaluate_frames,
+) -> Iterator[Dict[str, Any]]:
+    """
+    :param frames: pairs of predicted and reference labels, read lazily
+    :param config: settings of evaluation
+    :param metrics: names of metrics to compute, all metrics by default
+    :param workers: amount of workers, evaluates in the calling thread if zero
+    :param executor: {'process', 'thread'} or an executor to submit chunks of frames to
+    :param chunk_size: amount of frames evaluated by a worker at once
+    :param evaluate_chunk: function evaluating a list of frames with the config
+        and metrics in a worker, e.g. reading frames given by paths first
+    :return: evaluate() values of every frame in the order of frames
+    """
+    frames = iter(frames)
+    chunks = iter(lambda: list(islice(frames, chunk_size)), [])
+
+    if workers == 0:
+        for chunk in chunks:
+            yield from evaluate_chunk(chunk, config, metrics)
+        return
+
+    if workers is None:
+        workers = os.cpu_count() or 1
+    cache = ResultCache.active()
+    if isinstance(executor, str):
+        pool = __executors[executor](workers)
+    else:
+        pool = executor
+    pending = deque()
+    try:
+        for chunk in chunks:
+            pending.append(
+                pool.submit(__with_cache, cache, evaluate_chunk, chunk, config, metrics)
+            )
+            # Bounded amount of chunks in flight keeps memory usage
+            # independent of the dataset size
+            if len(pending) >= 2 * workers:
+                yield from pending.popleft().result()
+        while len(pending) != 0:
+            yield from pending.popleft().result()
+    finally:
+        for future in pending:
+            future.cancel()
+        if isinstance(executor, str):
+            pool.shutdown()
+
+
+def __stack_reports(reports: List[Dict[str, Any]]) -> Dict[str, Any]:
+    """
+    :param reports: evaluate() values of every frame
+    :return: arrays of the values over frames
+    """
+    if len(reports) == 0:
+        return {
+            "predicted_amount": np.zeros(0, np.int64),
+            "gt_amount": np.zeros(0, np.int64),
+        }
+
+    return {
+        name: __stack_reports([report[name] for report in reports])
+        if isinstance(value, dict)
+        else np.array([report[name] for report in reports])
+        for name, value in reports[0].items()
+    }
+
+
+def __evaluate_dataset(
+    frames: Iterable[Tuple[NDArray[Any, np.int32], NDArray[Any, np.int32]]],
+    config: EvaluationConfig,
+    metrics: Optional[Sequence[str]] = None,
+    workers: Optional[int] = None,
+    executor: Union[str, Executor] = "process",
+    chunk_size: int = 1,
+) -> Dict[str, Any]:
+    reports = list(
+        __iterate_dataset(frames, config, metrics, workers, executor, chunk_size)
+    )
+    frames_report = __stack_reports(reports)
+
+    return {"frames": frames_report, "dataset": __dataset_report(frames_report)}
@@ -11,13 +11,15 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+from __future__ import annotations
+
 from typing import Any
 from nptyping import NDArray
 
 import numpy as np
 
-import evops.metrics.constants
-from evops.utils.MetricsUtils import __get_tp, __filter_unsegmented
+from evops.utils.ContingencyMatrix import ContingencyMatrix
+from evops.utils.MetricsUtils import __contingency_tp
 
 
 def __precision(
@@ -25,10 +27,10 @@ def __precision(
     gt_labels: NDArray[Any, np.int32],
     tp_condition: str,
 ) -> np.float64:
-    true_positive = __get_tp(pred_labels, gt_labels, tp_condition)
-    pred_labels = __filter_unsegmented(pred_labels)
+    contingency = ContingencyMatrix(pred_labels, gt_labels)
+    true_positive = __contingency_tp(contingency, tp_condition)
 
-    return true_positive / np.unique(pred_labels).size
+    return true_positive / contingency.pred_labels.size
 
 
 def __recall(
@@ -36,10 +38,10 @@ def __recall(
     gt_labels: NDArray[Any, np.int32],
     tp_condition: str,
 ) -> np.float64:
-    true_positive = __get_tp(pred_labels, gt_labels, tp_condition)
-    gt_labels = __filter_unsegmented(gt_labels)
+    contingency = ContingencyMatrix(pred_labels, gt_labels)
+    true_positive = __contingency_tp(contingency, tp_condition)
 
-    return true_positive / np.unique(gt_labels).size
+    return true_positive / contingency.gt_labels.size
 
 
 def __fScore(
@@ -47,7 +49,9 @@ def __fScore(
     gt_labels: NDArray[Any, np.int32],
     tp_condition: str,
 ) -> np.float64:
-    precision = __precision(pred_labels, gt_labels, tp_condition)
-    recall = __recall(pred_labels, gt_labels, tp_condition)
+    contingency = ContingencyMatrix(pred_labels, gt_labels)
+    true_positive = __contingency_tp(contingency, tp_condition)
+    precision = true_positive / contingency.pred_labels.size
+    recall = true_positive / contingency.gt_labels.size
 
     return 2 * precision * recall / (precision + recall)
@@ -11,16 +11,24 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+from __future__ import annotations
+
 from typing import Any
 from nptyping import NDArray
 
 import numpy as np
 
+from evops.utils.IndexSets import __is_sorted_unique, __sorted_intersection_size
+
 
 def __dice(
     pred_indices: NDArray[Any, np.int32],
     gt_indices: NDArray[Any, np.int32],
 ) -> np.float64:
+    if __is_sorted_unique(pred_indices) and __is_sorted_unique(gt_indices):
+        intersection_size = __sorted_intersection_size(pred_indices, gt_indices)
+        return 2 * intersection_size / (pred_indices.size + gt_indices.size)
+
     intersection = np.intersect1d(pred_indices, gt_indices)
 
     return 2 * intersection.size / (pred_indices.size + gt_indices.size)
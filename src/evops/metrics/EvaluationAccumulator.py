@@ -0,0 +1,192 @@
+# Copyright (c) 2022, Skolkovo Institute of Science and Technology (Skoltech)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional
+from nptyping import NDArray
+
+import numpy as np
+
+from evops.utils.BatchContingency import BatchContingency
+from evops.utils.EvaluationConfig import EvaluationConfig
+
+# Names starting with two underscores would be mangled inside of the class
+from evops.metrics.BatchBenchmark import (
+    __dataset_report as dataset_report,
+    __frames_statistics as frames_statistics,
+    __statistics_report as statistics_report,
+)
+
+
+class EvaluationAccumulator:
+    """
+    Evaluates a sequence of frames incrementally. Every frame is reduced to
+    a few plane counts as soon as it is complete, so memory usage does not
+    depend on the amount of points. A frame may also be added in chunks of
+    points, then only overlap counts of label pairs are kept until it ends.
+    """
+
+    def __init__(self, config: Optional[EvaluationConfig] = None, **changes: Any):
+        """
+        :param config: settings of evaluation, current constants by default
+        :param changes: values of settings that differ from config
+        """
+        if config is None:
+            config = EvaluationConfig.from_constants()
+        self.config = config.replace(**changes)
+        self.frames_amount = 0
+        self.__statistics = []
+        self.__chunk_pairs = []
+        self.__chunk_ranges = []
+        self.__merged_pairs_amount = 0
+
+    @staticmethod
+    def __labels_asserts(
+        pred_labels: NDArray[Any, np.int32],
+        gt_labels: NDArray[Any, np.int32],
+    ):
+        assert (
+            len(pred_labels.shape) == 1
+        ), "Incorrect predicted label array size, expected (n)"
+        assert (
+            len(gt_labels.shape) == 1
+        ), "Incorrect ground truth label array size, expected (n)"
+        assert (
+            pred_labels.size == gt_labels.size
+        ), "Predicted and ground truth label arrays must have the same size"
+
+    @staticmethod
+    def __concatenate(statistics: List[Dict[str, Any]]) -> Dict[str, Any]:
+        """
+        :param statistics: statistics of consecutive groups of frames
+        :return: statistics of all frames
+        """
+        return {
+            name: EvaluationAccumulator.__concatenate(
+                [values[name] for values in statistics]
+            )
+            if isinstance(value, dict)
+            else np.concatenate([values[name] for values in statistics])
+            for name, value in statistics[0].items()
+        }
+
+    def __merge_chunk_pairs(self, unsegmented_label: Any = ()) -> BatchContingency:
+        """
+        :param unsegmented_label: labels of points outside of planes, none while merging
+        :return: overlap counts of the frame added in chunks so far
+        """
+        return BatchContingency.from_counts(
+            np.zeros(sum(pairs[2].size for pairs in self.__chunk_pairs), np.int64),
+            np.concatenate([pairs[0] for pairs in self.__chunk_pairs]),
+            np.concatenate([pairs[1] for pairs in self.__chunk_pairs]),
+            np.concatenate([pairs[2] for pairs in self.__chunk_pairs]),
+            1,
+            unsegmented_label,
+        )
+
+    def add_frame(
+        self,
+        pred_labels: NDArray[Any, np.int32],
+        gt_labels: NDArray[Any, np.int32],
+    ):
+        """
+        :param pred_labels: labels of points obtained as a result of segmentation
+        :param gt_labels: reference labels of point cloud
+        """
+        assert (
+            len(self.__chunk_ranges) == 0
+        ), "Frame added in chunks is not finished, call end_frame() first"
+        self.__labels_asserts(pred_labels, gt_labels)
+
+        contingency = BatchContingency(
+            [pred_labels], [gt_labels], None, self.config.unsegmented_labels
+        )
+        self.__statistics.append(frames_statistics(contingency, self.config))
+        self.frames_amount += 1
+
+    def add_chunk(
+        self,
+        pred_labels: NDArray[Any, np.int32],
+        gt_labels: NDArray[Any, np.int32],
+        start: Optional[int] = None,
+    ):
+        """
+        Adds a part of the points of the current frame, the frame is
+        evaluated once end_frame() is called
+        :param pred_labels: labels of the points obtained as a result of segmentation
+        :param gt_labels: reference labels of the points
+        :param start: index of the first point of the chunk in the frame,
+            right after the points added before by default
+        """
+        self.__labels_asserts(pred_labels, gt_labels)
+        if start is None:
+            start = max((chunk_end for _, chunk_end in self.__chunk_ranges), default=0)
+        end = start + pred_labels.size
+        assert start >= 0 and all(
+            end <= chunk_start or chunk_end <= start
+            for chunk_start, chunk_end in self.__chunk_ranges
+        ), "Chunk points overlap points added before"
+        self.__chunk_ranges.append((start, end))
+
+        counts = BatchContingency([pred_labels], [gt_labels], None, ())
+        self.__chunk_pairs.append(
+            (
+                counts.pred_labels[counts.pair_pred],
+                counts.gt_labels[counts.pair_gt],
+                counts.pair_intersection,
+            )
+        )
+
+        # Repeating pairs are merged once their amount doubles, which keeps
+        # the stored counts proportional to the amount of distinct pairs
+        pairs_amount = sum(pairs[2].size for pairs in self.__chunk_pairs)
+        if pairs_amount > 2 * self.__merged_pairs_amount:
+            merged = self.__merge_chunk_pairs()
+            self.__chunk_pairs = [
+                (
+                    merged.pred_labels[merged.pair_pred],
+                    merged.gt_labels[merged.pair_gt],
+                    merged.pair_intersection,
+                )
+            ]
+            self.__merged_pairs_amount = merged.pair_intersection.size
+
+    def end_frame(self):
+        """
+        Evaluates the frame added in chunks, points not covered by chunks are ignored
+        """
+        assert len(self.__chunk_ranges) != 0, "No chunks of the frame were added"
+
+        contingency = self.__merge_chunk_pairs(self.config.unsegmented_labels)
+        self.__statistics.append(frames_statistics(contingency, self.config))
+        self.frames_amount += 1
+        self.__chunk_pairs = []
+        self.__chunk_ranges = []
+        self.__merged_pairs_amount = 0
+
+    def report(self) -> Dict[str, Any]:
+        """
+        :return: "frames" and "dataset" reports in the format of evaluate_batch()
+            for all finished frames
+        """
+        if len(self.__statistics) == 0:
+            self.__statistics.append(
+                frames_statistics(BatchContingency([], [], None), self.config)
+            )
+        # Statistics are kept concatenated, so every report costs
+        # only the frames added after the previous one
+        self.__statistics = [self.__concatenate(self.__statistics)]
+        frames = statistics_report(self.__statistics[0])
+
+        return {"frames": frames, "dataset": dataset_report(frames)}
@@ -0,0 +1,81 @@
+# Copyright (c) 2022, Skolkovo Institute of Science and Technology (Skoltech)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from __future__ import annotations
+
+from typing import Any, Dict, Optional, Sequence
+from nptyping import NDArray
+
+import numpy as np
+
+from evops.utils.ContingencyMatrix import ContingencyMatrix
+from evops.utils.EvaluationConfig import EvaluationConfig
+from evops.utils.MetricsUtils import __metric_names
+
+
+def __contingency_report(
+    contingency: ContingencyMatrix,
+    config: EvaluationConfig,
+    metrics: Optional[Sequence[str]] = None,
+) -> Dict[str, Any]:
+    """
+    :param contingency: overlap counts of predicted and ground truth planes
+    :param config: settings of evaluation
+    :param metrics: names of metrics to compute, all metrics by default
+    :return: values of the metrics read off the contingency matrix and plane counts
+    """
+    if metrics is None:
+        metrics = __metric_names
+    predicted_amount = contingency.pred_labels.size
+    gt_amount = contingency.gt_labels.size
+    report = {"predicted_amount": predicted_amount, "gt_amount": gt_amount}
+
+    if {"precision", "recall", "fScore"}.intersection(metrics):
+        true_positive = int(
+            contingency.true_positive(config.iou_threshold, config.matching)
+        )
+        precision = true_positive / predicted_amount if predicted_amount != 0 else 0
+        recall = true_positive / gt_amount if gt_amount != 0 else 0
+        report["true_positive"] = true_positive
+        if "precision" in metrics:
+            report["precision"] = precision
+        if "recall" in metrics:
+            report["recall"] = recall
+        if "fScore" in metrics:
+            report["fScore"] = (
+                2 * precision * recall / (precision + recall)
+                if true_positive != 0
+                else 0
+            )
+
+    if "mean_iou" in metrics:
+        report["mean_iou"] = contingency.mean("iou")
+    if "mean_dice" in metrics:
+        report["mean_dice"] = contingency.mean("dice")
+    if "multi_value" in metrics:
+        report["multi_value"] = contingency.multi_value(config.overlap_threshold)
+        report["multi_value_counts"] = contingency.multi_value_counts(
+            config.overlap_threshold
+        )
+
+    return report
+
+
+def __evaluate(
+    pred_labels: NDArray[Any, np.int32],
+    gt_labels: NDArray[Any, np.int32],
+    config: EvaluationConfig,
+) -> Dict[str, Any]:
+    contingency = ContingencyMatrix(pred_labels, gt_labels, config.unsegmented_labels)
+
+    return __contingency_report(contingency, config)
@@ -0,0 +1,122 @@
+# Copyright (c) 2022, Skolkovo Institute of Science and Technology (Skoltech)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from __future__ import annotations
+
+from typing import Any, Dict, List, Optional, Sequence, Tuple, Union
+from nptyping import NDArray
+
+import os
+import numpy as np
+
+from evops.io.LabelFiles import __read_labels
+from evops.metrics.DatasetBenchmark import __evaluate_frames
+from evops.metrics.EvaluationAccumulator import EvaluationAccumulator
+from evops.utils.EvaluationConfig import EvaluationConfig
+
+# Amount of points read from a label file at once
+CHUNK_POINTS = 1 << 20
+
+
+def __open_labels(
+    source: Union[str, os.PathLike, NDArray[Any, np.int32]],
+    dtype: np.dtype,
+) -> NDArray[Any, np.int32]:
+    """
+    :param source: label array or path to a label file read by evops.io.read_labels()
+    :param dtype: type of labels in raw binary files
+    :return: labels mapped from binary files without reading them
+    """
+    if isinstance(source, np.ndarray):
+        return source.reshape(-1)
+
+    return __read_labels(os.fspath(source), None, dtype)
+
+
+def __label_field(
+    labels: NDArray[Any, np.int32],
+    label_field: str,
+) -> NDArray[Any, np.int32]:
+    """
+    :param labels: chunk of labels
+    :param label_field: part of labels to evaluate: {'full', 'semantic', 'instance'},
+        semantic and instance labels are the lower and upper 16 bits as in SemanticKITTI
+    :return: labels of the chosen part
+    """
+    if label_field == "semantic":
+        return labels & 0xFFFF
+    if label_field == "instance":
+        return labels >> 16
+
+    return np.asarray(labels)
+
+
+def __evaluate_files(
+    pred_sources: Sequence[Union[str, os.PathLike, NDArray[Any, np.int32]]],
+    gt_sources: Sequence[Union[str, os.PathLike, NDArray[Any, np.int32]]],
+    config: EvaluationConfig,
+    dtype: np.dtype = np.uint32,
+    label_field: str = "full",
+    chunk_points: int = CHUNK_POINTS,
+) -> Dict[str, Any]:
+    accumulator = EvaluationAccumulator(config)
+    for pred_source, gt_source in zip(pred_sources, gt_sources):
+        pred_labels = __open_labels(pred_source, dtype)
+        gt_labels = __open_labels(gt_source, dtype)
+        assert (
+            pred_labels.size == gt_labels.size
+        ), "Predicted and ground truth label arrays must have the same size"
+
+        if pred_labels.size == 0:
+            accumulator.add_frame(np.asarray(pred_labels), np.asarray(gt_labels))
+            continue
+        for start in range(0, pred_labels.size, chunk_points):
+            points = slice(start, start + chunk_points)
+            accumulator.add_chunk(
+                __label_field(pred_labels[points], label_field),
+                __label_field(gt_labels[points], label_field),
+                start,
+            )
+        accumulator.end_frame()
+
+    return accumulator.report()
+
+
+def __evaluate_file_pairs(
+    pairs: List[Tuple[str, str]],
+    config: EvaluationConfig,
+    metrics: Optional[Sequence[str]],
+    field: Optional[str] = None,
+    dtype: np.dtype = np.uint32,
+    label_field: str = "full",
+) -> List[Dict[str, Any]]:
+    """
+    Reads and evaluates a chunk of frames in a worker, so label files are
+    read in parallel instead of by the process distributing frames
+    :param pairs: paths to predicted and reference label files of every frame
+    :param config: settings of evaluation
+    :param metrics: names of metrics to compute, all metrics by default
+    :param field: name of the PCD or PLY field with labels, found automatically if None
+    :param dtype: type of labels in raw binary files
+    :param label_field: part of labels to evaluate: {'full', 'semantic', 'instance'}
+    :return: evaluate() values of every frame
+    """
+    frames = [
+        tuple(
+            __label_field(np.asarray(__read_labels(path, field, dtype)), label_field)
+            for path in (pred_path, gt_path)
+        )
+        for pred_path, gt_path in pairs
+    ]
+
+    return __evaluate_frames(frames, config, metrics)
@@ -0,0 +1,154 @@
+# Copyright (c) 2022, Skolkovo Institute of Science and Technology (Skoltech)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from __future__ import annotations
+
+from typing import Any, Tuple
+from nptyping import NDArray
+
+import numpy as np
+
+from evops.utils.ContingencyMatrix import ContingencyMatrix
+from evops.utils.EvaluationConfig import EvaluationConfig
+from evops.utils.GroundTruth import GroundTruth
+from evops.utils.LabelEncoding import encode_labels, is_unsegmented
+from evops.utils.PlaneFitting import (
+    __fit_planes,
+    __plane_distances_rmse,
+    __segment_moments,
+)
+from evops.utils.RunLengthLabels import RunLengthLabels
+
+
+def __flat_labels(labels: Any) -> NDArray[Any, np.int32]:
+    if isinstance(labels, (GroundTruth, RunLengthLabels)):
+        labels = labels.labels_array()
+
+    return labels.reshape(-1)
+
+
+def __plane_moments(
+    points: NDArray[(Any, 3), np.float64],
+    labels: NDArray[Any, np.int32],
+    planes: NDArray[Any, np.int32],
+) -> Tuple[Any, ...]:
+    """
+    :param points: coordinates of points
+    :param labels: label of every point
+    :param planes: labels of planes to fit, all of them are labels of points
+    :return: size, centroid, covariance matrix, normal and fit RMSE of every plane
+    """
+    unique_labels, codes = encode_labels(labels)
+    sizes, centroids, covariances = __segment_moments(points, codes, unique_labels.size)
+    rows = np.searchsorted(unique_labels, planes)
+    sizes, centroids, covariances = sizes[rows], centroids[rows], covariances[rows]
+
+    return (sizes, centroids, covariances) + __fit_planes(sizes, covariances)
+
+
+def __plane_fits(
+    points: NDArray[Any, np.float64],
+    labels: Any,
+    config: EvaluationConfig,
+) -> NDArray[Any, Any]:
+    """
+    :param points: coordinates of points, (n, 3) or organized (h, w, 3)
+    :param labels: labels of points
+    :param config: settings of evaluation
+    :return: table with label, size, centroid, normal, fit RMSE of every plane
+        and whether a plane is fitted to its points
+    """
+    points = points.reshape(-1, 3).astype(np.float64, copy=False)
+    labels = __flat_labels(labels)
+    planes, _ = encode_labels(labels)
+    planes = planes[~is_unsegmented(planes, config.unsegmented_labels)]
+    sizes, centroids, _, normals, rmse = __plane_moments(points, labels, planes)
+
+    table = np.zeros(
+        planes.size,
+        [
+            ("label", planes.dtype),
+            ("size", np.int64),
+            ("centroid", np.float64, 3),
+            ("normal", np.float64, 3),
+            ("rmse", np.float64),
+            ("fitted", bool),
+        ],
+    )
+    table["label"] = planes
+    table["size"] = sizes
+    table["centroid"] = centroids
+    table["normal"] = normals
+    table["rmse"] = rmse
+    table["fitted"] = ~np.isnan(rmse)
+
+    return table
+
+
+def __plane_geometry(
+    points: NDArray[Any, np.float64],
+    pred_labels: Any,
+    gt_labels: Any,
+    config: EvaluationConfig,
+) -> NDArray[Any, Any]:
+    """
+    :param points: coordinates of points, (n, 3) or organized (h, w, 3)
+    :param pred_labels: labels of points obtained as a result of segmentation
+    :param gt_labels: reference labels of points or their GroundTruth
+    :param config: settings of evaluation
+    :return: table with a row for every matched pair of planes
+    """
+    contingency = ContingencyMatrix(pred_labels, gt_labels, config.unsegmented_labels)
+    pred_indices, gt_indices, pair_iou = contingency.match(
+        config.iou_threshold, config.matching
+    )
+    pred_planes = contingency.pred_labels[pred_indices]
+    gt_planes = contingency.gt_labels[gt_indices]
+
+    points = points.reshape(-1, 3).astype(np.float64, copy=False)
+    _, pred_centroids, pred_covariances, pred_normals, pred_rmse = __plane_moments(
+        points, __flat_labels(pred_labels), pred_planes
+    )
+    _, gt_centroids, _, gt_normals, gt_rmse = __plane_moments(
+        points, __flat_labels(gt_labels), gt_planes
+    )
+
+    # Normals of fitted planes have arbitrary orientation
+    cosines = np.abs(np.einsum("ij,ij->i", pred_normals, gt_normals))
+    table = np.zeros(
+        pred_planes.size,
+        [
+            ("pred_label", pred_planes.dtype),
+            ("gt_label", gt_planes.dtype),
+            ("iou", np.float64),
+            ("normal_angle", np.float64),
+            ("centroid_distance", np.float64),
+            ("rmse", np.float64),
+            ("pred_rmse", np.float64),
+            ("gt_rmse", np.float64),
+        ],
+    )
+    table["pred_label"] = pred_planes
+    table["gt_label"] = gt_planes
+    table["iou"] = pair_iou
+    table["normal_angle"] = np.degrees(np.arccos(np.minimum(cosines, 1)))
+    table["centroid_distance"] = np.abs(
+        np.einsum("ij,ij->i", gt_normals, pred_centroids - gt_centroids)
+    )
+    table["rmse"] = __plane_distances_rmse(
+        pred_centroids, pred_covariances, gt_normals, gt_centroids
+    )
+    table["pred_rmse"] = pred_rmse
+    table["gt_rmse"] = gt_rmse
+
+    return table
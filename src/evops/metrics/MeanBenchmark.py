@@ -11,13 +11,23 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
+from __future__ import annotations
+
 from typing import Any, Callable
 from nptyping import NDArray
-from evops.utils.MetricsUtils import __group_indices_by_labels
+from evops.metrics.DiceBenchmark import __dice
+from evops.metrics.IoUBenchmark import __iou
+from evops.utils.ContingencyMatrix import ContingencyMatrix
+from evops.utils.GroundTruth import GroundTruth
+from evops.utils.LabelEncoding import is_unsegmented
+from evops.utils.LabelGroups import LabelGroups
+from evops.utils.RunLengthLabels import RunLengthLabels
 
 import numpy as np
 import evops.metrics.constants
 
+__contingency_metrics = {__iou: "iou", __dice: "dice"}
+
 
 def __mean(
     pred_labels: NDArray[Any, np.int32],
@@ -27,21 +37,31 @@ def __mean(
         np.float64,
     ],
 ) -> np.float64:
-    plane_predicted_dict = __group_indices_by_labels(pred_labels)
-    plane_gt_dict = __group_indices_by_labels(gt_labels)
-    if evops.metrics.constants.UNSEGMENTED_LABEL in plane_predicted_dict:
-        del plane_predicted_dict[evops.metrics.constants.UNSEGMENTED_LABEL]
-    if evops.metrics.constants.UNSEGMENTED_LABEL in plane_gt_dict:
-        del plane_gt_dict[evops.metrics.constants.UNSEGMENTED_LABEL]
-    mean_array = np.zeros(len(plane_predicted_dict.keys()), np.float64)
-
-    for label_index, label in enumerate(plane_predicted_dict.keys()):
+    if metric in __contingency_metrics:
+        contingency = ContingencyMatrix(pred_labels, gt_labels)
+        return contingency.mean(__contingency_metrics[metric])
+
+    if isinstance(pred_labels, RunLengthLabels):
+        pred_labels = pred_labels.labels_array()
+    if isinstance(gt_labels, RunLengthLabels):
+        gt_labels = gt_labels.labels_array()
+    pred_groups = LabelGroups.from_labels(pred_labels.reshape(-1))
+    if isinstance(gt_labels, GroundTruth):
+        gt_groups = gt_labels.groups()
+    else:
+        gt_groups = LabelGroups.from_labels(gt_labels.reshape(-1))
+    unsegmented_label = evops.metrics.constants.UNSEGMENTED_LABEL
+    pred_planes = np.flatnonzero(~is_unsegmented(pred_groups.labels, unsegmented_label))
+    gt_planes = np.flatnonzero(~is_unsegmented(gt_groups.labels, unsegmented_label))
+    mean_array = np.zeros(pred_planes.size, np.float64)
+
+    for plane_index, pred_index in enumerate(pred_planes):
         max_metric_value = 0
-        for gt_label in plane_gt_dict.keys():
-            metric_value = metric(plane_predicted_dict[label], plane_gt_dict[gt_label])
+        for gt_index in gt_planes:
+            metric_value = metric(pred_groups[pred_index], gt_groups[gt_index])
             max_metric_value = max(max_metric_value, metric_value)
 
-        mean_array[label_index] = max_metric_value
+        mean_array[plane_index] = max_metric_value
 
     if mean_array.size == 0:
         return 0
@@ -0,0 +1,48 @@
+# Copyright (c) 2022, Skolkovo Institute of Science and Technology (Skoltech)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from __future__ import annotations
+
+from typing import Any, Sequence, Union
+from nptyping import NDArray
+
+import numpy as np
+
+from evops.utils.ContingencyMatrix import ContingencyMatrix
+from evops.utils.EvaluationConfig import EvaluationConfig
+from evops.utils.GroundTruth import GroundTruth
+from evops.utils.IndexSets import __index_sets_intersection, __overlap_scores
+
+
+def __overlap_matrix(
+    pred_labels: Union[NDArray[Any, np.int32], Sequence[NDArray[Any, np.int64]]],
+    gt_labels: Union[
+        NDArray[Any, np.int32], GroundTruth, Sequence[NDArray[Any, np.int64]]
+    ],
+    config: EvaluationConfig,
+    metric: str,
+) -> NDArray[(Any, Any), np.float64]:
+    """
+    :param pred_labels: labels of points or list of index arrays of predicted planes
+    :param gt_labels: labels of points or list of index arrays of ground truth planes
+    :param config: settings of evaluation
+    :param metric: name of the overlap metric: {'iou', 'dice'}
+    :return: metric value of every predicted (rows) and ground truth (columns) plane
+    """
+    if isinstance(pred_labels, np.ndarray):
+        contingency = ContingencyMatrix(
+            pred_labels, gt_labels, config.unsegmented_labels
+        )
+        return contingency.iou() if metric == "iou" else contingency.dice()
+
+    return __overlap_scores(*__index_sets_intersection(pred_labels, gt_labels), metric)
@@ -0,0 +1,252 @@
+# Copyright (c) 2022, Skolkovo Institute of Science and Technology (Skoltech)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from __future__ import annotations
+
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+from nptyping import NDArray
+
+import numpy as np
+
+# Resamples are drawn in chunks of at most this many frame weights
+RESAMPLE_CHUNK_ELEMENTS = 1 << 22
+
+__frame_metrics = ("precision", "recall", "fScore", "mean_iou", "mean_dice")
+__multi_value_sides = {
+    "precision": "predicted_amount",
+    "recall": "gt_amount",
+    "under_segmented": "predicted_amount",
+    "over_segmented": "gt_amount",
+    "missed": "gt_amount",
+    "noise": "predicted_amount",
+}
+
+
+def __ratio_columns(
+    frames: Dict[str, Any],
+) -> Tuple[List[Tuple[str, ...]], NDArray[Any, np.float64], NDArray[Any, np.float64]]:
+    """
+    Every dataset value is a ratio of sums over frames: means over frames divide
+    frame values by the amount of frames, micro averages divide plane counts
+    :param frames: arrays of evaluate() values for every frame
+    :return: path of every value in the dataset report, numerator and denominator
+        (frames, values) of every frame
+    """
+    frames_amount = frames["predicted_amount"].size
+    ones = np.ones(frames_amount, np.float64)
+    paths, numerators, denominators = [], [], []
+
+    def add(path: Tuple[str, ...], numerator: Any, denominator: Any):
+        paths.append(path)
+        numerators.append(np.asarray(numerator, np.float64))
+        denominators.append(np.asarray(denominator, np.float64))
+
+    for name in __frame_metrics:
+        if name in frames:
+            add((name,), frames[name], ones)
+    if "multi_value" in frames:
+        for name, values in frames["multi_value"].items():
+            add(("multi_value", name), values, ones)
+
+    predicted_amount = frames["predicted_amount"]
+    gt_amount = frames["gt_amount"]
+    if "true_positive" in frames:
+        true_positive = frames["true_positive"]
+        add(("micro", "precision"), true_positive, predicted_amount)
+        add(("micro", "recall"), true_positive, gt_amount)
+        add(("micro", "fScore"), 2 * true_positive, predicted_amount + gt_amount)
+    if "multi_value_counts" in frames:
+        counts = frames["multi_value_counts"]
+        for name, side in __multi_value_sides.items():
+            count = (
+                counts["correctly_segmented"]
+                if name in ("precision", "recall")
+                else counts[name]
+            )
+            add(("micro", "multi_value", name), count, frames[side])
+
+    return (
+        paths,
+        np.stack(numerators, axis=1).reshape(frames_amount, -1),
+        np.stack(denominators, axis=1).reshape(frames_amount, -1),
+    )
+
+
+def __ratios(numerator: Any, denominator: Any) -> Any:
+    return np.divide(
+        numerator,
+        denominator,
+        out=np.zeros(np.shape(numerator), np.float64),
+        where=denominator != 0,
+    )
+
+
+def __resample_weights(
+    frames_amount: int,
+    resamples: int,
+    generator: np.random.Generator,
+) -> Iterator[NDArray[(Any, Any), np.float64]]:
+    """
+    :param frames_amount: amount of frames
+    :param resamples: amount of bootstrap resamples
+    :param generator: source of random numbers
+    :return: chunks of (resamples, frames) matrices with the amount of times every
+        frame is drawn by every resample
+    """
+    chunk_size = max(1, RESAMPLE_CHUNK_ELEMENTS // max(frames_amount, 1))
+    for start in range(0, resamples, chunk_size):
+        rows = min(chunk_size, resamples - start)
+        drawn = generator.integers(0, frames_amount, (rows, frames_amount))
+        drawn += frames_amount * np.arange(rows)[:, np.newaxis]
+        yield np.bincount(drawn.reshape(-1), minlength=rows * frames_amount).reshape(
+            rows, frames_amount
+        ).astype(np.float64)
+
+
+def __swap_masks(
+    frames_amount: int,
+    resamples: int,
+    generator: np.random.Generator,
+) -> Iterator[NDArray[(Any, Any), np.float64]]:
+    """
+    :return: chunks of (resamples, frames) matrices marking frames whose results
+        are swapped between the compared algorithms
+    """
+    chunk_size = max(1, RESAMPLE_CHUNK_ELEMENTS // max(frames_amount, 1))
+    for start in range(0, resamples, chunk_size):
+        rows = min(chunk_size, resamples - start)
+        yield generator.integers(0, 2, (rows, frames_amount)).astype(np.float64)
+
+
+def __nest(paths: List[Tuple[str, ...]], values: List[Any]) -> Dict[str, Any]:
+    """
+    :param paths: path of every value in a nested dictionary
+    :param values: values
+    :return: nested dictionary of the values
+    """
+    nested = {}
+    for path, value in zip(paths, values):
+        level = nested
+        for key in path[:-1]:
+            level = level.setdefault(key, {})
+        level[path[-1]] = value
+
+    return nested
+
+
+def __confidence_intervals(
+    frames: Dict[str, Any],
+    confidence: float,
+    resamples: int,
+    seed: Optional[int],
+) -> Dict[str, Any]:
+    """
+    :param frames: arrays of evaluate() values for every frame
+    :param confidence: probability covered by the intervals
+    :param resamples: amount of bootstrap resamples of frames
+    :param seed: seed of resampling
+    :return: value, low and high bounds of the percentile bootstrap interval
+        of every dataset value
+    """
+    paths, numerators, denominators = __ratio_columns(frames)
+    generator = np.random.default_rng(seed)
+    estimates = __ratios(numerators.sum(axis=0), denominators.sum(axis=0))
+
+    # All values of all resamples are weighted sums of the same frame columns
+    columns = np.concatenate([numerators, denominators], axis=1)
+    statistics = []
+    for weights in __resample_weights(numerators.shape[0], resamples, generator):
+        sums = weights @ columns
+        statistics.append(__ratios(*np.split(sums, 2, axis=1)))
+    statistics = np.concatenate(statistics)
+
+    tail = (1 - confidence) / 2
+    low, high = np.quantile(statistics, [tail, 1 - tail], axis=0)
+
+    return __nest(
+        paths,
+        [
+            {"value": estimate, "low": low_bound, "high": high_bound}
+            for estimate, low_bound, high_bound in zip(estimates, low, high)
+        ],
+    )
+
+
+def __paired_test(
+    frames: Dict[str, Any],
+    other_frames: Dict[str, Any],
+    confidence: float,
+    resamples: int,
+    seed: Optional[int],
+) -> Dict[str, Any]:
+    """
+    :param frames: arrays of evaluate() values of the first algorithm for every frame
+    :param other_frames: the same values of the second algorithm for the same frames
+    :param confidence: probability covered by the intervals of differences
+    :param resamples: amount of bootstrap resamples and of random swaps of frames
+    :param seed: seed of resampling
+    :return: difference of every dataset value, its paired bootstrap interval and
+        two-sided p-value of the permutation test swapping results of random frames
+    """
+    paths, numerators, denominators = __ratio_columns(frames)
+    other_paths, other_numerators, other_denominators = __ratio_columns(other_frames)
+    common = [path in other_paths for path in paths]
+    other_rows = [other_paths.index(path) for path in paths if path in other_paths]
+    paths = [path for path, found in zip(paths, common) if found]
+    numerators, denominators = numerators[:, common], denominators[:, common]
+    other_numerators = other_numerators[:, other_rows]
+    other_denominators = other_denominators[:, other_rows]
+    generator = np.random.default_rng(seed)
+    frames_amount = numerators.shape[0]
+
+    def differences(sums: NDArray[(Any, Any), np.float64]) -> Any:
+        parts = np.split(sums, 4, axis=-1)
+        return __ratios(parts[0], parts[1]) - __ratios(parts[2], parts[3])
+
+    columns = np.concatenate(
+        [numerators, denominators, other_numerators, other_denominators], axis=1
+    )
+    difference = differences(columns.sum(axis=0))
+
+    bootstrap = np.concatenate(
+        [
+            differences(weights @ columns)
+            for weights in __resample_weights(frames_amount, resamples, generator)
+        ]
+    )
+    tail = (1 - confidence) / 2
+    low, high = np.quantile(bootstrap, [tail, 1 - tail], axis=0)
+
+    # Swapping a frame moves the difference of its columns from one side to the other
+    swapped = np.concatenate(
+        [
+            other_numerators - numerators,
+            other_denominators - denominators,
+            numerators - other_numerators,
+            denominators - other_denominators,
+        ],
+        axis=1,
+    )
+    extreme = np.zeros(difference.size, np.int64)
+    for masks in __swap_masks(frames_amount, resamples, generator):
+        permuted = differences(columns.sum(axis=0) + masks @ swapped)
+        extreme += np.sum(np.abs(permuted) >= np.abs(difference) - 1e-12, axis=0)
+    p_values = (extreme + 1) / (resamples + 1)
+
+    return __nest(
+        paths,
+        [
+            {"difference": value, "low": low_bound, "high": high_bound, "p_value": p}
+            for value, low_bound, high_bound, p in zip(difference, low, high, p_values)
+        ],
+    )
@@ -13,3 +13,15 @@
 # limitations under the License.
 UNSEGMENTED_LABEL = 0
 IOU_THRESHOLD = 0.75
+AVERAGE_PRECISION_IOU_THRESHOLDS = (
+    0.5,
+    0.55,
+    0.6,
+    0.65,
+    0.7,
+    0.75,
+    0.8,
+    0.85,
+    0.9,
+    0.95,
+)
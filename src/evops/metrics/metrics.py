@@ -11,23 +11,69 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
-from typing import Callable, Any
+from __future__ import annotations
+
+from concurrent.futures import Executor
+from typing import (
+    Callable,
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    Optional,
+    Sequence,
+    Tuple,
+    Union,
+)
 from nptyping import NDArray
 
+from evops.metrics.AsyncEvaluator import AsyncEvaluator
+from evops.metrics.BatchBenchmark import __evaluate_batch
+from evops.metrics.ClassBenchmark import __evaluate_classes
+from evops.metrics.CurveBenchmark import __multi_value_curve, __precision_recall_curve
+from evops.metrics.DatasetBenchmark import __evaluate_dataset, __iterate_dataset
 from evops.metrics.DefaultBenchmark import __precision, __recall, __fScore
 from evops.metrics.DiceBenchmark import __dice
+from evops.metrics.EvaluationAccumulator import EvaluationAccumulator
+from evops.metrics.EvaluationBenchmark import __evaluate
+from evops.metrics.FilesBenchmark import CHUNK_POINTS, __evaluate_files
+from evops.metrics.GeometryBenchmark import __plane_fits, __plane_geometry
 from evops.metrics.IoUBenchmark import __iou
 from evops.metrics.MultiValueBenchmark import __multi_value_benchmark
+from evops.metrics.OverlapBenchmark import __overlap_matrix
+from evops.metrics.StatisticsBenchmark import __confidence_intervals, __paired_test
 from evops.metrics.MeanBenchmark import __mean
+from evops.utils.ContingencyMatrix import ContingencyMatrix
+from evops.utils.EvaluationConfig import EvaluationConfig
+from evops.utils.GroundTruth import GroundTruth
+from evops.utils.LabelEncoder import LabelEncoder
+from evops.utils.LabelEncoding import pack_rgb
+from evops.utils.Profiler import Profiler, profiled
+from evops.utils.ResultCache import ResultCache, cached
+from evops.utils.RunLengthLabels import RunLengthLabels
 
+import os
 import numpy as np
+import evops.metrics.constants
 
 from evops.utils.CheckInput import (
+    __batch_benchmark_asserts,
+    __classes_asserts,
+    __dataset_benchmark_asserts,
     __default_benchmark_asserts,
+    __files_benchmark_asserts,
+    __geometry_asserts,
     __iou_dice_mean_bechmark_asserts,
+    __labels_asserts,
+    __matching_asserts,
+    __mean_benchmark_asserts,
+    __overlap_matrix_asserts,
+    __statistics_asserts,
+    __thresholds_asserts,
 )
 
 
+@profiled("iou")
 def iou(
     pred_labels: NDArray[Any, np.int32],
     gt_labels: NDArray[Any, np.int32],
@@ -43,6 +89,7 @@ def iou(
     return __iou(pred_labels, gt_labels)
 
 
+@profiled("dice")
 def dice(
     pred_labels: NDArray[Any, np.int32],
     gt_labels: NDArray[Any, np.int32],
@@ -58,6 +105,53 @@ def dice(
     return __dice(pred_labels, gt_labels)
 
 
+@profiled("iou_matrix")
+def iou_matrix(
+    pred_labels: Union[NDArray[Any, np.int32], Sequence[NDArray[Any, np.int64]]],
+    gt_labels: Union[NDArray[Any, np.int32], Sequence[NDArray[Any, np.int64]]],
+    config: Optional[EvaluationConfig] = None,
+) -> NDArray[(Any, Any), np.float64]:
+    """
+    :param pred_labels: labels of points obtained as a result of segmentation,
+        or list of index arrays of predicted planes
+    :param gt_labels: reference labels of point cloud or their GroundTruth,
+        or list of index arrays of reference planes
+    :param config: settings of evaluation, unsegmented labels are read from it
+    :return: IoU of every predicted (rows) and ground truth (columns) plane, planes
+        of label arrays are sorted by label and exclude unsegmented labels, planes
+        of index arrays keep their order
+    """
+    if config is None:
+        config = EvaluationConfig.from_constants()
+    __overlap_matrix_asserts(pred_labels, gt_labels)
+
+    return __overlap_matrix(pred_labels, gt_labels, config, "iou")
+
+
+@profiled("dice_matrix")
+def dice_matrix(
+    pred_labels: Union[NDArray[Any, np.int32], Sequence[NDArray[Any, np.int64]]],
+    gt_labels: Union[NDArray[Any, np.int32], Sequence[NDArray[Any, np.int64]]],
+    config: Optional[EvaluationConfig] = None,
+) -> NDArray[(Any, Any), np.float64]:
+    """
+    :param pred_labels: labels of points obtained as a result of segmentation,
+        or list of index arrays of predicted planes
+    :param gt_labels: reference labels of point cloud or their GroundTruth,
+        or list of index arrays of reference planes
+    :param config: settings of evaluation, unsegmented labels are read from it
+    :return: Dice of every predicted (rows) and ground truth (columns) plane, in the
+        order of iou_matrix()
+    """
+    if config is None:
+        config = EvaluationConfig.from_constants()
+    __overlap_matrix_asserts(pred_labels, gt_labels)
+
+    return __overlap_matrix(pred_labels, gt_labels, config, "dice")
+
+
+@profiled("precision")
+@cached("precision")
 def precision(
     pred_labels: NDArray[Any, np.int32],
     gt_labels: NDArray[Any, np.int32],
@@ -75,6 +169,8 @@ def precision(
     return __precision(pred_labels, gt_labels, tp_condition)
 
 
+@profiled("recall")
+@cached("recall")
 def recall(
     pred_labels: NDArray[Any, np.int32],
     gt_labels: NDArray[Any, np.int32],
@@ -92,6 +188,8 @@ def recall(
     return __recall(pred_labels, gt_labels, tp_condition)
 
 
+@profiled("fScore")
+@cached("fScore")
 def fScore(
     pred_labels: NDArray[Any, np.int32],
     gt_labels: NDArray[Any, np.int32],
@@ -109,6 +207,8 @@ def fScore(
     return __fScore(pred_labels, gt_labels, tp_condition)
 
 
+@profiled("mean")
+@cached("mean")
 def mean(
     pred_labels: NDArray[Any, np.int32],
     gt_labels: NDArray[Any, np.int32],
@@ -120,15 +220,21 @@ def mean(
     """
     :param pc_points: source point cloud
     :param pred_labels: labels of points obtained as a result of segmentation
-    :param gt_labels: reference labels of point cloud
+    :param gt_labels: reference labels of point cloud or their GroundTruth
     :param metric: metric function for which you want to get the mean value
     :return: list of mean value for each metric
     """
-    __iou_dice_mean_bechmark_asserts(pred_labels, gt_labels)
+    __mean_benchmark_asserts(pred_labels, gt_labels)
+    if metric is iou:
+        metric = __iou
+    elif metric is dice:
+        metric = __dice
 
     return __mean(pred_labels, gt_labels, metric)
 
 
+@profiled("multi_value")
+@cached("multi_value")
 def multi_value(
     pred_labels: NDArray[Any, np.int32],
     gt_labels: NDArray[Any, np.int32],
@@ -137,10 +243,747 @@ def multi_value(
     """
     :param pc_points: source point cloud
     :param pred_labels: labels of points obtained as a result of segmentation
-    :param gt_labels: reference labels of point cloud
+    :param gt_labels: reference labels of point cloud or their GroundTruth
     :param overlap_threshold: minimum value at which the planes are considered intersected
     :return: precision, recall, under_segmented, over_segmented, missed, noise
     """
-    __iou_dice_mean_bechmark_asserts(pred_labels, gt_labels)
+    __mean_benchmark_asserts(pred_labels, gt_labels)
 
     return __multi_value_benchmark(pred_labels, gt_labels, overlap_threshold)
+
+
+@profiled("precision_recall_curve")
+@cached("precision_recall_curve")
+def precision_recall_curve(
+    pred_labels: NDArray[Any, np.int32],
+    gt_labels: NDArray[Any, np.int32],
+    tp_condition: str = "iou",
+    iou_thresholds: Optional[Sequence[np.float64]] = None,
+    matching: str = "first_fit",
+    config: Optional[EvaluationConfig] = None,
+) -> Dict[str, NDArray[Any, np.float64]]:
+    """
+    :param pred_labels: labels of points obtained as a result of segmentation
+    :param gt_labels: reference labels of point cloud or their GroundTruth
+    :param tp_condition: helper function to calculate statistics: {'iou'}
+    :param iou_thresholds: list of minimum IoU values of matched planes,
+        AVERAGE_PRECISION_IOU_THRESHOLDS by default
+    :param matching: strategy of one-to-one matching: {'first_fit', 'greedy', 'optimal'}
+    :param config: settings of evaluation, used instead of the constants and settings above
+    :return: iou_thresholds and precision, recall, fScore and true_positive for each of them,
+        computed from a single pass over the labels
+    """
+    if iou_thresholds is None:
+        iou_thresholds = evops.metrics.constants.AVERAGE_PRECISION_IOU_THRESHOLDS
+    if config is None:
+        config = EvaluationConfig.from_constants(matching=matching)
+    __default_benchmark_asserts(pred_labels, gt_labels, tp_condition)
+    __thresholds_asserts(iou_thresholds)
+    __matching_asserts(config.matching)
+
+    return __precision_recall_curve(pred_labels, gt_labels, iou_thresholds, config)
+
+
+@profiled("average_precision")
+@cached("average_precision")
+def average_precision(
+    pred_labels: NDArray[Any, np.int32],
+    gt_labels: NDArray[Any, np.int32],
+    tp_condition: str = "iou",
+    iou_thresholds: Optional[Sequence[np.float64]] = None,
+    matching: str = "first_fit",
+    config: Optional[EvaluationConfig] = None,
+) -> np.float64:
+    """
+    :param pred_labels: labels of points obtained as a result of segmentation
+    :param gt_labels: reference labels of point cloud or their GroundTruth
+    :param tp_condition: helper function to calculate statistics: {'iou'}
+    :param iou_thresholds: list of minimum IoU values of matched planes,
+        AVERAGE_PRECISION_IOU_THRESHOLDS (0.5:0.95 as in COCO) by default
+    :param matching: strategy of one-to-one matching: {'first_fit', 'greedy', 'optimal'}
+    :param config: settings of evaluation, used instead of the constants and settings above
+    :return: precision averaged over the thresholds
+    """
+    curve = precision_recall_curve(
+        pred_labels, gt_labels, tp_condition, iou_thresholds, matching, config
+    )
+
+    return curve["precision"].mean()
+
+
+@profiled("multi_value_curve")
+@cached("multi_value_curve")
+def multi_value_curve(
+    pred_labels: NDArray[Any, np.int32],
+    gt_labels: NDArray[Any, np.int32],
+    overlap_thresholds: Sequence[np.float64],
+    config: Optional[EvaluationConfig] = None,
+) -> Dict[str, NDArray[Any, np.float64]]:
+    """
+    :param pred_labels: labels of points obtained as a result of segmentation
+    :param gt_labels: reference labels of point cloud or their GroundTruth
+    :param overlap_thresholds: list of minimum values at which the planes are considered intersected
+    :param config: settings of evaluation, used instead of the constants
+    :return: precision, recall, under_segmented, over_segmented, missed, noise
+        for each threshold, computed from a single pass over the labels
+    """
+    if config is None:
+        config = EvaluationConfig.from_constants()
+    __mean_benchmark_asserts(pred_labels, gt_labels)
+    __thresholds_asserts(overlap_thresholds)
+
+    return __multi_value_curve(pred_labels, gt_labels, overlap_thresholds, config)
+
+
+@profiled("match")
+@cached("match")
+def match(
+    pred_labels: NDArray[Any, np.int32],
+    gt_labels: NDArray[Any, np.int32],
+    matching: str = "optimal",
+    iou_threshold: Optional[np.float64] = None,
+    config: Optional[EvaluationConfig] = None,
+) -> Tuple[NDArray[Any, np.int32], NDArray[Any, np.int32], NDArray[Any, np.float64]]:
+    """
+    :param pred_labels: labels of points obtained as a result of segmentation
+    :param gt_labels: reference labels of point cloud or their GroundTruth
+    :param matching: strategy of one-to-one matching: {'first_fit', 'greedy', 'optimal'}
+    :param iou_threshold: minimum IoU of matched planes, IOU_THRESHOLD by default
+    :param config: settings of evaluation, used instead of the constants and settings above
+    :return: predicted label, ground truth label and IoU of every matched pair of planes
+    """
+    if config is None:
+        config = EvaluationConfig.from_constants(matching=matching)
+        if iou_threshold is not None:
+            config = config.replace(iou_threshold=iou_threshold)
+    __mean_benchmark_asserts(pred_labels, gt_labels)
+    __matching_asserts(config.matching)
+
+    contingency = ContingencyMatrix(pred_labels, gt_labels, config.unsegmented_labels)
+    pred_indices, gt_indices, pair_iou = contingency.match(
+        config.iou_threshold, config.matching
+    )
+
+    return (
+        contingency.pred_labels[pred_indices],
+        contingency.gt_labels[gt_indices],
+        pair_iou,
+    )
+
+
+@profiled("segment_tables")
+@cached("segment_tables")
+def segment_tables(
+    pred_labels: NDArray[Any, np.int32],
+    gt_labels: NDArray[Any, np.int32],
+    overlap_threshold: np.float64 = 0.8,
+    matching: str = "first_fit",
+    config: Optional[EvaluationConfig] = None,
+) -> Tuple[NDArray[Any, Any], NDArray[Any, Any]]:
+    """
+    :param pred_labels: labels of points obtained as a result of segmentation
+    :param gt_labels: reference labels of point cloud or their GroundTruth
+    :param overlap_threshold: minimum value at which the planes are considered intersected
+    :param matching: strategy of one-to-one matching: {'first_fit', 'greedy', 'optimal'}
+    :param config: settings of evaluation, used instead of the constants and settings above
+    :return: structured arrays with a row for every predicted and every ground truth
+        plane: label, size, overlaps, best_label, best_iou, best_dice, matched,
+        matched_label, matched_iou, correctly_segmented and under_segmented, noise
+        for predicted or over_segmented, missed for ground truth planes
+    """
+    if config is None:
+        config = EvaluationConfig.from_constants(
+            overlap_threshold=overlap_threshold, matching=matching
+        )
+    __mean_benchmark_asserts(pred_labels, gt_labels)
+    __matching_asserts(config.matching)
+
+    contingency = ContingencyMatrix(pred_labels, gt_labels, config.unsegmented_labels)
+
+    return contingency.segment_tables(
+        config.iou_threshold, config.overlap_threshold, config.matching
+    )
+
+
+@profiled("plane_fits")
+def plane_fits(
+    points: NDArray[Any, np.float64],
+    labels: NDArray[Any, np.int32],
+    config: Optional[EvaluationConfig] = None,
+) -> NDArray[Any, Any]:
+    """
+    :param points: coordinates of points, (n, 3) or organized (h, w, 3)
+    :param labels: labels of points, e.g. obtained as a result of segmentation
+    :param config: settings of evaluation, current constants by default
+    :return: structured array with a row for every plane: label, size, centroid,
+        unit normal, rmse of distances from its points to the least squares plane
+        and fitted, which is false for planes of less than 3 points, whose normal
+        and rmse are NaN as no plane is defined by them
+    """
+    if config is None:
+        config = EvaluationConfig.from_constants()
+    __labels_asserts(labels)
+    __geometry_asserts(points, labels)
+
+    return __plane_fits(points, labels, config)
+
+
+@profiled("plane_geometry")
+def plane_geometry(
+    points: NDArray[Any, np.float64],
+    pred_labels: NDArray[Any, np.int32],
+    gt_labels: NDArray[Any, np.int32],
+    matching: str = "first_fit",
+    iou_threshold: Optional[np.float64] = None,
+    config: Optional[EvaluationConfig] = None,
+) -> NDArray[Any, Any]:
+    """
+    :param points: coordinates of points, (n, 3) or organized (h, w, 3)
+    :param pred_labels: labels of points obtained as a result of segmentation
+    :param gt_labels: reference labels of point cloud or their GroundTruth
+    :param matching: strategy of one-to-one matching: {'first_fit', 'greedy', 'optimal'}
+    :param iou_threshold: minimum IoU of matched planes, IOU_THRESHOLD by default
+    :param config: settings of evaluation, used instead of the constants and settings above
+    :return: structured array with a row for every matched pair of planes: pred_label,
+        gt_label, iou, normal_angle in degrees between the fitted planes,
+        centroid_distance from the predicted centroid to the ground truth plane, rmse
+        of distances from predicted points to the ground truth plane and pred_rmse,
+        gt_rmse of distances to their own fitted planes
+    """
+    if config is None:
+        config = EvaluationConfig.from_constants(matching=matching)
+        if iou_threshold is not None:
+            config = config.replace(iou_threshold=iou_threshold)
+    __mean_benchmark_asserts(pred_labels, gt_labels)
+    __geometry_asserts(points, pred_labels)
+    __matching_asserts(config.matching)
+
+    return __plane_geometry(points, pred_labels, gt_labels, config)
+
+
+@profiled("evaluate")
+@cached("evaluate")
+def evaluate(
+    pred_labels: NDArray[Any, np.int32],
+    gt_labels: NDArray[Any, np.int32],
+    tp_condition: str = "iou",
+    overlap_threshold: np.float64 = 0.8,
+    matching: str = "first_fit",
+    config: Optional[EvaluationConfig] = None,
+) -> Dict[str, Any]:
+    """
+    :param pred_labels: labels of points obtained as a result of segmentation,
+        label images of organized clouds or their RunLengthLabels are counted over runs
+    :param gt_labels: reference labels of point cloud or their GroundTruth
+    :param tp_condition: helper function to calculate statistics: {'iou'}
+    :param overlap_threshold: minimum value at which the planes are considered intersected
+    :param matching: strategy of one-to-one matching: {'first_fit', 'greedy', 'optimal'}
+    :param config: settings of evaluation, used instead of the constants and settings above
+    :return: precision, recall, fScore, mean_iou, mean_dice, multi_value and plane counts
+        computed from a single pass over the labels
+    """
+    if config is None:
+        config = EvaluationConfig.from_constants(
+            overlap_threshold=overlap_threshold, matching=matching
+        )
+    __default_benchmark_asserts(pred_labels, gt_labels, tp_condition)
+    __matching_asserts(config.matching)
+
+    return __evaluate(pred_labels, gt_labels, config)
+
+
+@profiled("evaluate_classes")
+@cached("evaluate_classes")
+def evaluate_classes(
+    pred_labels: NDArray[Any, np.int32],
+    gt_labels: NDArray[Any, np.int32],
+    classes: Union[NDArray[Any, Any], Dict[Any, Any]],
+    tp_condition: str = "iou",
+    overlap_threshold: np.float64 = 0.8,
+    matching: str = "first_fit",
+    config: Optional[EvaluationConfig] = None,
+) -> Dict[str, Any]:
+    """
+    :param pred_labels: labels of points obtained as a result of segmentation
+    :param gt_labels: reference labels of point cloud or their GroundTruth
+    :param classes: class of every point, e.g. floor or wall, or dictionary with the
+        class of every reference label, points of labels without a class are treated
+        as unsegmented in every class
+    :param tp_condition: helper function to calculate statistics: {'iou'}
+    :param overlap_threshold: minimum value at which the planes are considered intersected
+    :param matching: strategy of one-to-one matching: {'first_fit', 'greedy', 'optimal'}
+    :param config: settings of evaluation, used instead of the constants and settings above
+    :return: sorted "classes", "per_class" with arrays of evaluate() values of the points
+        of every class and "dataset" with their macro averages over classes, micro
+        averages over the planes of all classes and total plane counts. Every class holds
+        the predicted planes overlapping its points or points without a class, with all
+        their points, points outside of the class count as unsegmented ground truth
+    """
+    if config is None:
+        config = EvaluationConfig.from_constants(
+            overlap_threshold=overlap_threshold, matching=matching
+        )
+    __default_benchmark_asserts(pred_labels, gt_labels, tp_condition)
+    __classes_asserts(gt_labels, classes)
+    __matching_asserts(config.matching)
+
+    return __evaluate_classes(pred_labels, gt_labels, classes, config)
+
+
+@profiled("evaluate_batch")
+@cached("evaluate_batch")
+def evaluate_batch(
+    pred_labels: Union[NDArray[Any, np.int32], Sequence[NDArray[Any, np.int32]]],
+    gt_labels: Union[NDArray[Any, np.int32], Sequence[NDArray[Any, np.int32]]],
+    frame_offsets: Optional[NDArray[Any, np.int64]] = None,
+    tp_condition: str = "iou",
+    overlap_threshold: np.float64 = 0.8,
+    matching: str = "first_fit",
+    config: Optional[EvaluationConfig] = None,
+) -> Dict[str, Any]:
+    """
+    :param pred_labels: list of predicted label arrays of every frame or their concatenation
+    :param gt_labels: list of reference label arrays of every frame or their concatenation
+    :param frame_offsets: for concatenated labels, index of the first point of every frame
+        followed by the total amount of points
+    :param tp_condition: helper function to calculate statistics: {'iou'}
+    :param overlap_threshold: minimum value at which the planes are considered intersected
+    :param matching: strategy of one-to-one matching: {'first_fit', 'greedy', 'optimal'}
+    :param config: settings of evaluation, used instead of the constants and settings above
+    :return: "frames" with arrays of evaluate() values for every frame and "dataset" with
+        their means, micro averages over all planes and total plane counts
+    """
+    if config is None:
+        config = EvaluationConfig.from_constants(
+            overlap_threshold=overlap_threshold, matching=matching
+        )
+    __batch_benchmark_asserts(pred_labels, gt_labels, frame_offsets, tp_condition)
+    __matching_asserts(config.matching)
+
+    return __evaluate_batch(pred_labels, gt_labels, frame_offsets, config)
+
+
+def iterate_dataset(
+    pred_frames: Iterable[NDArray[Any, np.int32]],
+    gt_frames: Iterable[NDArray[Any, np.int32]],
+    tp_condition: str = "iou",
+    overlap_threshold: np.float64 = 0.8,
+    metrics: Optional[Sequence[str]] = None,
+    workers: Optional[int] = None,
+    executor: Union[str, Executor] = "process",
+    chunk_size: int = 1,
+    matching: str = "first_fit",
+    config: Optional[EvaluationConfig] = None,
+) -> Iterator[Dict[str, Any]]:
+    """
+    :param pred_frames: predicted label arrays of every frame, may be a lazy iterable
+    :param gt_frames: reference label arrays of every frame, may be a lazy iterable
+    :param tp_condition: helper function to calculate statistics: {'iou'}
+    :param overlap_threshold: minimum value at which the planes are considered intersected
+    :param metrics: names of metrics to compute:
+        {'precision', 'recall', 'fScore', 'mean_iou', 'mean_dice', 'multi_value'}, all by default
+    :param workers: amount of workers, CPU count by default, 0 evaluates in the calling thread
+    :param executor: {'process', 'thread'} or an executor to run workers in
+    :param chunk_size: amount of frames sent to a worker at once
+    :param matching: strategy of one-to-one matching: {'first_fit', 'greedy', 'optimal'}
+    :param config: settings of evaluation, used instead of the constants and settings above
+    :return: evaluate() values of every frame, yielded in the order of frames
+    """
+    if config is None:
+        config = EvaluationConfig.from_constants(
+            overlap_threshold=overlap_threshold, matching=matching
+        )
+    __dataset_benchmark_asserts(tp_condition, metrics, workers, executor, chunk_size)
+    __matching_asserts(config.matching)
+
+    return __iterate_dataset(
+        zip(pred_frames, gt_frames), config, metrics, workers, executor, chunk_size
+    )
+
+
+@profiled("evaluate_dataset")
+def evaluate_dataset(
+    pred_frames: Iterable[NDArray[Any, np.int32]],
+    gt_frames: Iterable[NDArray[Any, np.int32]],
+    tp_condition: str = "iou",
+    overlap_threshold: np.float64 = 0.8,
+    metrics: Optional[Sequence[str]] = None,
+    workers: Optional[int] = None,
+    executor: Union[str, Executor] = "process",
+    chunk_size: int = 1,
+    matching: str = "first_fit",
+    config: Optional[EvaluationConfig] = None,
+) -> Dict[str, Any]:
+    """
+    :param pred_frames: predicted label arrays of every frame, may be a lazy iterable
+    :param gt_frames: reference label arrays of every frame, may be a lazy iterable
+    :param tp_condition: helper function to calculate statistics: {'iou'}
+    :param overlap_threshold: minimum value at which the planes are considered intersected
+    :param metrics: names of metrics to compute:
+        {'precision', 'recall', 'fScore', 'mean_iou', 'mean_dice', 'multi_value'}, all by default
+    :param workers: amount of workers, CPU count by default, 0 evaluates in the calling thread
+    :param executor: {'process', 'thread'} or an executor to run workers in
+    :param chunk_size: amount of frames sent to a worker at once
+    :param matching: strategy of one-to-one matching: {'first_fit', 'greedy', 'optimal'}
+    :param config: settings of evaluation, used instead of the constants and settings above
+    :return: "frames" and "dataset" reports in the format of evaluate_batch(),
+        identical for any amount of workers
+    """
+    if config is None:
+        config = EvaluationConfig.from_constants(
+            overlap_threshold=overlap_threshold, matching=matching
+        )
+    __dataset_benchmark_asserts(tp_condition, metrics, workers, executor, chunk_size)
+    __matching_asserts(config.matching)
+
+    return __evaluate_dataset(
+        zip(pred_frames, gt_frames), config, metrics, workers, executor, chunk_size
+    )
+
+
+@profiled("evaluate_files")
+def evaluate_files(
+    pred_sources: Union[
+        str, os.PathLike, NDArray[Any, np.int32], Sequence[Union[str, os.PathLike]]
+    ],
+    gt_sources: Union[
+        str, os.PathLike, NDArray[Any, np.int32], Sequence[Union[str, os.PathLike]]
+    ],
+    tp_condition: str = "iou",
+    overlap_threshold: np.float64 = 0.8,
+    dtype: np.dtype = np.uint32,
+    label_field: str = "full",
+    chunk_points: int = CHUNK_POINTS,
+    matching: str = "first_fit",
+    config: Optional[EvaluationConfig] = None,
+) -> Dict[str, Any]:
+    """
+    Evaluates labels that do not fit in memory chunk by chunk, so memory usage
+    depends on the amount of planes and chunk size, not the amount of points
+    :param pred_sources: predicted labels of every frame: paths to .npy files, to raw
+        binary files like SemanticKITTI .label, to other files read by
+        evops.io.read_labels() or memory-mapped arrays
+    :param gt_sources: reference labels of every frame in the same format
+    :param tp_condition: helper function to calculate statistics: {'iou'}
+    :param overlap_threshold: minimum value at which the planes are considered intersected
+    :param dtype: type of labels in raw binary files
+    :param label_field: part of labels to evaluate: {'full', 'semantic', 'instance'},
+        semantic and instance labels are the lower and upper 16 bits as in SemanticKITTI
+    :param chunk_points: amount of points read at once
+    :param matching: strategy of one-to-one matching: {'first_fit', 'greedy', 'optimal'}
+    :param config: settings of evaluation, used instead of the constants and settings above
+    :return: "frames" and "dataset" reports in the format of evaluate_batch()
+    """
+    if isinstance(pred_sources, (str, os.PathLike, np.ndarray)):
+        pred_sources = [pred_sources]
+    if isinstance(gt_sources, (str, os.PathLike, np.ndarray)):
+        gt_sources = [gt_sources]
+    if config is None:
+        config = EvaluationConfig.from_constants(
+            overlap_threshold=overlap_threshold, matching=matching
+        )
+    __files_benchmark_asserts(
+        pred_sources, gt_sources, tp_condition, label_field, chunk_points
+    )
+    __matching_asserts(config.matching)
+
+    return __evaluate_files(
+        pred_sources, gt_sources, config, dtype, label_field, chunk_points
+    )
+
+
+def confidence_intervals(
+    frames: Dict[str, Any],
+    confidence: np.float64 = 0.95,
+    resamples: int = 10000,
+    seed: Optional[int] = None,
+) -> Dict[str, Any]:
+    """
+    :param frames: "frames" of evaluate_batch(), evaluate_dataset() or evaluate_files()
+        results or the whole results
+    :param confidence: probability covered by the intervals
+    :param resamples: amount of bootstrap resamples of frames
+    :param seed: seed of resampling
+    :return: dataset values of the results, each as "value" with "low" and "high"
+        bounds of its percentile bootstrap interval over frames
+    """
+    frames = frames.get("frames", frames)
+    __statistics_asserts(frames, confidence, resamples)
+
+    return __confidence_intervals(frames, confidence, resamples, seed)
+
+
+def paired_test(
+    frames: Dict[str, Any],
+    other_frames: Dict[str, Any],
+    confidence: np.float64 = 0.95,
+    resamples: int = 10000,
+    seed: Optional[int] = None,
+) -> Dict[str, Any]:
+    """
+    :param frames: "frames" of results of the first algorithm or the whole results
+    :param other_frames: results of the second algorithm for the same frames
+    :param confidence: probability covered by the intervals of differences
+    :param resamples: amount of bootstrap resamples and of random swaps of frames
+    :param seed: seed of resampling
+    :return: dataset values computed by both results, each as "difference" of the
+        first and the second value, "low" and "high" bounds of its paired bootstrap
+        interval and "p_value" of the paired permutation test of equal values
+    """
+    frames = frames.get("frames", frames)
+    other_frames = other_frames.get("frames", other_frames)
+    __statistics_asserts(frames, confidence, resamples)
+    __statistics_asserts(other_frames, confidence, resamples)
+    assert (
+        frames["predicted_amount"].size == other_frames["predicted_amount"].size
+    ), "Compared results must have the same amount of frames"
+
+    return __paired_test(frames, other_frames, confidence, resamples, seed)
+
+
+class Evaluator:
+    """
+    Evaluation functions bound to one set of settings. Settings are fixed
+    when the evaluator is created, so evaluators with different settings
+    can be used from concurrent threads and coroutines.
+    """
+
+    def __init__(self, config: Optional[EvaluationConfig] = None, **changes: Any):
+        """
+        :param config: settings of evaluation, current constants by default
+        :param changes: values of settings that differ from config
+        """
+        if config is None:
+            config = EvaluationConfig.from_constants()
+        self.config = config.replace(**changes)
+
+    def contingency(
+        self,
+        pred_labels: NDArray[Any, np.int32],
+        gt_labels: NDArray[Any, np.int32],
+    ) -> ContingencyMatrix:
+        """
+        :param pred_labels: labels of points obtained as a result of segmentation
+        :param gt_labels: reference labels of point cloud or their GroundTruth
+        :return: overlap counts of predicted and ground truth planes
+        """
+        return ContingencyMatrix(pred_labels, gt_labels, self.config.unsegmented_labels)
+
+    def evaluate(
+        self,
+        pred_labels: NDArray[Any, np.int32],
+        gt_labels: NDArray[Any, np.int32],
+    ) -> Dict[str, Any]:
+        """
+        :param pred_labels: labels of points obtained as a result of segmentation
+        :param gt_labels: reference labels of point cloud or their GroundTruth
+        :return: evaluate() values for the settings of the evaluator
+        """
+        return evaluate(pred_labels, gt_labels, config=self.config)
+
+    def evaluate_classes(
+        self,
+        pred_labels: NDArray[Any, np.int32],
+        gt_labels: NDArray[Any, np.int32],
+        classes: Union[NDArray[Any, Any], Dict[Any, Any]],
+    ) -> Dict[str, Any]:
+        """
+        :param pred_labels: labels of points obtained as a result of segmentation
+        :param gt_labels: reference labels of point cloud or their GroundTruth
+        :param classes: class of every point or dictionary with the class of every
+            reference label
+        :return: evaluate_classes() values for the settings of the evaluator
+        """
+        return evaluate_classes(pred_labels, gt_labels, classes, config=self.config)
+
+    def evaluate_batch(
+        self,
+        pred_labels: Union[NDArray[Any, np.int32], Sequence[NDArray[Any, np.int32]]],
+        gt_labels: Union[NDArray[Any, np.int32], Sequence[NDArray[Any, np.int32]]],
+        frame_offsets: Optional[NDArray[Any, np.int64]] = None,
+    ) -> Dict[str, Any]:
+        """
+        :param pred_labels: list of predicted label arrays of every frame or their concatenation
+        :param gt_labels: list of reference label arrays of every frame or their concatenation
+        :param frame_offsets: for concatenated labels, index of the first point of every frame
+            followed by the total amount of points
+        :return: evaluate_batch() values for the settings of the evaluator
+        """
+        return evaluate_batch(pred_labels, gt_labels, frame_offsets, config=self.config)
+
+    def iterate_dataset(
+        self,
+        pred_frames: Iterable[NDArray[Any, np.int32]],
+        gt_frames: Iterable[NDArray[Any, np.int32]],
+        metrics: Optional[Sequence[str]] = None,
+        workers: Optional[int] = None,
+        executor: Union[str, Executor] = "process",
+        chunk_size: int = 1,
+    ) -> Iterator[Dict[str, Any]]:
+        """
+        :param pred_frames: predicted label arrays of every frame, may be a lazy iterable
+        :param gt_frames: reference label arrays of every frame, may be a lazy iterable
+        :param metrics: names of metrics to compute, all by default
+        :param workers: amount of workers, CPU count by default, 0 evaluates in the calling thread
+        :param executor: {'process', 'thread'} or an executor to run workers in
+        :param chunk_size: amount of frames sent to a worker at once
+        :return: iterate_dataset() values for the settings of the evaluator
+        """
+        return iterate_dataset(
+            pred_frames,
+            gt_frames,
+            metrics=metrics,
+            workers=workers,
+            executor=executor,
+            chunk_size=chunk_size,
+            config=self.config,
+        )
+
+    def evaluate_dataset(
+        self,
+        pred_frames: Iterable[NDArray[Any, np.int32]],
+        gt_frames: Iterable[NDArray[Any, np.int32]],
+        metrics: Optional[Sequence[str]] = None,
+        workers: Optional[int] = None,
+        executor: Union[str, Executor] = "process",
+        chunk_size: int = 1,
+    ) -> Dict[str, Any]:
+        """
+        :param pred_frames: predicted label arrays of every frame, may be a lazy iterable
+        :param gt_frames: reference label arrays of every frame, may be a lazy iterable
+        :param metrics: names of metrics to compute, all by default
+        :param workers: amount of workers, CPU count by default, 0 evaluates in the calling thread
+        :param executor: {'process', 'thread'} or an executor to run workers in
+        :param chunk_size: amount of frames sent to a worker at once
+        :return: evaluate_dataset() values for the settings of the evaluator
+        """
+        return evaluate_dataset(
+            pred_frames,
+            gt_frames,
+            metrics=metrics,
+            workers=workers,
+            executor=executor,
+            chunk_size=chunk_size,
+            config=self.config,
+        )
+
+    def evaluate_files(
+        self,
+        pred_sources: Union[
+            str, os.PathLike, NDArray[Any, np.int32], Sequence[Union[str, os.PathLike]]
+        ],
+        gt_sources: Union[
+            str, os.PathLike, NDArray[Any, np.int32], Sequence[Union[str, os.PathLike]]
+        ],
+        dtype: np.dtype = np.uint32,
+        label_field: str = "full",
+        chunk_points: int = CHUNK_POINTS,
+    ) -> Dict[str, Any]:
+        """
+        :param pred_sources: predicted labels of every frame: paths to .npy files, to raw
+            binary files like SemanticKITTI .label, to other files read by
+            evops.io.read_labels() or memory-mapped arrays
+        :param gt_sources: reference labels of every frame in the same format
+        :param dtype: type of labels in raw binary files
+        :param label_field: part of labels to evaluate: {'full', 'semantic', 'instance'}
+        :param chunk_points: amount of points read at once
+        :return: evaluate_files() values for the settings of the evaluator
+        """
+        return evaluate_files(
+            pred_sources,
+            gt_sources,
+            dtype=dtype,
+            label_field=label_field,
+            chunk_points=chunk_points,
+            config=self.config,
+        )
+
+    def precision_recall_curve(
+        self,
+        pred_labels: NDArray[Any, np.int32],
+        gt_labels: NDArray[Any, np.int32],
+        iou_thresholds: Optional[Sequence[np.float64]] = None,
+    ) -> Dict[str, NDArray[Any, np.float64]]:
+        """
+        :param pred_labels: labels of points obtained as a result of segmentation
+        :param gt_labels: reference labels of point cloud or their GroundTruth
+        :param iou_thresholds: list of minimum IoU values of matched planes,
+            AVERAGE_PRECISION_IOU_THRESHOLDS by default
+        :return: precision_recall_curve() values for the settings of the evaluator
+        """
+        return precision_recall_curve(
+            pred_labels, gt_labels, iou_thresholds=iou_thresholds, config=self.config
+        )
+
+    def average_precision(
+        self,
+        pred_labels: NDArray[Any, np.int32],
+        gt_labels: NDArray[Any, np.int32],
+        iou_thresholds: Optional[Sequence[np.float64]] = None,
+    ) -> np.float64:
+        """
+        :param pred_labels: labels of points obtained as a result of segmentation
+        :param gt_labels: reference labels of point cloud or their GroundTruth
+        :param iou_thresholds: list of minimum IoU values of matched planes,
+            AVERAGE_PRECISION_IOU_THRESHOLDS by default
+        :return: average_precision() value for the settings of the evaluator
+        """
+        return average_precision(
+            pred_labels, gt_labels, iou_thresholds=iou_thresholds, config=self.config
+        )
+
+    def multi_value_curve(
+        self,
+        pred_labels: NDArray[Any, np.int32],
+        gt_labels: NDArray[Any, np.int32],
+        overlap_thresholds: Sequence[np.float64],
+    ) -> Dict[str, NDArray[Any, np.float64]]:
+        """
+        :param pred_labels: labels of points obtained as a result of segmentation
+        :param gt_labels: reference labels of point cloud or their GroundTruth
+        :param overlap_thresholds: list of minimum values at which the planes are considered intersected
+        :return: multi_value_curve() values for the settings of the evaluator
+        """
+        return multi_value_curve(
+            pred_labels, gt_labels, overlap_thresholds, config=self.config
+        )
+
+    def match(
+        self,
+        pred_labels: NDArray[Any, np.int32],
+        gt_labels: NDArray[Any, np.int32],
+    ) -> Tuple[
+        NDArray[Any, np.int32], NDArray[Any, np.int32], NDArray[Any, np.float64]
+    ]:
+        """
+        :param pred_labels: labels of points obtained as a result of segmentation
+        :param gt_labels: reference labels of point cloud or their GroundTruth
+        :return: match() values for the settings of the evaluator
+        """
+        return match(pred_labels, gt_labels, config=self.config)
+
+    def segment_tables(
+        self,
+        pred_labels: NDArray[Any, np.int32],
+        gt_labels: NDArray[Any, np.int32],
+    ) -> Tuple[NDArray[Any, Any], NDArray[Any, Any]]:
+        """
+        :param pred_labels: labels of points obtained as a result of segmentation
+        :param gt_labels: reference labels of point cloud or their GroundTruth
+        :return: segment_tables() values for the settings of the evaluator
+        """
+        return segment_tables(pred_labels, gt_labels, config=self.config)
+
+    def plane_geometry(
+        self,
+        points: NDArray[Any, np.float64],
+        pred_labels: NDArray[Any, np.int32],
+        gt_labels: NDArray[Any, np.int32],
+    ) -> NDArray[Any, Any]:
+        """
+        :param points: coordinates of points, (n, 3) or organized (h, w, 3)
+        :param pred_labels: labels of points obtained as a result of segmentation
+        :param gt_labels: reference labels of point cloud or their GroundTruth
+        :return: plane_geometry() values for the settings of the evaluator
+        """
+        return plane_geometry(points, pred_labels, gt_labels, config=self.config)
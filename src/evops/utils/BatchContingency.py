@@ -0,0 +1,464 @@
+# Copyright (c) 2022, Skolkovo Institute of Science and Technology (Skoltech)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from __future__ import annotations
+
+from typing import Any, Dict, Optional, Sequence, Tuple, Union
+from nptyping import NDArray
+
+import numpy as np
+
+import evops.metrics.constants
+from evops.utils.LabelEncoding import (
+    count_labels,
+    encode_labels,
+    is_unsegmented,
+)
+from evops.utils.Matching import match_pairs
+
+# Frames are counted in blocks of about this many points to stay in cache
+BLOCK_POINTS = 1 << 18
+
+
+class BatchContingency:
+    """
+    Overlap counts of predicted and ground truth planes of many frames at once.
+    Planes are numbered across all frames and only pairs of planes sharing at
+    least one point are stored, so every metric is computed for all frames
+    with a few vectorized reductions.
+    """
+
+    def __init__(
+        self,
+        pred_labels: Union[NDArray[Any, np.int32], Sequence[NDArray[Any, np.int32]]],
+        gt_labels: Union[NDArray[Any, np.int32], Sequence[NDArray[Any, np.int32]]],
+        frame_offsets: Optional[NDArray[Any, np.int64]] = None,
+        unsegmented_label: Optional[Union[np.int32, Sequence[np.int32]]] = None,
+    ):
+        """
+        :param pred_labels: list of predicted label arrays of every frame or their concatenation
+        :param gt_labels: list of reference label arrays of every frame or their concatenation
+        :param frame_offsets: for concatenated labels, index of the first point of every frame
+            followed by the total amount of points
+        :param unsegmented_label: label or list of labels of points outside of planes,
+            UNSEGMENTED_LABEL by default
+        """
+        if unsegmented_label is None:
+            unsegmented_label = evops.metrics.constants.UNSEGMENTED_LABEL
+        if frame_offsets is None:
+            frame_offsets = np.zeros(len(pred_labels) + 1, np.int64)
+            np.cumsum([labels.size for labels in pred_labels], out=frame_offsets[1:])
+        else:
+            assert (
+                pred_labels.size == gt_labels.size
+            ), "Predicted and ground truth label arrays must have the same size"
+            frame_offsets = np.asarray(frame_offsets, np.int64)
+        self.frames_amount = frame_offsets.size - 1
+
+        block_frames = np.unique(
+            np.concatenate(
+                (
+                    np.searchsorted(
+                        frame_offsets,
+                        np.arange(0, frame_offsets[-1], BLOCK_POINTS),
+                        side="right",
+                    )
+                    - 1,
+                    [0, self.frames_amount],
+                )
+            )
+        )
+        blocks = [
+            self.__count_block(
+                *self.__block_labels(
+                    pred_labels, gt_labels, frame_offsets, first, last
+                ),
+                frame_offsets[first : last + 1] - frame_offsets[first],
+                first,
+            )
+            for first, last in zip(block_frames[:-1], block_frames[1:])
+        ]
+        (
+            pred_frames,
+            pred_segment_labels,
+            pred_sizes,
+            gt_frames,
+            gt_segment_labels,
+            gt_sizes,
+            pair_pred,
+            pair_gt,
+            pair_intersection,
+        ) = [
+            np.concatenate([block[field] for block in blocks])
+            if len(blocks) != 0
+            else np.zeros(0, np.int64)
+            for field in range(9)
+        ]
+        pred_block_offsets = np.cumsum([0] + [block[0].size for block in blocks])
+        gt_block_offsets = np.cumsum([0] + [block[3].size for block in blocks])
+        pair_blocks = np.repeat(
+            np.arange(len(blocks)), [block[6].size for block in blocks]
+        )
+        pair_pred = pair_pred + pred_block_offsets[pair_blocks]
+        pair_gt = pair_gt + gt_block_offsets[pair_blocks]
+
+        self.__set_planes(
+            (pred_frames, pred_segment_labels, pred_sizes),
+            (gt_frames, gt_segment_labels, gt_sizes),
+            (pair_pred, pair_gt, pair_intersection),
+            unsegmented_label,
+        )
+
+    @classmethod
+    def from_counts(
+        cls,
+        pair_frames: NDArray[Any, np.int64],
+        pair_pred_labels: NDArray[Any, np.int32],
+        pair_gt_labels: NDArray[Any, np.int32],
+        pair_intersection: NDArray[Any, np.int64],
+        frames_amount: Optional[int] = None,
+        unsegmented_label: Optional[Union[np.int32, Sequence[np.int32]]] = None,
+    ) -> "BatchContingency":
+        """
+        Builds overlap counts from already counted pairs of labels,
+        for example summed over separately counted chunks of frames
+        :param pair_frames: frame index of every pair of labels
+        :param pair_pred_labels: predicted label of every pair
+        :param pair_gt_labels: reference label of every pair
+        :param pair_intersection: amount of points with both labels, pairs may repeat
+        :param frames_amount: amount of frames, the last frame index plus one by default
+        :param unsegmented_label: label or list of labels of points outside of planes,
+            UNSEGMENTED_LABEL by default
+        :return: overlap counts of predicted and ground truth planes of all frames
+        """
+        if unsegmented_label is None:
+            unsegmented_label = evops.metrics.constants.UNSEGMENTED_LABEL
+        pair_frames = np.asarray(pair_frames, np.int64)
+        pair_intersection = np.asarray(pair_intersection, np.int64)
+        if frames_amount is None:
+            frames_amount = int(pair_frames.max()) + 1 if pair_frames.size != 0 else 0
+        counted = pair_intersection != 0
+        pair_frames = pair_frames[counted]
+        pair_intersection = pair_intersection[counted]
+
+        pred_unique, pred_codes = encode_labels(np.asarray(pair_pred_labels)[counted])
+        gt_unique, gt_codes = encode_labels(np.asarray(pair_gt_labels)[counted])
+        pred_labels_amount = max(pred_unique.size, 1)
+        gt_labels_amount = max(gt_unique.size, 1)
+        pred_keys, pair_pred = encode_labels(
+            pair_frames * pred_labels_amount + pred_codes
+        )
+        gt_keys, pair_gt = encode_labels(pair_frames * gt_labels_amount + gt_codes)
+        gt_planes_amount = max(gt_keys.size, 1)
+        pair_keys, pair_codes = encode_labels(pair_pred * gt_planes_amount + pair_gt)
+
+        contingency = cls.__new__(cls)
+        contingency.frames_amount = frames_amount
+        contingency.__set_planes(
+            (
+                pred_keys // pred_labels_amount,
+                pred_unique[pred_keys % pred_labels_amount],
+                np.bincount(
+                    pair_pred, weights=pair_intersection, minlength=pred_keys.size
+                ).astype(np.int64),
+            ),
+            (
+                gt_keys // gt_labels_amount,
+                gt_unique[gt_keys % gt_labels_amount],
+                np.bincount(
+                    pair_gt, weights=pair_intersection, minlength=gt_keys.size
+                ).astype(np.int64),
+            ),
+            (
+                pair_keys // gt_planes_amount,
+                pair_keys % gt_planes_amount,
+                np.bincount(
+                    pair_codes, weights=pair_intersection, minlength=pair_keys.size
+                ).astype(np.int64),
+            ),
+            unsegmented_label,
+        )
+
+        return contingency
+
+    def __set_planes(
+        self,
+        pred_planes: Tuple[NDArray, NDArray, NDArray],
+        gt_planes: Tuple[NDArray, NDArray, NDArray],
+        pairs: Tuple[NDArray, NDArray, NDArray],
+        unsegmented_label: Union[np.int32, Sequence[np.int32]],
+    ):
+        """
+        Stores planes and pairs of planes except the ones labeled as unsegmented
+        :param pred_planes: frame, label and size of every predicted plane
+        :param gt_planes: frame, label and size of every ground truth plane
+        :param pairs: plane indices and intersection size of every pair of planes
+        :param unsegmented_label: label or list of labels of points outside of planes
+        """
+        pred_frames, pred_segment_labels, pred_sizes = pred_planes
+        gt_frames, gt_segment_labels, gt_sizes = gt_planes
+        pair_pred, pair_gt, pair_intersection = pairs
+
+        pred_segmented = ~is_unsegmented(pred_segment_labels, unsegmented_label)
+        gt_segmented = ~is_unsegmented(gt_segment_labels, unsegmented_label)
+        pair_segmented = pred_segmented[pair_pred] & gt_segmented[pair_gt]
+
+        self.pred_frames = pred_frames[pred_segmented]
+        self.pred_labels = pred_segment_labels[pred_segmented]
+        self.pred_sizes = pred_sizes[pred_segmented]
+        self.gt_frames = gt_frames[gt_segmented]
+        self.gt_labels = gt_segment_labels[gt_segmented]
+        self.gt_sizes = gt_sizes[gt_segmented]
+
+        self.pair_pred = (np.cumsum(pred_segmented) - 1)[pair_pred[pair_segmented]]
+        self.pair_gt = (np.cumsum(gt_segmented) - 1)[pair_gt[pair_segmented]]
+        self.pair_intersection = pair_intersection[pair_segmented]
+
+        self.pred_amount = np.bincount(self.pred_frames, minlength=self.frames_amount)
+        self.gt_amount = np.bincount(self.gt_frames, minlength=self.frames_amount)
+        self.__pair_iou = None
+
+    @staticmethod
+    def __block_labels(
+        pred_labels: Union[NDArray[Any, np.int32], Sequence[NDArray[Any, np.int32]]],
+        gt_labels: Union[NDArray[Any, np.int32], Sequence[NDArray[Any, np.int32]]],
+        frame_offsets: NDArray[Any, np.int64],
+        first: int,
+        last: int,
+    ) -> Tuple[NDArray[Any, np.int32], NDArray[Any, np.int32]]:
+        """
+        :return: concatenated predicted and reference labels of frames from first to last
+        """
+        if isinstance(pred_labels, np.ndarray):
+            points = slice(frame_offsets[first], frame_offsets[last])
+            return pred_labels[points], gt_labels[points]
+        if last - first == 1:
+            return pred_labels[first], gt_labels[first]
+
+        return (
+            np.concatenate(pred_labels[first:last]),
+            np.concatenate(gt_labels[first:last]),
+        )
+
+    @staticmethod
+    def __count_block(
+        pred_labels: NDArray[Any, np.int32],
+        gt_labels: NDArray[Any, np.int32],
+        frame_offsets: NDArray[Any, np.int64],
+        first_frame: int,
+    ) -> Tuple[NDArray, ...]:
+        """
+        :param pred_labels: concatenated predicted labels of several consecutive frames
+        :param gt_labels: concatenated reference labels of the same frames
+        :param frame_offsets: frame boundaries inside of the block
+        :param first_frame: index of the first frame of the block
+        :return: frame, label and size of every predicted and ground truth plane followed by
+            the plane indices and intersection size of every pair of planes with common points
+        """
+        pred_unique, pred_codes = encode_labels(pred_labels)
+        gt_unique, gt_codes = encode_labels(gt_labels)
+        pred_labels_amount = max(pred_unique.size, 1)
+        gt_labels_amount = max(gt_unique.size, 1)
+        frame_pairs_amount = pred_labels_amount * gt_labels_amount
+
+        keys = np.repeat(
+            np.arange(frame_offsets.size - 1, dtype=np.int64) * frame_pairs_amount,
+            np.diff(frame_offsets),
+        )
+        pred_codes *= gt_labels_amount
+        keys += pred_codes
+        keys += gt_codes
+        pair_keys, pair_intersection = count_labels(
+            keys, (frame_offsets.size - 1) * frame_pairs_amount
+        )
+        pred_keys, pair_pred = encode_labels(pair_keys // gt_labels_amount)
+        gt_keys, pair_gt = encode_labels(
+            pair_keys // frame_pairs_amount * gt_labels_amount
+            + pair_keys % gt_labels_amount
+        )
+
+        return (
+            pred_keys // pred_labels_amount + first_frame,
+            pred_unique[pred_keys % pred_labels_amount],
+            np.bincount(pair_pred, weights=pair_intersection).astype(np.int64),
+            gt_keys // gt_labels_amount + first_frame,
+            gt_unique[gt_keys % gt_labels_amount],
+            np.bincount(pair_gt, weights=pair_intersection).astype(np.int64),
+            pair_pred,
+            pair_gt,
+            pair_intersection,
+        )
+
+    @staticmethod
+    def __ratio(
+        numerator: NDArray[Any, np.float64],
+        denominator: NDArray[Any, np.float64],
+    ) -> NDArray[Any, np.float64]:
+        return np.divide(
+            numerator,
+            denominator,
+            out=np.zeros(np.shape(numerator), np.float64),
+            where=denominator != 0,
+        )
+
+    def pair_frames(self) -> NDArray[Any, np.int64]:
+        """
+        :return: frame index of every stored pair of planes
+        """
+        return self.pred_frames[self.pair_pred]
+
+    def pair_iou(self) -> NDArray[Any, np.float64]:
+        """
+        :return: IoU of every stored pair of planes
+        """
+        if self.__pair_iou is None:
+            union = (
+                self.pred_sizes[self.pair_pred]
+                + self.gt_sizes[self.pair_gt]
+                - self.pair_intersection
+            )
+            self.__pair_iou = self.pair_intersection / union
+
+        return self.__pair_iou
+
+    def pair_dice(self) -> NDArray[Any, np.float64]:
+        """
+        :return: Dice of every stored pair of planes
+        """
+        total = self.pred_sizes[self.pair_pred] + self.gt_sizes[self.pair_gt]
+
+        return 2 * self.pair_intersection / total
+
+    def match(
+        self, iou_threshold: np.float64 = None, matching: str = "first_fit"
+    ) -> NDArray[Any, np.int64]:
+        """
+        :param iou_threshold: minimum IoU of matched planes, IOU_THRESHOLD by default
+        :param matching: strategy of one-to-one matching: {'first_fit', 'greedy', 'optimal'}
+        :return: sorted indices of stored pairs of planes matched within their frames
+        """
+        if iou_threshold is None:
+            iou_threshold = evops.metrics.constants.IOU_THRESHOLD
+
+        return match_pairs(
+            self.pair_pred, self.pair_gt, self.pair_iou(), iou_threshold, matching
+        )
+
+    def true_positive(
+        self, iou_threshold: np.float64 = None, matching: str = "first_fit"
+    ) -> NDArray[Any, np.int64]:
+        """
+        :param iou_threshold: minimum IoU of matched planes, IOU_THRESHOLD by default
+        :param matching: strategy of one-to-one matching: {'first_fit', 'greedy', 'optimal'}
+        :return: amount of matched planes in every frame
+        """
+        if iou_threshold is None:
+            iou_threshold = evops.metrics.constants.IOU_THRESHOLD
+
+        # Planes without common points are matched too
+        if iou_threshold <= 0:
+            return np.minimum(self.pred_amount, self.gt_amount)
+
+        return np.bincount(
+            self.pair_frames()[self.match(iou_threshold, matching)],
+            minlength=self.frames_amount,
+        ).astype(np.int64)
+
+    def mean(self, metric: str = "iou") -> NDArray[Any, np.float64]:
+        """
+        :param metric: name of the overlap metric: {'iou', 'dice'}
+        :return: mean over predicted planes of the best metric value in every frame
+        """
+        assert metric in ("iou", "dice"), "Incorrect name of overlap metric"
+        scores = self.pair_iou() if metric == "iou" else self.pair_dice()
+
+        best_scores = np.zeros(self.pred_labels.size, np.float64)
+        np.maximum.at(best_scores, self.pair_pred, scores)
+        score_sums = np.bincount(
+            self.pred_frames, weights=best_scores, minlength=self.frames_amount
+        )
+
+        return self.__ratio(score_sums, self.pred_amount)
+
+    def multi_value_counts(
+        self, overlap_threshold: np.float64 = 0.8
+    ) -> Dict[str, NDArray[Any, np.int64]]:
+        """
+        :param overlap_threshold: minimum value at which the planes are considered intersected
+        :return: amounts of correctly segmented, under_segmented, over_segmented, missed
+            and noise planes in every frame
+        """
+        if overlap_threshold <= 0:
+            # Planes without common points are well overlapped too
+            pred_correct = self.gt_amount[self.pred_frames] > 0
+            gt_found = self.pred_amount[self.gt_frames] > 0
+        else:
+            well_overlapped = (
+                self.pair_intersection / self.pred_sizes[self.pair_pred]
+                >= overlap_threshold
+            ) & (
+                self.pair_intersection / self.gt_sizes[self.pair_gt]
+                >= overlap_threshold
+            )
+            pred_correct = (
+                np.bincount(
+                    self.pair_pred[well_overlapped], minlength=self.pred_labels.size
+                )
+                > 0
+            )
+            gt_found = (
+                np.bincount(
+                    self.pair_gt[well_overlapped], minlength=self.gt_labels.size
+                )
+                > 0
+            )
+
+        pred_under = np.bincount(self.pair_pred, minlength=self.pred_labels.size) > 1
+        gt_over = np.bincount(self.pair_gt, minlength=self.gt_labels.size) > 1
+
+        correctly_segmented = np.bincount(
+            self.pred_frames[pred_correct], minlength=self.frames_amount
+        )
+
+        return {
+            "correctly_segmented": correctly_segmented,
+            "under_segmented": np.bincount(
+                self.pred_frames[pred_under], minlength=self.frames_amount
+            ),
+            "over_segmented": np.bincount(
+                self.gt_frames[gt_over], minlength=self.frames_amount
+            ),
+            "missed": self.gt_amount
+            - np.bincount(self.gt_frames[gt_found], minlength=self.frames_amount),
+            "noise": self.pred_amount - correctly_segmented,
+        }
+
+    def multi_value(
+        self, overlap_threshold: np.float64 = 0.8
+    ) -> Dict[str, NDArray[Any, np.float64]]:
+        """
+        :param overlap_threshold: minimum value at which the planes are considered intersected
+        :return: precision, recall, under_segmented, over_segmented, missed, noise of every frame
+        """
+        counts = self.multi_value_counts(overlap_threshold)
+
+        return {
+            "precision": self.__ratio(counts["correctly_segmented"], self.pred_amount),
+            "recall": self.__ratio(counts["correctly_segmented"], self.gt_amount),
+            "under_segmented": self.__ratio(
+                counts["under_segmented"], self.pred_amount
+            ),
+            "over_segmented": self.__ratio(counts["over_segmented"], self.gt_amount),
+            "missed": self.__ratio(counts["missed"], self.gt_amount),
+            "noise": self.__ratio(counts["noise"], self.pred_amount),
+        }
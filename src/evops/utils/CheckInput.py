@@ -11,18 +11,54 @@
 # WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
 # See the License for the specific language governing permissions and
 # limitations under the License.
-from typing import Any
+from __future__ import annotations
+
+from typing import Any, Dict, Optional, Sequence, Union
 from nptyping import NDArray
 
 import numpy as np
 
-from evops.utils.MetricsUtils import __statistics_functions
+from evops.utils.Matching import MATCHING_STRATEGIES
+from evops.utils.MetricsUtils import __metric_names, __statistics_functions
+from evops.utils.Profiler import profiled
+
+
+def __labels_asserts(labels: Any):
+    assert len(labels.shape) in (
+        1,
+        2,
+    ), "Incorrect label array size, expected (n) or organized (h, w)"
+
+
+def __organized_labels_asserts(
+    pred_labels: Any,
+    gt_labels: Any,
+):
+    assert len(pred_labels.shape) in (
+        1,
+        2,
+    ), "Incorrect predicted label array size, expected (n) or organized (h, w)"
+    assert len(gt_labels.shape) in (
+        1,
+        2,
+    ), "Incorrect ground truth label array size, expected (n) or organized (h, w)"
 
 
+@profiled("asserts")
 def __default_benchmark_asserts(
     pred_labels: NDArray[Any, np.int32],
     gt_labels: NDArray[Any, np.int32],
     tp_condition: str,
+):
+    __organized_labels_asserts(pred_labels, gt_labels)
+    assert pred_labels.size != 0, "Predicted labels array size must not be zero"
+    assert tp_condition in __statistics_functions, "Incorrect name of tp condition"
+
+
+@profiled("asserts")
+def __iou_dice_mean_bechmark_asserts(
+    pred_labels: NDArray[Any, np.int32],
+    gt_labels: NDArray[Any, np.int32],
 ):
     assert (
         len(pred_labels.shape) == 1
@@ -30,18 +66,185 @@ def __default_benchmark_asserts(
     assert (
         len(gt_labels.shape) == 1
     ), "Incorrect ground truth label array size, expected (n)"
-    assert pred_labels.size != 0, "Predicted labels array size must not be zero"
-    assert tp_condition in __statistics_functions, "Incorrect name of tp condition"
+    assert pred_labels.size + gt_labels.size != 0, "Array sizes must be positive"
 
 
-def __iou_dice_mean_bechmark_asserts(
+@profiled("asserts")
+def __mean_benchmark_asserts(
     pred_labels: NDArray[Any, np.int32],
     gt_labels: NDArray[Any, np.int32],
 ):
+    __organized_labels_asserts(pred_labels, gt_labels)
+    assert pred_labels.size + gt_labels.size != 0, "Array sizes must be positive"
+
+
+@profiled("asserts")
+def __batch_benchmark_asserts(
+    pred_labels: Union[NDArray[Any, np.int32], Sequence[NDArray[Any, np.int32]]],
+    gt_labels: Union[NDArray[Any, np.int32], Sequence[NDArray[Any, np.int32]]],
+    frame_offsets: Optional[NDArray[Any, np.int64]],
+    tp_condition: str,
+):
+    assert tp_condition in __statistics_functions, "Incorrect name of tp condition"
+    if frame_offsets is None:
+        assert len(pred_labels) == len(
+            gt_labels
+        ), "Predicted and ground truth frame amounts must be equal"
+        for pred_frame, gt_frame in zip(pred_labels, gt_labels):
+            assert (
+                len(pred_frame.shape) == 1
+            ), "Incorrect predicted label array size, expected (n)"
+            assert (
+                len(gt_frame.shape) == 1
+            ), "Incorrect ground truth label array size, expected (n)"
+            assert (
+                pred_frame.size == gt_frame.size
+            ), "Predicted and ground truth label arrays must have the same size"
+        return
+
     assert (
         len(pred_labels.shape) == 1
     ), "Incorrect predicted label array size, expected (n)"
     assert (
         len(gt_labels.shape) == 1
     ), "Incorrect ground truth label array size, expected (n)"
-    assert pred_labels.size + gt_labels.size != 0, "Array sizes must be positive"
+    assert (
+        pred_labels.size == gt_labels.size
+    ), "Predicted and ground truth label arrays must have the same size"
+    frame_offsets = np.asarray(frame_offsets)
+    assert (
+        frame_offsets.ndim == 1
+        and frame_offsets.size > 0
+        and frame_offsets[0] == 0
+        and frame_offsets[-1] == pred_labels.size
+        and np.all(np.diff(frame_offsets) >= 0)
+    ), "Incorrect frame offsets, expected non-decreasing array from 0 to label array size"
+
+
+def __dataset_benchmark_asserts(
+    tp_condition: str,
+    metrics: Optional[Sequence[str]],
+    workers: Optional[int],
+    executor: Any,
+    chunk_size: int,
+):
+    assert tp_condition in __statistics_functions, "Incorrect name of tp condition"
+    assert metrics is None or all(
+        metric in __metric_names for metric in metrics
+    ), "Incorrect metric name, expected one of {}".format(", ".join(__metric_names))
+    assert workers is None or workers >= 0, "Amount of workers must not be negative"
+    assert not isinstance(executor, str) or executor in (
+        "process",
+        "thread",
+    ), "Incorrect executor name, expected process or thread"
+    assert chunk_size > 0, "Chunk size must be positive"
+
+
+def __async_evaluator_asserts(
+    max_batch_size: int,
+    max_delay: float,
+    max_pending: int,
+    workers: Optional[int],
+    executor: Any,
+):
+    assert max_batch_size > 0, "Batch size must be positive"
+    assert max_delay >= 0, "Batching delay must not be negative"
+    assert max_pending > 0, "Amount of pending requests must be positive"
+    assert workers is None or workers > 0, "Amount of workers must be positive"
+    assert not isinstance(executor, str) or executor in (
+        "process",
+        "thread",
+    ), "Incorrect executor name, expected process or thread"
+
+
+def __statistics_asserts(
+    frames: Dict[str, Any],
+    confidence: float,
+    resamples: int,
+):
+    assert (
+        "predicted_amount" in frames and "gt_amount" in frames
+    ), "Incorrect frames, expected arrays of evaluate() values of every frame"
+    assert frames["predicted_amount"].size != 0, "Amount of frames must be positive"
+    assert 0 < confidence < 1, "Confidence must be between 0 and 1"
+    assert resamples > 0, "Amount of resamples must be positive"
+
+
+def __classes_asserts(
+    gt_labels: NDArray[Any, np.int32],
+    classes: Any,
+):
+    assert isinstance(classes, dict) or (
+        np.size(classes) == gt_labels.size
+    ), "Incorrect class array size, expected a class of every point or a dictionary of classes of labels"
+
+
+def __matching_asserts(matching: str):
+    assert (
+        matching in MATCHING_STRATEGIES
+    ), "Incorrect name of matching strategy, expected one of {}".format(
+        ", ".join(MATCHING_STRATEGIES)
+    )
+
+
+def __thresholds_asserts(thresholds: Sequence[np.float64]):
+    thresholds = np.asarray(thresholds)
+    assert (
+        thresholds.ndim == 1 and thresholds.size != 0
+    ), "Incorrect threshold array size, expected non-empty (n)"
+
+
+def __files_benchmark_asserts(
+    pred_sources: Sequence[Any],
+    gt_sources: Sequence[Any],
+    tp_condition: str,
+    label_field: str,
+    chunk_points: int,
+):
+    assert tp_condition in __statistics_functions, "Incorrect name of tp condition"
+    assert len(pred_sources) == len(
+        gt_sources
+    ), "Predicted and ground truth frame amounts must be equal"
+    assert label_field in (
+        "full",
+        "semantic",
+        "instance",
+    ), "Incorrect label field, expected full, semantic or instance"
+    assert chunk_points > 0, "Chunk size must be positive"
+
+
+def __geometry_asserts(
+    points: NDArray[Any, np.float64],
+    labels: Any,
+):
+    assert (
+        points.ndim in (2, 3) and points.shape[-1] == 3
+    ), "Incorrect point array size, expected (n, 3) or organized (h, w, 3)"
+    assert (
+        points.size == 3 * labels.size
+    ), "Point and label arrays must have the same amount of points"
+
+
+@profiled("asserts")
+def __overlap_matrix_asserts(
+    pred_labels: Any,
+    gt_labels: Any,
+):
+    if isinstance(pred_labels, np.ndarray):
+        assert (
+            len(pred_labels.shape) == 1
+        ), "Incorrect predicted label array size, expected (n)"
+        assert (
+            len(gt_labels.shape) == 1
+        ), "Incorrect ground truth label array size, expected (n)"
+        assert (
+            pred_labels.size == gt_labels.size
+        ), "Predicted and ground truth label arrays must have the same size"
+        return
+
+    assert not isinstance(
+        gt_labels, np.ndarray
+    ), "Ground truth labels must be a list of index arrays like predicted ones"
+    assert all(
+        np.ndim(indices) == 1 for indices in list(pred_labels) + list(gt_labels)
+    ), "Incorrect index array size, expected (n)"
@@ -0,0 +1,574 @@
+# Copyright (c) 2022, Skolkovo Institute of Science and Technology (Skoltech)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from __future__ import annotations
+
+from typing import Any, Dict, Optional, Sequence, Tuple, Union
+from nptyping import NDArray
+
+import numpy as np
+
+import evops.metrics.constants
+from evops.utils.BatchContingency import BatchContingency
+from evops.utils.GroundTruth import GroundTruth
+from evops.utils.LabelEncoding import encode_labels, is_unsegmented
+from evops.utils.Matching import match_pairs
+from evops.utils.Profiler import Profiler, profiled
+from evops.utils.RunLengthLabels import RunLengthLabels, is_organized, merge_runs
+
+# Plane pairs are stored sparsely when there are more of them than both
+# the amount of points and this value
+SPARSE_MIN_PAIRS = 1 << 16
+
+
+class ContingencyMatrix:
+    """
+    Overlap counts between every predicted and every ground truth plane,
+    computed in a single pass over the point labels. All label based metrics
+    can be read off this matrix without touching the points again.
+
+    Planes labeled with UNSEGMENTED_LABEL are not part of the matrix, but
+    their points still count towards the sizes of the planes they overlap.
+
+    When there are many more plane pairs than points, only pairs of planes
+    sharing at least one point are stored and the metrics are computed over
+    them, so the cost does not grow with the product of plane amounts.
+    """
+
+    @profiled("contingency")
+    def __init__(
+        self,
+        pred_labels: Union[NDArray[Any, np.int32], RunLengthLabels],
+        gt_labels: Union[NDArray[Any, np.int32], GroundTruth, RunLengthLabels],
+        unsegmented_label: Optional[Union[np.int32, Sequence[np.int32]]] = None,
+        sparse: Optional[bool] = None,
+    ):
+        """
+        :param pred_labels: labels of points obtained as a result of segmentation,
+            label images and their RunLengthLabels are counted over runs of labels
+        :param gt_labels: reference labels of point cloud or their GroundTruth
+        :param unsegmented_label: label or list of labels of points outside of planes,
+            UNSEGMENTED_LABEL by default
+        :param sparse: store only overlapping pairs of planes, chosen by the amount of pairs by default
+        """
+        if unsegmented_label is None:
+            unsegmented_label = evops.metrics.constants.UNSEGMENTED_LABEL
+        assert (
+            pred_labels.size == gt_labels.size
+        ), "Predicted and ground truth label arrays must have the same size"
+
+        # Runs of equal pairs of labels are counted with their lengths as weights
+        run_lengths = None
+        if is_organized(pred_labels) or is_organized(gt_labels):
+            assert tuple(pred_labels.shape) == tuple(
+                gt_labels.shape
+            ), "Incorrect organized label array shapes, expected the same (h, w)"
+            pred_labels, gt_labels, run_lengths = merge_runs(
+                *(
+                    labels
+                    if isinstance(labels, RunLengthLabels)
+                    else RunLengthLabels.from_labels(
+                        labels.labels_array()
+                        if isinstance(labels, GroundTruth)
+                        else labels
+                    )
+                    for labels in (pred_labels, gt_labels)
+                )
+            )
+
+        pred_unique, pred_codes = encode_labels(pred_labels)
+        if isinstance(gt_labels, GroundTruth):
+            gt_unique, gt_codes = gt_labels.labels, gt_labels.codes
+        else:
+            gt_unique, gt_codes = encode_labels(gt_labels)
+
+        pairs_amount = pred_unique.size * gt_unique.size
+        if sparse is None:
+            points_amount = (
+                pred_labels.size if run_lengths is None else run_lengths.sum()
+            )
+            sparse = pairs_amount > max(points_amount, SPARSE_MIN_PAIRS)
+        self.sparse = sparse
+        self.__iou = None
+        Profiler.annotate(
+            sparse=sparse, runs=None if run_lengths is None else run_lengths.size
+        )
+
+        if sparse:
+            if run_lengths is not None:
+                self.__pairs = BatchContingency.from_counts(
+                    np.zeros(run_lengths.size, np.int64),
+                    pred_labels,
+                    gt_labels,
+                    run_lengths,
+                    1,
+                    unsegmented_label,
+                )
+            else:
+                if isinstance(gt_labels, GroundTruth):
+                    gt_labels = gt_labels.labels_array()
+                self.__pairs = BatchContingency(
+                    pred_labels, gt_labels, [0, pred_labels.size], unsegmented_label
+                )
+            self.pred_labels = self.__pairs.pred_labels
+            self.gt_labels = self.__pairs.gt_labels
+            self.pred_sizes = self.__pairs.pred_sizes
+            self.gt_sizes = self.__pairs.gt_sizes
+            self.__intersection = None
+            Profiler.annotate(
+                pred_planes=self.pred_labels.size, gt_planes=self.gt_labels.size
+            )
+            return
+
+        counts = (
+            np.bincount(
+                pred_codes * gt_unique.size + gt_codes,
+                weights=run_lengths,
+                minlength=pairs_amount,
+            )
+            .astype(np.int64, copy=False)
+            .reshape(pred_unique.size, gt_unique.size)
+        )
+
+        pred_segmented = ~is_unsegmented(pred_unique, unsegmented_label)
+        gt_segmented = ~is_unsegmented(gt_unique, unsegmented_label)
+
+        self.pred_labels = pred_unique[pred_segmented]
+        self.gt_labels = gt_unique[gt_segmented]
+        self.pred_sizes = counts.sum(axis=1)[pred_segmented]
+        self.gt_sizes = counts.sum(axis=0)[gt_segmented]
+        self.__intersection = counts[np.ix_(pred_segmented, gt_segmented)]
+        self.__pairs = None
+        Profiler.annotate(
+            pred_planes=self.pred_labels.size, gt_planes=self.gt_labels.size
+        )
+
+    @property
+    def intersection(self) -> NDArray[(Any, Any), np.int64]:
+        """
+        :return: amount of common points of every predicted (rows) and ground truth (columns) plane
+        """
+        if self.__intersection is None:
+            self.__intersection = np.zeros(
+                (self.pred_labels.size, self.gt_labels.size), np.int64
+            )
+            self.__intersection[
+                self.__pairs.pair_pred, self.__pairs.pair_gt
+            ] = self.__pairs.pair_intersection
+
+        return self.__intersection
+
+    def pairs(
+        self,
+    ) -> Tuple[NDArray[Any, np.int64], NDArray[Any, np.int64], NDArray[Any, np.int64]]:
+        """
+        :return: predicted plane index, ground truth plane index and amount of common points
+            of every pair of planes sharing at least one point
+        """
+        if self.sparse:
+            return (
+                self.__pairs.pair_pred,
+                self.__pairs.pair_gt,
+                self.__pairs.pair_intersection,
+            )
+
+        pair_pred, pair_gt = np.nonzero(self.__intersection)
+
+        return pair_pred, pair_gt, self.__intersection[pair_pred, pair_gt]
+
+    def pair_iou(self) -> NDArray[Any, np.float64]:
+        """
+        :return: IoU of every pair of planes sharing at least one point, in the order of pairs()
+        """
+        pair_pred, pair_gt, pair_intersection = self.pairs()
+
+        return pair_intersection / (
+            self.pred_sizes[pair_pred] + self.gt_sizes[pair_gt] - pair_intersection
+        )
+
+    @property
+    def shape(self) -> Tuple[int, int]:
+        return self.intersection.shape
+
+    def iou(self) -> NDArray[(Any, Any), np.float64]:
+        """
+        :return: IoU of every predicted (rows) and ground truth (columns) plane
+        """
+        if self.__iou is None:
+            union = (
+                self.pred_sizes[:, np.newaxis]
+                + self.gt_sizes[np.newaxis, :]
+                - self.intersection
+            )
+            self.__iou = self.intersection / np.maximum(union, 1)
+
+        return self.__iou
+
+    def dice(self) -> NDArray[(Any, Any), np.float64]:
+        """
+        :return: Dice of every predicted (rows) and ground truth (columns) plane
+        """
+        total = self.pred_sizes[:, np.newaxis] + self.gt_sizes[np.newaxis, :]
+
+        return 2 * self.intersection / np.maximum(total, 1)
+
+    def match(
+        self, iou_threshold: np.float64 = None, matching: str = "first_fit"
+    ) -> Tuple[
+        NDArray[Any, np.int64], NDArray[Any, np.int64], NDArray[Any, np.float64]
+    ]:
+        """
+        :param iou_threshold: minimum IoU of matched planes, IOU_THRESHOLD by default
+        :param matching: strategy of one-to-one matching: {'first_fit', 'greedy', 'optimal'}
+        :return: predicted plane index, ground truth plane index and IoU of every
+            matched pair of planes sharing at least one point
+        """
+        if iou_threshold is None:
+            iou_threshold = evops.metrics.constants.IOU_THRESHOLD
+        pair_pred, pair_gt, _ = self.pairs()
+        pair_iou = self.pair_iou()
+        matched = match_pairs(pair_pred, pair_gt, pair_iou, iou_threshold, matching)
+
+        return pair_pred[matched], pair_gt[matched], pair_iou[matched]
+
+    def true_positive(
+        self, iou_threshold: np.float64 = None, matching: str = "first_fit"
+    ) -> np.int64:
+        """
+        :param iou_threshold: minimum IoU of matched planes, IOU_THRESHOLD by default
+        :param matching: strategy of one-to-one matching: {'first_fit', 'greedy', 'optimal'}
+        :return: amount of matched planes
+        """
+        if iou_threshold is None:
+            iou_threshold = evops.metrics.constants.IOU_THRESHOLD
+
+        # Planes without common points are matched too
+        if iou_threshold <= 0:
+            return np.int64(min(self.pred_labels.size, self.gt_labels.size))
+
+        return np.int64(self.match(iou_threshold, matching)[0].size)
+
+    def true_positive_curve(
+        self,
+        iou_thresholds: NDArray[Any, np.float64],
+        matching: str = "first_fit",
+    ) -> NDArray[Any, np.int64]:
+        """
+        :param iou_thresholds: list of minimum IoU values of matched planes
+        :param matching: strategy of one-to-one matching: {'first_fit', 'greedy', 'optimal'}
+        :return: amount of matched planes for every threshold
+        """
+        iou_thresholds = np.asarray(iou_thresholds, np.float64)
+        pair_pred, pair_gt, _ = self.pairs()
+        pair_iou = self.pair_iou()
+
+        # With IoU above one half every plane has at most one candidate,
+        # so matches are counted directly from the sorted IoU values
+        sorted_iou = np.sort(pair_iou)
+        true_positive = sorted_iou.size - np.searchsorted(sorted_iou, iou_thresholds)
+        true_positive[iou_thresholds <= 0] = min(
+            self.pred_labels.size, self.gt_labels.size
+        )
+        for index in np.flatnonzero((iou_thresholds > 0) & (iou_thresholds <= 0.5)):
+            true_positive[index] = match_pairs(
+                pair_pred, pair_gt, pair_iou, iou_thresholds[index], matching
+            ).size
+
+        return true_positive.astype(np.int64)
+
+    def precision(
+        self, iou_threshold: np.float64 = None, matching: str = "first_fit"
+    ) -> np.float64:
+        """
+        :param iou_threshold: minimum IoU of matched planes, IOU_THRESHOLD by default
+        :param matching: strategy of one-to-one matching: {'first_fit', 'greedy', 'optimal'}
+        :return: share of predicted planes matched with ground truth planes
+        """
+        if self.pred_labels.size == 0:
+            return np.float64(0)
+
+        return self.true_positive(iou_threshold, matching) / self.pred_labels.size
+
+    def recall(
+        self, iou_threshold: np.float64 = None, matching: str = "first_fit"
+    ) -> np.float64:
+        """
+        :param iou_threshold: minimum IoU of matched planes, IOU_THRESHOLD by default
+        :param matching: strategy of one-to-one matching: {'first_fit', 'greedy', 'optimal'}
+        :return: share of ground truth planes matched with predicted planes
+        """
+        if self.gt_labels.size == 0:
+            return np.float64(0)
+
+        return self.true_positive(iou_threshold, matching) / self.gt_labels.size
+
+    def f_score(
+        self, iou_threshold: np.float64 = None, matching: str = "first_fit"
+    ) -> np.float64:
+        """
+        :param iou_threshold: minimum IoU of matched planes, IOU_THRESHOLD by default
+        :param matching: strategy of one-to-one matching: {'first_fit', 'greedy', 'optimal'}
+        :return: harmonic mean of precision and recall
+        """
+        true_positive = self.true_positive(iou_threshold, matching)
+        total = self.pred_labels.size + self.gt_labels.size
+        if total == 0:
+            return np.float64(0)
+
+        return np.float64(2 * true_positive / total)
+
+    def mean(self, metric: str = "iou") -> np.float64:
+        """
+        :param metric: name of the overlap metric: {'iou', 'dice'}
+        :return: mean over predicted planes of the best metric value among ground truth planes
+        """
+        assert metric in ("iou", "dice"), "Incorrect name of overlap metric"
+        if self.pred_labels.size == 0:
+            return np.float64(0)
+        if self.gt_labels.size == 0:
+            return np.float64(0)
+
+        if self.sparse:
+            return self.__pairs.mean(metric)[0]
+
+        scores = self.iou() if metric == "iou" else self.dice()
+
+        return scores.max(axis=1).mean()
+
+    @profiled("multi_value_counts")
+    def multi_value_counts(
+        self, overlap_threshold: np.float64 = 0.8
+    ) -> Dict[str, np.int64]:
+        """
+        :param overlap_threshold: minimum value at which the planes are considered intersected
+        :return: amounts of correctly segmented, under_segmented, over_segmented, missed
+            and noise planes
+        """
+        if self.sparse:
+            return {
+                name: counts[0]
+                for name, counts in self.__pairs.multi_value_counts(
+                    overlap_threshold
+                ).items()
+            }
+
+        well_overlapped = (
+            self.intersection / np.maximum(self.pred_sizes, 1)[:, np.newaxis]
+            >= overlap_threshold
+        ) & (
+            self.intersection / np.maximum(self.gt_sizes, 1)[np.newaxis, :]
+            >= overlap_threshold
+        )
+        part_overlapped = self.intersection > 0
+        correctly_segmented_amount = np.count_nonzero(well_overlapped.any(axis=1))
+
+        return {
+            "correctly_segmented": correctly_segmented_amount,
+            "under_segmented": np.count_nonzero(part_overlapped.sum(axis=1) > 1),
+            "over_segmented": np.count_nonzero(part_overlapped.sum(axis=0) > 1),
+            "missed": self.gt_labels.size
+            - np.count_nonzero(well_overlapped.any(axis=0)),
+            "noise": self.pred_labels.size - correctly_segmented_amount,
+        }
+
+    def multi_value_counts_curve(
+        self, overlap_thresholds: NDArray[Any, np.float64]
+    ) -> Dict[str, NDArray[Any, np.int64]]:
+        """
+        :param overlap_thresholds: list of minimum values at which the planes are considered intersected
+        :return: amounts of correctly segmented, under_segmented, over_segmented, missed
+            and noise planes for every threshold
+        """
+        overlap_thresholds = np.asarray(overlap_thresholds, np.float64)
+        pair_pred, pair_gt, pair_intersection = self.pairs()
+        # Pair is well overlapped at all thresholds up to the smaller of its shares
+        pair_overlap = np.minimum(
+            pair_intersection / self.pred_sizes[pair_pred],
+            pair_intersection / self.gt_sizes[pair_gt],
+        )
+
+        # Planes without common points overlap by zero, which is enough
+        # for non-positive thresholds if there are planes on the other side
+        pred_overlap = np.full(
+            self.pred_labels.size,
+            0 if self.gt_labels.size != 0 else -np.inf,
+            np.float64,
+        )
+        np.maximum.at(pred_overlap, pair_pred, pair_overlap)
+        gt_overlap = np.full(
+            self.gt_labels.size,
+            0 if self.pred_labels.size != 0 else -np.inf,
+            np.float64,
+        )
+        np.maximum.at(gt_overlap, pair_gt, pair_overlap)
+
+        correctly_segmented = pred_overlap.size - np.searchsorted(
+            np.sort(pred_overlap), overlap_thresholds
+        )
+        gt_found = gt_overlap.size - np.searchsorted(
+            np.sort(gt_overlap), overlap_thresholds
+        )
+        thresholds_shape = overlap_thresholds.shape
+
+        return {
+            "correctly_segmented": correctly_segmented,
+            "under_segmented": np.full(
+                thresholds_shape,
+                np.count_nonzero(
+                    np.bincount(pair_pred, minlength=self.pred_labels.size) > 1
+                ),
+            ),
+            "over_segmented": np.full(
+                thresholds_shape,
+                np.count_nonzero(
+                    np.bincount(pair_gt, minlength=self.gt_labels.size) > 1
+                ),
+            ),
+            "missed": self.gt_labels.size - gt_found,
+            "noise": self.pred_labels.size - correctly_segmented,
+        }
+
+    def multi_value(self, overlap_threshold: np.float64 = 0.8) -> Dict[str, np.float64]:
+        """
+        :param overlap_threshold: minimum value at which the planes are considered intersected
+        :return: precision, recall, under_segmented, over_segmented, missed, noise
+        """
+        predicted_amount = self.pred_labels.size
+        gt_amount = self.gt_labels.size
+        counts = self.multi_value_counts(overlap_threshold)
+
+        return {
+            "precision": counts["correctly_segmented"] / predicted_amount
+            if predicted_amount != 0
+            else 0,
+            "recall": counts["correctly_segmented"] / gt_amount
+            if gt_amount != 0
+            else 0,
+            "under_segmented": counts["under_segmented"] / predicted_amount
+            if predicted_amount != 0
+            else 0,
+            "over_segmented": counts["over_segmented"] / gt_amount
+            if gt_amount != 0
+            else 0,
+            "missed": counts["missed"] / gt_amount if gt_amount != 0 else 0,
+            "noise": counts["noise"] / predicted_amount if predicted_amount != 0 else 0,
+        }
+
+    def segment_tables(
+        self,
+        iou_threshold: np.float64 = None,
+        overlap_threshold: np.float64 = 0.8,
+        matching: str = "first_fit",
+    ) -> Tuple[NDArray[Any, Any], NDArray[Any, Any]]:
+        """
+        :param iou_threshold: minimum IoU of matched planes, IOU_THRESHOLD by default
+        :param overlap_threshold: minimum value at which the planes are considered intersected
+        :param matching: strategy of one-to-one matching: {'first_fit', 'greedy', 'optimal'}
+        :return: structured arrays with a row for every predicted and every ground truth
+            plane: label, size, amount of overlapped planes of the other side, label, IoU
+            and Dice of the best overlapping plane, label and IoU of the matched plane
+            and multi_value status flags. Best labels are set where best_iou is positive,
+            matched labels where matched is true
+        """
+        pair_pred, pair_gt, pair_intersection = self.pairs()
+        pair_iou = self.pair_iou()
+        pair_overlap = np.minimum(
+            pair_intersection / self.pred_sizes[pair_pred],
+            pair_intersection / self.gt_sizes[pair_gt],
+        )
+        matched_pred, matched_gt, matched_iou = self.match(iou_threshold, matching)
+
+        pred_table = self.__segment_table(
+            (self.pred_labels, self.pred_sizes, pair_pred, matched_pred),
+            (self.gt_labels, pair_gt, matched_gt),
+            (pair_iou, pair_overlap, matched_iou),
+            overlap_threshold,
+            ("under_segmented", "noise"),
+        )
+        gt_table = self.__segment_table(
+            (self.gt_labels, self.gt_sizes, pair_gt, matched_gt),
+            (self.pred_labels, pair_pred, matched_pred),
+            (pair_iou, pair_overlap, matched_iou),
+            overlap_threshold,
+            ("over_segmented", "missed"),
+        )
+
+        return pred_table, gt_table
+
+    @staticmethod
+    def __segment_table(
+        planes: Tuple[Any, ...],
+        other_planes: Tuple[Any, ...],
+        pair_values: Tuple[Any, ...],
+        overlap_threshold: np.float64,
+        status_names: Tuple[str, str],
+    ) -> NDArray[Any, Any]:
+        """
+        :param planes: labels and sizes of planes of the table, their indices in pairs
+            and in matched pairs
+        :param other_planes: labels of planes of the other side, their indices in pairs
+            and in matched pairs
+        :param pair_values: IoU and overlap of pairs, IoU of matched pairs
+        :param overlap_threshold: minimum value at which the planes are considered intersected
+        :param status_names: names of flags of planes overlapping several planes
+            and of planes not segmented correctly
+        :return: table with a row for every plane
+        """
+        labels, sizes, pair_plane, matched_plane = planes
+        other_labels, pair_other, matched_other = other_planes
+        pair_iou, pair_overlap, matched_iou = pair_values
+        split_name, failed_name = status_names
+        table = np.zeros(
+            labels.size,
+            [
+                ("label", labels.dtype),
+                ("size", np.int64),
+                ("overlaps", np.int64),
+                ("best_label", other_labels.dtype),
+                ("best_iou", np.float64),
+                ("best_dice", np.float64),
+                ("matched", bool),
+                ("matched_label", other_labels.dtype),
+                ("matched_iou", np.float64),
+                ("correctly_segmented", bool),
+                (split_name, bool),
+                (failed_name, bool),
+            ],
+        )
+        table["label"] = labels
+        table["size"] = sizes
+        table["overlaps"] = np.bincount(pair_plane, minlength=labels.size)
+
+        # Pairs sorted by plane and decreasing IoU start with the best pair of every plane
+        order = np.lexsort((-pair_iou, pair_plane))
+        best = order[np.diff(pair_plane[order], prepend=-1) != 0]
+        table["best_label"][pair_plane[best]] = other_labels[pair_other[best]]
+        table["best_iou"][pair_plane[best]] = pair_iou[best]
+        # Dice grows with IoU, so the best planes by both metrics are the same
+        table["best_dice"] = 2 * table["best_iou"] / (1 + table["best_iou"])
+
+        table["matched"][matched_plane] = True
+        table["matched_label"][matched_plane] = other_labels[matched_other]
+        table["matched_iou"][matched_plane] = matched_iou
+
+        # Planes without common points overlap by zero, which is enough
+        # for non-positive thresholds if there are planes on the other side
+        overlap = np.full(
+            labels.size, 0 if other_labels.size != 0 else -np.inf, np.float64
+        )
+        np.maximum.at(overlap, pair_plane, pair_overlap)
+        table["correctly_segmented"] = overlap >= overlap_threshold
+        table[split_name] = table["overlaps"] > 1
+        table[failed_name] = ~table["correctly_segmented"]
+
+        return table
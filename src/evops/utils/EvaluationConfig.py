@@ -0,0 +1,67 @@
+# Copyright (c) 2022, Skolkovo Institute of Science and Technology (Skoltech)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from dataclasses import dataclass, replace
+from typing import Any, Tuple
+
+import numpy as np
+
+
+@dataclass(frozen=True)
+class EvaluationConfig:
+    """
+    Settings of an evaluation passed explicitly instead of being read from
+    evops.metrics.constants, so evaluations with different settings can run
+    concurrently in one process. Instances are immutable and can be shared
+    between threads and sent to worker processes.
+
+    :param unsegmented_labels: labels of points outside of planes
+    :param iou_threshold: minimum IoU of matched planes
+    :param overlap_threshold: minimum value at which the planes are considered intersected
+    :param matching: strategy of one-to-one matching: {'first_fit', 'greedy', 'optimal'}
+    """
+
+    unsegmented_labels: Tuple[Any, ...] = (0,)
+    iou_threshold: np.float64 = 0.75
+    overlap_threshold: np.float64 = 0.8
+    matching: str = "first_fit"
+
+    def __post_init__(self):
+        labels = self.unsegmented_labels
+        if np.ndim(labels) == 0:
+            labels = (labels,)
+        object.__setattr__(self, "unsegmented_labels", tuple(labels))
+
+    @classmethod
+    def from_constants(cls, **changes: Any) -> "EvaluationConfig":
+        """
+        :param changes: values of settings that differ from the current constants
+        :return: settings with the current UNSEGMENTED_LABEL and IOU_THRESHOLD
+        """
+        # Imported here, evops.metrics imports this module while being initialized
+        import evops.metrics.constants
+
+        return cls(
+            **{
+                "unsegmented_labels": evops.metrics.constants.UNSEGMENTED_LABEL,
+                "iou_threshold": evops.metrics.constants.IOU_THRESHOLD,
+                **changes,
+            }
+        )
+
+    def replace(self, **changes: Any) -> "EvaluationConfig":
+        """
+        :param changes: new values of settings
+        :return: copy of the settings with the changed values
+        """
+        return replace(self, **changes)
@@ -0,0 +1,130 @@
+# Copyright (c) 2022, Skolkovo Institute of Science and Technology (Skoltech)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from __future__ import annotations
+
+from collections import OrderedDict
+from functools import partial
+from typing import Any, Dict
+from nptyping import NDArray
+
+import threading
+import weakref
+
+import numpy as np
+
+from evops.utils.LabelEncoding import encode_labels, labels_digest
+from evops.utils.LabelGroups import LabelGroups
+
+# Amount of ground truth arrays whose encodings are kept by GroundTruth.of()
+GROUND_TRUTH_CACHE_SIZE = 32
+
+
+class GroundTruth:
+    """
+    Encoding of reference labels computed once and reused by every evaluation
+    against them, e.g. when many algorithms or hyperparameter configurations
+    are compared with the same ground truth. Accepted by single frame metrics
+    in place of gt_labels, so they skip all work on the ground truth side.
+    """
+
+    __cache = OrderedDict()
+    __cache_lock = threading.RLock()
+
+    def __init__(self, gt_labels: NDArray[Any, np.int32]):
+        """
+        :param gt_labels: reference labels of point cloud
+        """
+        gt_labels = np.asarray(gt_labels)
+        self.shape = gt_labels.shape
+        self.dtype = gt_labels.dtype
+        self.labels, self.codes = encode_labels(gt_labels.reshape(-1))
+        self.sizes = np.bincount(self.codes, minlength=self.labels.size)
+        self.__groups = None
+        self.__digest = None
+
+    @property
+    def size(self) -> int:
+        return self.codes.size
+
+    def labels_array(self) -> NDArray[Any, np.int32]:
+        """
+        :return: reference labels of point cloud
+        """
+        return self.labels[self.codes]
+
+    def labels_digest(self) -> bytes:
+        """
+        :return: hash of the reference labels, computed once and kept
+        """
+        if self.__digest is None:
+            self.__digest = labels_digest(self.labels_array())
+
+        return self.__digest
+
+    def indices_by_labels(self) -> Dict[np.int32, NDArray[Any, np.int64]]:
+        """
+        :return: dictionary with labels and an array of indices belonging to this label
+        """
+        return self.groups().as_dict()
+
+    def groups(self) -> LabelGroups:
+        """
+        :return: indices of points of every label, sorted once and kept
+        """
+        if self.__groups is None:
+            self.__groups = LabelGroups(self.labels, self.codes, self.sizes)
+
+        return self.__groups
+
+    @classmethod
+    def of(cls, gt_labels: NDArray[Any, np.int32]) -> "GroundTruth":
+        """
+        :param gt_labels: reference labels of point cloud or their GroundTruth
+        :return: encoding of the labels, shared by all calls with the same array
+            while it is alive, so the array must not be changed in place
+        """
+        if isinstance(gt_labels, GroundTruth):
+            return gt_labels
+        if not isinstance(gt_labels, np.ndarray):
+            return cls(gt_labels)
+
+        key = id(gt_labels)
+        with cls.__cache_lock:
+            cached = cls.__cache.get(key)
+            if cached is not None and cached[0]() is gt_labels:
+                cls.__cache.move_to_end(key)
+                return cached[1]
+
+        ground_truth = cls(gt_labels)
+        reference = weakref.ref(gt_labels, partial(cls.__forget, key))
+        with cls.__cache_lock:
+            cls.__cache[key] = reference, ground_truth
+            while len(cls.__cache) > GROUND_TRUTH_CACHE_SIZE:
+                cls.__cache.popitem(last=False)
+
+        return ground_truth
+
+    @classmethod
+    def clear_cache(cls):
+        with cls.__cache_lock:
+            cls.__cache.clear()
+
+    @classmethod
+    def __forget(cls, key: int, reference: weakref.ref):
+        # Identifiers of collected arrays are reused, so only the entry
+        # of the collected array itself is removed
+        with cls.__cache_lock:
+            cached = cls.__cache.get(key)
+            if cached is not None and cached[0] is reference:
+                del cls.__cache[key]
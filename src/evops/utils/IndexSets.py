@@ -0,0 +1,131 @@
+# Copyright (c) 2022, Skolkovo Institute of Science and Technology (Skoltech)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from __future__ import annotations
+
+from typing import Any, Sequence, Tuple
+from nptyping import NDArray
+
+import numpy as np
+
+
+def __is_sorted_unique(indices: NDArray[Any, np.int64]) -> bool:
+    """
+    :param indices: indices of points
+    :return: true if indices are strictly increasing, checked without sorting
+    """
+    return indices.size < 2 or bool(np.all(indices[1:] > indices[:-1]))
+
+
+def __sorted_intersection_size(
+    first_indices: NDArray[Any, np.int64],
+    second_indices: NDArray[Any, np.int64],
+) -> int:
+    """
+    :param first_indices: strictly increasing indices of points
+    :param second_indices: strictly increasing indices of points
+    :return: amount of common indices, found by binary search in the larger array
+    """
+    if first_indices.size > second_indices.size:
+        first_indices, second_indices = second_indices, first_indices
+    if first_indices.size == 0:
+        return 0
+
+    positions = np.searchsorted(second_indices, first_indices)
+    positions[positions == second_indices.size] = 0
+
+    return np.count_nonzero(second_indices[positions] == first_indices)
+
+
+def __flatten_index_sets(
+    index_sets: Sequence[NDArray[Any, np.int64]],
+) -> Tuple[NDArray[Any, np.int64], NDArray[Any, np.int64]]:
+    """
+    :param index_sets: list of arrays of point indices of every plane
+    :return: unique indices of every plane concatenated and the plane of every index,
+        sets that are already sorted and unique are not sorted again
+    """
+    sets = [np.asarray(indices).reshape(-1) for indices in index_sets]
+    sets = [
+        indices if __is_sorted_unique(indices) else np.unique(indices)
+        for indices in sets
+    ]
+    if len(sets) == 0:
+        return np.zeros(0, np.int64), np.zeros(0, np.int64)
+
+    owners = np.repeat(np.arange(len(sets)), [indices.size for indices in sets])
+
+    return np.concatenate(sets).astype(np.int64, copy=False), owners
+
+
+def __index_sets_intersection(
+    pred_sets: Sequence[NDArray[Any, np.int64]],
+    gt_sets: Sequence[NDArray[Any, np.int64]],
+) -> Tuple[
+    NDArray[(Any, Any), np.int64], NDArray[Any, np.int64], NDArray[Any, np.int64]
+]:
+    """
+    :param pred_sets: list of arrays of point indices of every predicted plane
+    :param gt_sets: list of arrays of point indices of every ground truth plane,
+        planes of one side may share points
+    :return: amount of common points of every predicted (rows) and ground truth (columns)
+        plane, sizes of predicted and ground truth planes
+    """
+    pred_indices, pred_owners = __flatten_index_sets(pred_sets)
+    gt_indices, gt_owners = __flatten_index_sets(gt_sets)
+    pred_amount, gt_amount = len(pred_sets), len(gt_sets)
+
+    # Predicted indices are sorted once, each ground truth index is paired
+    # with the run of predicted planes containing the same point
+    if np.all(pred_indices[1:] >= pred_indices[:-1]):
+        order = np.arange(pred_indices.size)
+    else:
+        order = np.argsort(pred_indices, kind="stable")
+    sorted_indices = pred_indices[order]
+    starts = np.searchsorted(sorted_indices, gt_indices, "left")
+    repeats = np.searchsorted(sorted_indices, gt_indices, "right") - starts
+    run_offsets = np.arange(repeats.sum()) - np.repeat(
+        np.cumsum(repeats) - repeats, repeats
+    )
+    pair_pred = pred_owners[order[np.repeat(starts, repeats) + run_offsets]]
+    pair_gt = np.repeat(gt_owners, repeats)
+
+    intersection = np.bincount(
+        pair_pred * gt_amount + pair_gt, minlength=pred_amount * gt_amount
+    ).reshape(pred_amount, gt_amount)
+
+    return (
+        intersection,
+        np.bincount(pred_owners, minlength=pred_amount),
+        np.bincount(gt_owners, minlength=gt_amount),
+    )
+
+
+def __overlap_scores(
+    intersection: NDArray[(Any, Any), np.int64],
+    pred_sizes: NDArray[Any, np.int64],
+    gt_sizes: NDArray[Any, np.int64],
+    metric: str,
+) -> NDArray[(Any, Any), np.float64]:
+    """
+    :param intersection: amount of common points of every pair of planes
+    :param pred_sizes: sizes of predicted planes
+    :param gt_sizes: sizes of ground truth planes
+    :param metric: name of the overlap metric: {'iou', 'dice'}
+    :return: metric value of every predicted (rows) and ground truth (columns) plane
+    """
+    total = pred_sizes[:, np.newaxis] + gt_sizes[np.newaxis, :]
+    if metric == "iou":
+        return intersection / np.maximum(total - intersection, 1)
+
+    return 2 * intersection / np.maximum(total, 1)
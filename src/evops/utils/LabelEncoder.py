@@ -0,0 +1,172 @@
+# Copyright (c) 2022, Skolkovo Institute of Science and Technology (Skoltech)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from __future__ import annotations
+
+from typing import Any
+from nptyping import NDArray
+
+import numpy as np
+
+from evops.utils.LabelEncoding import (
+    DENSE_RANGE_FACTOR,
+    encode_labels,
+    is_unsegmented,
+    pack_rgb,
+)
+
+
+class LabelEncoder:
+    """
+    Maps arbitrary labels, e.g. negative labels, 64-bit instance hashes or colors
+    of points, to dense codes and back. Unsegmented labels are mapped to code 0 and
+    the other labels to codes 1..K in sorted order, so encoded labels are evaluated
+    with UNSEGMENTED_LABEL = 0 and are counted without sorting.
+
+    :param unsegmented_labels: label or list of labels of points outside of planes,
+        colors are passed packed with pack_rgb()
+    """
+
+    def __init__(self, unsegmented_labels: Any = 0):
+        self.unsegmented_labels = np.atleast_1d(np.asarray(unsegmented_labels))
+        self.labels = None
+        self.__lookup = None
+
+    @property
+    def codes_amount(self) -> int:
+        """
+        :return: amount of codes including the code of unsegmented points
+        """
+        self.__fitted_asserts()
+        return self.labels.size + 1
+
+    def fit(self, *labels_arrays: NDArray[Any, np.int64]) -> "LabelEncoder":
+        """
+        :param labels_arrays: label arrays, e.g. of all frames, or (N, 3) color arrays
+        :return: the encoder with codes of all labels of the arrays
+        """
+        assert len(labels_arrays) != 0, "No label arrays to fit"
+        labels = np.unique(
+            np.concatenate(
+                [
+                    encode_labels(self.__as_labels(labels_array))[0]
+                    for labels_array in labels_arrays
+                ]
+            )
+        )
+        self.__set_labels(labels[~is_unsegmented(labels, self.unsegmented_labels)])
+
+        return self
+
+    def fit_transform(
+        self, labels_array: NDArray[Any, np.int64]
+    ) -> NDArray[Any, np.int64]:
+        """
+        :param labels_array: list of point cloud labels or (N, 3) array of colors
+        :return: code of every point label, computed in the same pass as fitting
+        """
+        unique_labels, codes = encode_labels(self.__as_labels(labels_array))
+        planes = ~is_unsegmented(unique_labels, self.unsegmented_labels)
+        self.__set_labels(unique_labels[planes])
+
+        code_map = np.zeros(unique_labels.size, np.int64)
+        code_map[planes] = np.arange(1, self.labels.size + 1)
+
+        return code_map[codes]
+
+    def transform(self, labels_array: NDArray[Any, np.int64]) -> NDArray[Any, np.int64]:
+        """
+        :param labels_array: list of point cloud labels or (N, 3) array of colors
+        :return: code of every point label
+        """
+        self.__fitted_asserts()
+        labels_array = self.__as_labels(labels_array).reshape(-1)
+        codes = np.full(labels_array.size, -1, np.int64)
+
+        if self.__lookup is not None:
+            min_label, table = self.__lookup
+            inside = np.flatnonzero(
+                (labels_array >= min_label)
+                & (labels_array <= min_label + table.size - 1)
+            )
+            codes[inside] = table[labels_array[inside].astype(np.int64) - min_label]
+        elif self.labels.size != 0:
+            positions = np.searchsorted(self.labels, labels_array)
+            positions[positions == self.labels.size] = 0
+            found = self.labels[positions] == labels_array
+            codes[found] = positions[found] + 1
+
+        # Unsegmented labels outside of the lookup table are rare, so they
+        # are looked for among the points left only
+        left = np.flatnonzero(codes < 0)
+        if left.size != 0:
+            unsegmented = is_unsegmented(labels_array[left], self.unsegmented_labels)
+            assert unsegmented.all(), "Labels not seen by fit() can't be encoded"
+            codes[left] = 0
+
+        return codes
+
+    def inverse_transform(
+        self, codes: NDArray[Any, np.int64]
+    ) -> NDArray[Any, np.int64]:
+        """
+        :param codes: codes of labels, e.g. labels of matched planes in encoded labels
+        :return: original labels, code 0 is mapped to the first unsegmented label
+        """
+        self.__fitted_asserts()
+        codes = np.asarray(codes)
+        # Unsegmented labels not representable by the type of labels are skipped
+        unsegmented = self.unsegmented_labels.astype(self.labels.dtype)
+        unsegmented = unsegmented[is_unsegmented(unsegmented, self.unsegmented_labels)]
+        assert unsegmented.size != 0 or not np.any(
+            codes == 0
+        ), "Code of unsegmented points can't be decoded without unsegmented labels"
+        table = np.concatenate([unsegmented[:1], self.labels])
+
+        return table[codes]
+
+    def __fitted_asserts(self):
+        assert self.labels is not None, "LabelEncoder is not fitted, call fit() first"
+
+    @staticmethod
+    def __as_labels(labels_array: Any) -> NDArray[Any, np.int64]:
+        labels_array = np.asarray(labels_array)
+        if labels_array.ndim == 2:
+            return pack_rgb(labels_array)
+
+        return labels_array
+
+    def __set_labels(self, labels: NDArray[Any, np.int64]):
+        self.labels = labels
+        self.__lookup = None
+        if labels.size == 0 or not np.issubdtype(labels.dtype, np.integer):
+            return
+
+        # Codes of labels from a narrow range are read from a table instead of
+        # searching the labels for every point. Offsets in the table are computed
+        # in int64, so uint64 labels above its maximum are searched for
+        min_label = int(labels.min())
+        max_label = int(labels.max())
+        label_range = max_label - min_label + 1
+        if (
+            max_label <= np.iinfo(np.int64).max
+            and label_range <= DENSE_RANGE_FACTOR * labels.size + 1
+        ):
+            table = np.full(label_range, -1, np.int64)
+            table[labels.astype(np.int64) - min_label] = np.arange(1, labels.size + 1)
+            unsegmented = self.unsegmented_labels[
+                (self.unsegmented_labels >= min_label)
+                & (self.unsegmented_labels < min_label + label_range)
+            ]
+            table[unsegmented.astype(np.int64) - min_label] = 0
+            self.__lookup = min_label, table
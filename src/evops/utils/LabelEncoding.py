@@ -0,0 +1,185 @@
+# Copyright (c) 2022, Skolkovo Institute of Science and Technology (Skoltech)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from __future__ import annotations
+
+from typing import Any, Optional, Tuple
+from nptyping import NDArray
+
+import hashlib
+
+import numpy as np
+
+from evops.utils.Profiler import profiled
+
+# Label ranges up to this many times the number of points are encoded with a
+# lookup table instead of sorting
+DENSE_RANGE_FACTOR = 4
+
+
+def __shift_labels(
+    labels_array: NDArray[Any, np.int32],
+) -> Optional[Tuple[int, int, NDArray[Any, np.int64]]]:
+    """
+    :param labels_array: non-empty list of point cloud labels
+    :return: minimal label, range of labels and labels shifted to start from zero,
+        or None if labels are not integer or their range is too wide for a lookup table
+    """
+    integer_labels = labels_array
+    if np.issubdtype(labels_array.dtype, np.floating):
+        integer_labels = labels_array.astype(np.int64)
+        if not np.array_equal(integer_labels, labels_array):
+            return None
+    elif not np.issubdtype(labels_array.dtype, np.integer):
+        return None
+
+    min_label = int(integer_labels.min())
+    label_range = int(integer_labels.max()) - min_label + 1
+    if label_range > DENSE_RANGE_FACTOR * labels_array.size + 1:
+        return None
+
+    if integer_labels.dtype == np.uint64:
+        shifted_labels = (integer_labels - integer_labels.min()).astype(np.int64)
+    else:
+        shifted_labels = integer_labels.astype(np.int64, copy=False)
+        if min_label != 0:
+            shifted_labels = shifted_labels - min_label
+
+    return min_label, label_range, shifted_labels
+
+
+def __unshift_labels(
+    shifted_labels: NDArray[Any, np.int64], min_label: int, dtype: np.dtype
+) -> NDArray[Any, np.int32]:
+    """
+    :param shifted_labels: labels shifted to start from zero
+    :param min_label: minimal label
+    :param dtype: type of the original labels
+    :return: original labels, computed in their own type, so uint64 labels
+        above the int64 maximum are not rounded through float
+    """
+    return shifted_labels.astype(dtype) + dtype.type(min_label)
+
+
+def is_unsegmented(
+    labels_array: NDArray[Any, np.int32],
+    unsegmented_label: Any,
+) -> NDArray[Any, bool]:
+    """
+    :param labels_array: list of point cloud labels
+    :param unsegmented_label: label or list of labels of points outside of planes
+    :return: mask of unsegmented labels, integer labels of different types are
+        compared exactly instead of being converted to float
+    """
+    unsegmented = np.atleast_1d(np.asarray(unsegmented_label))
+    if np.issubdtype(labels_array.dtype, np.integer) and np.issubdtype(
+        unsegmented.dtype, np.integer
+    ):
+        limits = np.iinfo(labels_array.dtype)
+        unsegmented = unsegmented[
+            (unsegmented >= limits.min) & (unsegmented <= limits.max)
+        ].astype(labels_array.dtype)
+
+    return np.isin(labels_array, unsegmented)
+
+
+@profiled("encode_labels")
+def encode_labels(
+    labels_array: NDArray[Any, np.int32],
+) -> Tuple[NDArray[Any, np.int32], NDArray[Any, np.int64]]:
+    """
+    :param labels_array: list of point cloud labels
+    :return: sorted unique labels and the index of each point label in them
+    """
+    if labels_array.size == 0:
+        return np.unique(labels_array), np.zeros(0, np.int64)
+
+    shifted = __shift_labels(labels_array)
+    if shifted is None:
+        unique_labels, codes = np.unique(labels_array, return_inverse=True)
+        return unique_labels, codes.reshape(-1)
+
+    min_label, label_range, shifted_labels = shifted
+    present = np.bincount(shifted_labels, minlength=label_range) > 0
+    lookup = np.cumsum(present) - 1
+    unique_labels = __unshift_labels(
+        np.flatnonzero(present), min_label, labels_array.dtype
+    )
+
+    return unique_labels, lookup[shifted_labels]
+
+
+def count_labels(
+    labels_array: NDArray[Any, np.int32],
+    label_range: Optional[int] = None,
+) -> Tuple[NDArray[Any, np.int32], NDArray[Any, np.int64]]:
+    """
+    :param labels_array: list of point cloud labels
+    :param label_range: if known, labels are non-negative integers less than label_range
+    :return: sorted unique labels and the amount of points with each of them
+    """
+    if labels_array.size == 0:
+        return np.unique(labels_array), np.zeros(0, np.int64)
+
+    if (
+        label_range is not None
+        and label_range <= DENSE_RANGE_FACTOR * labels_array.size + 1
+    ):
+        shifted = 0, label_range, labels_array
+    else:
+        shifted = __shift_labels(labels_array)
+    if shifted is None:
+        return np.unique(labels_array, return_counts=True)
+
+    min_label, label_range, shifted_labels = shifted
+    counts = np.bincount(shifted_labels, minlength=label_range)
+    present = np.flatnonzero(counts)
+
+    return __unshift_labels(present, min_label, labels_array.dtype), counts[present]
+
+
+def labels_digest(labels_array: NDArray[Any, np.int32]) -> bytes:
+    """
+    :param labels_array: list of point cloud labels
+    :return: hash of the type, shape and content of the labels
+    """
+    digest = hashlib.blake2b(digest_size=20)
+    digest.update(repr((labels_array.dtype.str, labels_array.shape)).encode())
+    digest.update(memoryview(np.ascontiguousarray(labels_array)).cast("B"))
+
+    return digest.digest()
+
+
+def pack_rgb(colors: NDArray[Any, np.uint8]) -> NDArray[Any, np.uint32]:
+    """
+    :param colors: (N, 3) array of 8-bit or [0, 1] float colors, or PCD rgb field
+        with colors packed into float32 values
+    :return: colors packed into 0xRRGGBB labels
+    """
+    colors = np.asarray(colors)
+    if colors.ndim == 1:
+        if colors.dtype == np.float32:
+            return colors.view(np.uint32) & 0xFFFFFF
+        assert np.issubdtype(
+            colors.dtype, np.integer
+        ), "Incorrect packed colors type, expected float32 or integer"
+        return colors.astype(np.uint32) & 0xFFFFFF
+
+    assert (
+        colors.ndim == 2 and colors.shape[1] == 3
+    ), "Incorrect colors shape, expected (n, 3)"
+    if np.issubdtype(colors.dtype, np.floating):
+        colors = np.rint(colors * 255)
+    colors = colors.astype(np.uint32)
+
+    return (colors[:, 0] << 16) | (colors[:, 1] << 8) | colors[:, 2]
@@ -0,0 +1,81 @@
+# Copyright (c) 2022, Skolkovo Institute of Science and Technology (Skoltech)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from __future__ import annotations
+
+from typing import Any, Dict, Iterator, Tuple
+from nptyping import NDArray
+
+import numpy as np
+
+from evops.utils.LabelEncoding import encode_labels
+from evops.utils.Profiler import profiled
+
+
+class LabelGroups:
+    """
+    Indices of points of every label stored in one array sorted by label,
+    with the offset of the first point of every label, so all groups are
+    built by one sort and every group is a view of the array.
+    """
+
+    @profiled("group_indices")
+    def __init__(
+        self,
+        labels: NDArray[Any, np.int32],
+        codes: NDArray[Any, np.int64],
+        sizes: NDArray[Any, np.int64] = None,
+    ):
+        """
+        :param labels: sorted unique labels
+        :param codes: index of the label of every point in labels
+        :param sizes: amount of points of every label, counted from codes by default
+        """
+        if sizes is None:
+            sizes = np.bincount(codes, minlength=labels.size)
+        self.labels = labels
+        self.offsets = np.concatenate([[0], np.cumsum(sizes)])
+        # Stable sort of 8 and 16-bit keys is a radix sort, linear in points
+        if labels.size <= np.iinfo(np.uint8).max + 1:
+            codes = codes.astype(np.uint8)
+        elif labels.size <= np.iinfo(np.uint16).max + 1:
+            codes = codes.astype(np.uint16)
+        self.indices = np.argsort(codes, kind="stable")
+
+    @classmethod
+    def from_labels(cls, labels_array: NDArray[Any, np.int32]) -> "LabelGroups":
+        """
+        :param labels_array: list of point cloud labels
+        :return: indices of points of every label
+        """
+        return cls(*encode_labels(labels_array))
+
+    def __len__(self) -> int:
+        return self.labels.size
+
+    def __getitem__(self, index: int) -> NDArray[Any, np.int64]:
+        """
+        :param index: index of the label in labels
+        :return: sorted indices of points with the label
+        """
+        return self.indices[self.offsets[index] : self.offsets[index + 1]]
+
+    def __iter__(self) -> Iterator[Tuple[np.int32, NDArray[Any, np.int64]]]:
+        for index, label in enumerate(self.labels):
+            yield label, self[index]
+
+    def as_dict(self) -> Dict[np.int32, NDArray[Any, np.int64]]:
+        """
+        :return: dictionary with labels and an array of indices belonging to this label
+        """
+        return dict(iter(self))
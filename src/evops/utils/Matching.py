@@ -0,0 +1,237 @@
+# Copyright (c) 2022, Skolkovo Institute of Science and Technology (Skoltech)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from __future__ import annotations
+
+from typing import Any, Tuple
+from nptyping import NDArray
+
+import numpy as np
+
+from evops.utils.Profiler import profiled
+
+try:
+    from scipy.optimize import linear_sum_assignment
+except ImportError:
+    linear_sum_assignment = None
+
+MATCHING_STRATEGIES = ("first_fit", "greedy", "optimal")
+
+
+def __hungarian(
+    cost: NDArray[(Any, Any), np.float64]
+) -> Tuple[NDArray[Any, np.int64], NDArray[Any, np.int64]]:
+    """
+    Shortest augmenting path assignment, used when scipy is not installed
+    :param cost: cost matrix with no more rows than columns
+    :return: row and column of every assigned cell with the minimal total cost
+    """
+    rows_amount, columns_amount = cost.shape
+    row_potential = np.zeros(rows_amount + 1)
+    column_potential = np.zeros(columns_amount + 1)
+    # Row assigned to every column, column zero holds the row being added
+    column_row = np.zeros(columns_amount + 1, np.int64)
+    previous_column = np.zeros(columns_amount + 1, np.int64)
+
+    for row in range(1, rows_amount + 1):
+        column_row[0] = row
+        column = 0
+        min_slack = np.full(columns_amount + 1, np.inf)
+        visited = np.zeros(columns_amount + 1, bool)
+        while column_row[column] != 0:
+            visited[column] = True
+            current_row = column_row[column]
+            slack = (
+                cost[current_row - 1]
+                - row_potential[current_row]
+                - column_potential[1:]
+            )
+            improved = ~visited[1:] & (slack < min_slack[1:])
+            min_slack[1:][improved] = slack[improved]
+            previous_column[1:][improved] = column
+
+            free_slack = np.where(visited[1:], np.inf, min_slack[1:])
+            next_column = int(np.argmin(free_slack)) + 1
+            delta = free_slack[next_column - 1]
+            row_potential[column_row[visited]] += delta
+            column_potential[visited] -= delta
+            min_slack[~visited] -= delta
+            column = next_column
+
+        while column != 0:
+            column_row[column] = column_row[previous_column[column]]
+            column = previous_column[column]
+
+    columns = np.flatnonzero(column_row[1:])
+
+    return column_row[columns + 1] - 1, columns
+
+
+def __assignment(
+    weights: NDArray[(Any, Any), np.float64]
+) -> Tuple[NDArray[Any, np.int64], NDArray[Any, np.int64]]:
+    """
+    :param weights: non-negative weight of every row and column pair
+    :return: row and column of every assigned cell with the maximal total weight
+    """
+    if linear_sum_assignment is not None:
+        return linear_sum_assignment(weights, maximize=True)
+
+    if weights.shape[0] > weights.shape[1]:
+        columns, rows = __hungarian(-weights.T)
+    else:
+        rows, columns = __hungarian(-weights)
+
+    return rows, columns
+
+
+def __take_in_order(
+    ordered_pairs: NDArray[Any, np.int64],
+    pair_pred: NDArray[Any, np.int64],
+    pair_gt: NDArray[Any, np.int64],
+) -> NDArray[Any, np.int64]:
+    """
+    :param ordered_pairs: candidate pairs in the order of preference
+    :return: pairs whose planes are not taken by previous pairs
+    """
+    pred_used = set()
+    gt_used = set()
+    matched = []
+    for pair, pred_index, gt_index in zip(
+        ordered_pairs.tolist(),
+        pair_pred[ordered_pairs].tolist(),
+        pair_gt[ordered_pairs].tolist(),
+    ):
+        if pred_index in pred_used or gt_index in gt_used:
+            continue
+        pred_used.add(pred_index)
+        gt_used.add(gt_index)
+        matched.append(pair)
+
+    return np.array(matched, np.int64)
+
+
+def __components(
+    pair_pred: NDArray[Any, np.int64],
+    pair_gt: NDArray[Any, np.int64],
+) -> NDArray[Any, np.int64]:
+    """
+    :return: connected component of every pair in the graph of planes linked by pairs
+    """
+    pred_unique, pred_codes = np.unique(pair_pred, return_inverse=True)
+    gt_unique, gt_codes = np.unique(pair_gt, return_inverse=True)
+    pred_component = np.arange(pred_unique.size)
+    while True:
+        gt_component = np.full(gt_unique.size, pred_unique.size)
+        np.minimum.at(gt_component, gt_codes, pred_component[pred_codes])
+        next_component = pred_component.copy()
+        np.minimum.at(next_component, pred_codes, gt_component[gt_codes])
+        if np.array_equal(next_component, pred_component):
+            return pred_component[pred_codes]
+        pred_component = next_component
+
+
+def __optimal_pairs(
+    candidates: NDArray[Any, np.int64],
+    pair_pred: NDArray[Any, np.int64],
+    pair_gt: NDArray[Any, np.int64],
+    pair_scores: NDArray[Any, np.float64],
+) -> NDArray[Any, np.int64]:
+    """
+    Solves an assignment problem for every connected group of candidate pairs
+    :return: pairs of the largest matching with the highest total score
+    """
+    components = __components(pair_pred[candidates], pair_gt[candidates])
+    candidates = candidates[np.argsort(components, kind="stable")]
+    borders = np.flatnonzero(np.diff(np.sort(components))) + 1
+
+    matched = []
+    for component in np.split(candidates, borders):
+        if component.size == 1:
+            matched.append(component)
+            continue
+        pred_unique, rows = np.unique(pair_pred[component], return_inverse=True)
+        gt_unique, columns = np.unique(pair_gt[component], return_inverse=True)
+        # Scores are scaled so that one more match always outweighs them
+        weights = np.zeros((pred_unique.size, gt_unique.size))
+        weights[rows, columns] = 1 + pair_scores[component] / (
+            min(pred_unique.size, gt_unique.size) + 1
+        )
+        pair_indices = np.zeros(weights.shape, np.int64)
+        pair_indices[rows, columns] = component
+
+        assigned_rows, assigned_columns = __assignment(weights)
+        assigned = weights[assigned_rows, assigned_columns] > 0
+        matched.append(
+            pair_indices[assigned_rows[assigned], assigned_columns[assigned]]
+        )
+
+    return np.concatenate(matched)
+
+
+@profiled("match")
+def match_pairs(
+    pair_pred: NDArray[Any, np.int64],
+    pair_gt: NDArray[Any, np.int64],
+    pair_scores: NDArray[Any, np.float64],
+    threshold: np.float64,
+    strategy: str = "first_fit",
+) -> NDArray[Any, np.int64]:
+    """
+    Selects one-to-one matches among pairs of planes whose score reaches the threshold
+    :param pair_pred: predicted plane index of every pair
+    :param pair_gt: ground truth plane index of every pair
+    :param pair_scores: overlap score of every pair from zero to one, for example IoU
+    :param threshold: minimum score of matched pairs
+    :param strategy: 'first_fit' matches ground truth planes in index order with the first
+        unused predicted plane, 'greedy' takes pairs in the descending order of scores,
+        'optimal' finds the largest matching with the highest total score
+    :return: sorted indices of matched pairs
+    """
+    assert strategy in MATCHING_STRATEGIES, "Incorrect name of matching strategy"
+    candidates = np.flatnonzero(pair_scores >= threshold)
+    if candidates.size == 0:
+        return candidates
+
+    # Every candidate is matched if no plane has more than one of them,
+    # which always holds for IoU above one half
+    if (
+        np.bincount(pair_pred[candidates]).max() == 1
+        and np.bincount(pair_gt[candidates]).max() == 1
+    ):
+        return candidates
+
+    if strategy == "optimal":
+        matched = __optimal_pairs(candidates, pair_pred, pair_gt, pair_scores)
+    elif strategy == "greedy":
+        matched = __take_in_order(
+            candidates[
+                np.lexsort(
+                    (
+                        pair_pred[candidates],
+                        pair_gt[candidates],
+                        -pair_scores[candidates],
+                    )
+                )
+            ],
+            pair_pred,
+            pair_gt,
+        )
+    else:
+        matched = __take_in_order(
+            candidates[np.lexsort((pair_pred[candidates], pair_gt[candidates]))],
+            pair_pred,
+            pair_gt,
+        )
+
+    return np.sort(matched)
@@ -0,0 +1,102 @@
+# Copyright (c) 2022, Skolkovo Institute of Science and Technology (Skoltech)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from __future__ import annotations
+
+from typing import Any, Tuple
+from nptyping import NDArray
+
+import numpy as np
+
+
+def __segment_moments(
+    points: NDArray[(Any, 3), np.float64],
+    codes: NDArray[Any, np.int64],
+    segments_amount: int,
+) -> Tuple[
+    NDArray[Any, np.int64], NDArray[(Any, 3), np.float64], NDArray[Any, np.float64]
+]:
+    """
+    :param points: coordinates of points
+    :param codes: index of the segment of every point
+    :param segments_amount: amount of segments
+    :return: size, centroid and covariance matrix (k, 3, 3) of every segment,
+        accumulated for all segments at once
+    """
+    sizes = np.bincount(codes, minlength=segments_amount)
+    counts = np.maximum(sizes, 1)
+    centroids = np.stack(
+        [
+            np.bincount(codes, points[:, axis], segments_amount) / counts
+            for axis in range(3)
+        ],
+        axis=1,
+    )
+
+    # Products of centered points don't lose precision for planes far from the origin
+    centered = points - centroids[codes]
+    covariances = np.zeros((segments_amount, 3, 3), np.float64)
+    for row in range(3):
+        for column in range(row, 3):
+            covariances[:, row, column] = (
+                np.bincount(
+                    codes, centered[:, row] * centered[:, column], segments_amount
+                )
+                / counts
+            )
+            covariances[:, column, row] = covariances[:, row, column]
+
+    return sizes, centroids, covariances
+
+
+def __fit_planes(
+    sizes: NDArray[Any, np.int64],
+    covariances: NDArray[Any, np.float64],
+) -> Tuple[NDArray[(Any, 3), np.float64], NDArray[Any, np.float64]]:
+    """
+    :param sizes: amount of points of every segment
+    :param covariances: covariance matrix (k, 3, 3) of every segment
+    :return: unit normal of the least squares plane of every segment and RMSE
+        of distances from its points to the plane, NaN for segments of less
+        than 3 points
+    """
+    eigenvalues, eigenvectors = np.linalg.eigh(covariances)
+    # Eigenvalues are sorted, the smallest one is the mean squared distance
+    normals = eigenvectors[:, :, 0]
+    rmse = np.sqrt(np.maximum(eigenvalues[:, 0], 0))
+
+    degenerate = sizes < 3
+    normals[degenerate] = np.nan
+    rmse[degenerate] = np.nan
+
+    return normals, rmse
+
+
+def __plane_distances_rmse(
+    centroids: NDArray[(Any, 3), np.float64],
+    covariances: NDArray[Any, np.float64],
+    plane_normals: NDArray[(Any, 3), np.float64],
+    plane_points: NDArray[(Any, 3), np.float64],
+) -> NDArray[Any, np.float64]:
+    """
+    :param centroids: centroid of every segment
+    :param covariances: covariance matrix (k, 3, 3) of every segment
+    :param plane_normals: unit normal of the plane every segment is compared to
+    :param plane_points: point of the plane every segment is compared to
+    :return: RMSE of distances from points of every segment to its plane,
+        computed from the moments of the segment without visiting its points
+    """
+    offsets = np.einsum("ij,ij->i", plane_normals, centroids - plane_points)
+    spread = np.einsum("ij,ijk,ik->i", plane_normals, covariances, plane_normals)
+
+    return np.sqrt(np.maximum(spread, 0) + offsets**2)
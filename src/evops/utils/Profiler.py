@@ -0,0 +1,230 @@
+# Copyright (c) 2022, Skolkovo Institute of Science and Technology (Skoltech)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from contextlib import contextmanager, nullcontext
+from typing import Any, Callable, Dict, Iterator, List, Optional
+
+import functools
+import inspect
+import json
+import os
+import threading
+import time
+import tracemalloc
+
+import numpy as np
+
+
+class Profiler:
+    """
+    Records timings of stages of evaluation calls made while the profiler is
+    active, e.g. asserts, encoding of labels, counting of overlaps and matching.
+    Stages are not measured at all while no profiler is active, so instrumented
+    functions only check a flag. Calls in worker processes are not recorded.
+
+    :param memory: record peaks of memory allocated by every stage with tracemalloc,
+        which slows numpy allocations down
+    """
+
+    __active = ()
+    __lock = threading.Lock()
+    __local = threading.local()
+    __disabled_stage = nullcontext()
+
+    def __init__(self, memory: bool = False):
+        self.memory = memory
+        self.records = []
+        self.__origin = time.perf_counter_ns()
+        self.__started_tracing = False
+
+    def __enter__(self) -> "Profiler":
+        if self.memory and not tracemalloc.is_tracing():
+            tracemalloc.start()
+            self.__started_tracing = True
+        self.__origin = time.perf_counter_ns()
+        with Profiler.__lock:
+            Profiler.__active = Profiler.__active + (self,)
+
+        return self
+
+    def __exit__(self, *exception: Any):
+        with Profiler.__lock:
+            Profiler.__active = tuple(
+                profiler for profiler in Profiler.__active if profiler is not self
+            )
+        if self.__started_tracing:
+            tracemalloc.stop()
+            self.__started_tracing = False
+
+    @classmethod
+    def enabled(cls) -> bool:
+        """
+        :return: true if a profiler is active
+        """
+        return len(cls.__active) != 0
+
+    @classmethod
+    def stage(cls, name: str, **values: Any) -> Any:
+        """
+        :param name: name of the stage
+        :param values: sizes of arrays, amounts of labels and other values of the stage
+        :return: context manager measuring its body, does nothing if no profiler is active
+        """
+        if len(cls.__active) == 0:
+            return cls.__disabled_stage
+
+        return cls.__measure(name, values)
+
+    @classmethod
+    def annotate(cls, **values: Any):
+        """
+        :param values: values added to the innermost measured stage of the thread
+        """
+        if len(cls.__active) == 0:
+            return
+        stack = getattr(cls.__local, "stack", None)
+        if stack:
+            stack[-1]["values"].update(values)
+
+    def summary(self) -> Dict[str, Dict[str, Any]]:
+        """
+        :return: amount of calls, total and maximal duration in seconds of every stage
+        """
+        summary = {}
+        for record in self.records:
+            stage = summary.setdefault(
+                record["name"], {"calls": 0, "total": 0.0, "max": 0.0}
+            )
+            stage["calls"] += 1
+            stage["total"] += record["duration"]
+            stage["max"] = max(stage["max"], record["duration"])
+
+        return summary
+
+    def trace_events(self) -> Dict[str, List[Dict[str, Any]]]:
+        """
+        :return: records in the trace event format read by chrome://tracing and Perfetto
+        """
+        process = os.getpid()
+        events = []
+        for record in self.records:
+            arguments = dict(record["values"])
+            if record["memory_peak"] is not None:
+                arguments["memory_peak"] = record["memory_peak"]
+            events.append(
+                {
+                    "name": record["name"],
+                    "cat": "evops",
+                    "ph": "X",
+                    "ts": (record["start"] - self.__origin) / 1e3,
+                    "dur": record["duration"] * 1e6,
+                    "pid": process,
+                    "tid": record["thread"],
+                    "args": arguments,
+                }
+            )
+
+        return {"traceEvents": events}
+
+    def export(self, path: str):
+        """
+        :param path: path of the JSON file of trace events
+        """
+        with open(path, "w") as file:
+            json.dump(self.trace_events(), file, default=Profiler.__json_value)
+
+    @staticmethod
+    def __json_value(value: Any) -> Any:
+        if isinstance(value, np.generic):
+            return value.item()
+
+        return str(value)
+
+    @classmethod
+    @contextmanager
+    def __measure(cls, name: str, values: Dict[str, Any]) -> Iterator[None]:
+        stack = getattr(cls.__local, "stack", None)
+        if stack is None:
+            stack = cls.__local.stack = []
+
+        frame = {"values": values, "memory": None, "peak": 0}
+        if tracemalloc.is_tracing():
+            current, peak = tracemalloc.get_traced_memory()
+            # Peaks are reset for every stage where possible, so the peak seen
+            # before the stage is kept by the enclosing one
+            if stack:
+                stack[-1]["peak"] = max(stack[-1]["peak"], peak)
+            if hasattr(tracemalloc, "reset_peak"):
+                tracemalloc.reset_peak()
+            frame["memory"] = frame["peak"] = current
+        stack.append(frame)
+        start = time.perf_counter_ns()
+        try:
+            yield
+        finally:
+            duration = time.perf_counter_ns() - start
+            stack.pop()
+            memory_peak = None
+            if frame["memory"] is not None and tracemalloc.is_tracing():
+                peak = max(tracemalloc.get_traced_memory()[1], frame["peak"])
+                memory_peak = peak - frame["memory"]
+                if stack:
+                    stack[-1]["peak"] = max(stack[-1]["peak"], peak)
+
+            record = {
+                "name": name,
+                "thread": threading.get_ident(),
+                "depth": len(stack),
+                "start": start,
+                "duration": duration / 1e9,
+                "memory_peak": memory_peak,
+                "values": values,
+            }
+            for profiler in cls.__active:
+                profiler.records.append(record)
+
+
+def profiled(name: str):
+    """
+    :param name: name of the stage of the decorated function
+    :return: decorator measuring calls of the function while a profiler is active,
+        sizes of array arguments are recorded as values of the stage
+    """
+
+    def decorator(function: Callable) -> Callable:
+        signature = inspect.signature(function)
+
+        @functools.wraps(function)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            if not Profiler.enabled():
+                return function(*args, **kwargs)
+
+            arguments = signature.bind_partial(*args, **kwargs).arguments
+            with Profiler.stage(name, **__argument_sizes(arguments)):
+                return function(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def __argument_sizes(arguments: Dict[str, Any]) -> Dict[str, int]:
+    """
+    :param arguments: arguments of a call by their names
+    :return: amount of points of every array argument and of labels stored otherwise
+    """
+    return {
+        "{}_size".format(name): int(value.size)
+        for name, value in arguments.items()
+        if isinstance(value, np.ndarray) or hasattr(value, "labels_array")
+    }
@@ -0,0 +1,277 @@
+# Copyright (c) 2022, Skolkovo Institute of Science and Technology (Skoltech)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from contextlib import suppress
+from typing import Any, Callable, Optional
+
+import contextvars
+import dataclasses
+import functools
+import hashlib
+import inspect
+import os
+import pickle
+import threading
+
+import numpy as np
+
+import evops
+import evops.metrics.constants
+from evops.utils.LabelEncoding import labels_digest
+
+# Eviction removes the least recently used results until the store takes
+# this part of its size limit, so it does not run on every write
+CACHE_EVICTION_RATIO = 0.8
+
+
+class ResultCache:
+    """
+    Results of evaluation calls stored in a directory and looked up by a hash
+    of the label arrays, the settings and the name of the metric, so unchanged
+    frames are not evaluated again, e.g. by the next run of an evaluation
+    campaign. Results are written atomically, so several processes may share
+    the directory. The cache is used while it is active:
+
+        with ResultCache(directory):
+            evaluate_dataset(pred_frames, gt_frames)
+
+    The cache is active in the thread or asyncio task that entered it. Workers
+    created by evaluate_dataset(), iterate_dataset() and AsyncEvaluator use the
+    active cache of the caller.
+
+    :param directory: directory of the stored results
+    :param max_bytes: size of the stored results at which the least recently
+        used ones are removed
+    """
+
+    __active = contextvars.ContextVar("active_result_cache", default=None)
+    # Caches active before every entered one, restored when it is exited
+    __previous = contextvars.ContextVar("previous_result_caches", default=())
+
+    def __init__(self, directory: str, max_bytes: int = 1 << 30):
+        self.directory = os.fspath(directory)
+        self.max_bytes = max_bytes
+        self.__written_bytes = 0
+
+    def __enter__(self) -> "ResultCache":
+        self.activate()
+        return self
+
+    def __exit__(self, *exception: Any):
+        previous = ResultCache.__previous.get()
+        ResultCache.__active.set(previous[-1])
+        ResultCache.__previous.set(previous[:-1])
+
+    def activate(self):
+        """
+        Makes the cache active in the current thread or task until it is exited
+        """
+        ResultCache.__previous.set(
+            ResultCache.__previous.get() + (ResultCache.__active.get(),)
+        )
+        ResultCache.__active.set(self)
+
+    @classmethod
+    def active(cls) -> Optional["ResultCache"]:
+        """
+        :return: the active cache of the current thread or task or None
+        """
+        return cls.__active.get()
+
+    def key(self, name: str, *values: Any) -> Optional[str]:
+        """
+        :param name: name of the metric
+        :param values: arguments of the call, e.g. label arrays and settings
+        :return: hash of the values together with the current constants and
+            the version of evops, None if a value can't be hashed by its content,
+            e.g. a function other than the metrics of evops
+        """
+        digest = hashlib.blake2b(digest_size=20)
+        digest.update(name.encode())
+        constants = (
+            evops.__version__,
+            evops.metrics.constants.UNSEGMENTED_LABEL,
+            evops.metrics.constants.IOU_THRESHOLD,
+            evops.metrics.constants.AVERAGE_PRECISION_IOU_THRESHOLDS,
+        )
+        for value in (constants,) + values:
+            if not ResultCache.__update(digest, value):
+                return None
+
+        return digest.hexdigest()
+
+    def compute(self, name: str, function: Callable[[], Any], *values: Any) -> Any:
+        """
+        :param name: name of the metric
+        :param function: function computing the result
+        :param values: values the result depends on
+        :return: stored result, computed and stored if there is none
+        """
+        key = self.key(name, *values)
+        if key is None:
+            return function()
+        result = self.get(key)
+        if result is None:
+            result = function()
+            self.put(key, result)
+
+        return result
+
+    def get(self, key: str) -> Any:
+        """
+        :param key: key of the result
+        :return: stored result or None
+        """
+        path = self.__path(key)
+        try:
+            with open(path, "rb") as file:
+                result = pickle.load(file)
+        except (OSError, EOFError, pickle.UnpicklingError):
+            return None
+        # Modification times order results by their last use for eviction
+        with suppress(OSError):
+            os.utime(path)
+
+        return result
+
+    def put(self, key: str, result: Any):
+        """
+        :param key: key of the result
+        :param result: result to store, replaces the stored one at once
+        """
+        path = self.__path(key)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        temporary_path = "{}.{}.{}.tmp".format(path, os.getpid(), threading.get_ident())
+        with open(temporary_path, "wb") as file:
+            pickle.dump(result, file, pickle.HIGHEST_PROTOCOL)
+            size = file.tell()
+        os.replace(temporary_path, path)
+
+        # Results written by other processes are found by the scan of the store
+        self.__written_bytes += size
+        if self.__written_bytes > (1 - CACHE_EVICTION_RATIO) * self.max_bytes:
+            self.__written_bytes = 0
+            self.evict()
+
+    def evict(self):
+        """
+        Removes the least recently used results while the store is larger than
+        the size limit times CACHE_EVICTION_RATIO, if it is larger than the limit
+        """
+        entries = []
+        with suppress(OSError):
+            for directory in os.scandir(self.directory):
+                if not directory.is_dir():
+                    continue
+                for entry in os.scandir(directory.path):
+                    if entry.name.endswith(".pkl"):
+                        with suppress(OSError):
+                            status = entry.stat()
+                            entries.append(
+                                (status.st_mtime_ns, status.st_size, entry.path)
+                            )
+        total_bytes = sum(size for _, size, _ in entries)
+        if total_bytes <= self.max_bytes:
+            return
+
+        for _, size, path in sorted(entries):
+            if total_bytes <= CACHE_EVICTION_RATIO * self.max_bytes:
+                break
+            with suppress(OSError):
+                os.remove(path)
+            total_bytes -= size
+
+    def clear(self):
+        """
+        Removes all stored results
+        """
+        max_bytes = self.max_bytes
+        self.max_bytes = 0
+        try:
+            self.evict()
+        finally:
+            self.max_bytes = max_bytes
+
+    def __path(self, key: str) -> str:
+        return os.path.join(self.directory, key[:2], key + ".pkl")
+
+    @staticmethod
+    def __update(digest: Any, value: Any) -> bool:
+        """
+        :param digest: hash to update
+        :param value: value to hash by its content
+        :return: false if the value can't be hashed by its content
+        """
+        if hasattr(value, "labels_digest"):
+            digest.update(value.labels_digest())
+            return True
+        if hasattr(value, "labels_array"):
+            value = value.labels_array()
+        if isinstance(value, np.ndarray):
+            if value.dtype.hasobject:
+                return False
+            digest.update(labels_digest(value))
+            return True
+        if isinstance(value, (list, tuple)):
+            digest.update("{}{}".format(type(value).__name__, len(value)).encode())
+            return all(ResultCache.__update(digest, item) for item in value)
+        if isinstance(value, dict):
+            digest.update("dict{}".format(len(value)).encode())
+            # Keys of different types, e.g. int and str classes, are not comparable
+            return all(
+                ResultCache.__update(digest, item)
+                for item in sorted(value.items(), key=lambda item: repr(item[0]))
+            )
+        if dataclasses.is_dataclass(value) or isinstance(
+            value, (str, bytes, int, float, bool, np.generic, type(None))
+        ):
+            digest.update(repr(value).encode())
+            return True
+        if callable(value) and getattr(value, "__module__", None) == (
+            "evops.metrics.metrics"
+        ):
+            # Metrics of evops passed as arguments, e.g. to mean(), are the same
+            # in every process, so they are hashed by their names
+            digest.update("metric {}".format(value.__qualname__).encode())
+            return True
+
+        return False
+
+
+def cached(name: str):
+    """
+    :param name: name of the metric computed by the decorated function
+    :return: decorator looking results of calls up in the active cache
+    """
+
+    def decorator(function: Callable) -> Callable:
+        signature = inspect.signature(function)
+
+        @functools.wraps(function)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            cache = ResultCache.active()
+            if cache is None:
+                return function(*args, **kwargs)
+
+            arguments = signature.bind(*args, **kwargs)
+            arguments.apply_defaults()
+
+            return cache.compute(
+                name,
+                functools.partial(function, *args, **kwargs),
+                *arguments.arguments.values(),
+            )
+
+        return wrapper
+
+    return decorator
@@ -0,0 +1,100 @@
+# Copyright (c) 2022, Skolkovo Institute of Science and Technology (Skoltech)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from __future__ import annotations
+
+from typing import Any, Tuple
+from nptyping import NDArray
+
+import numpy as np
+
+
+class RunLengthLabels:
+    """
+    Labels of an organized point cloud, e.g. of a depth image, stored as runs
+    of equal labels in row-major order. Planes of organized clouds are made of
+    long runs, so overlaps of planes are counted over merged runs instead of
+    points and labels take memory proportional to the amount of runs.
+    """
+
+    def __init__(
+        self,
+        starts: NDArray[Any, np.int64],
+        values: NDArray[Any, np.int32],
+        shape: Tuple[int, ...],
+    ):
+        """
+        :param starts: index of the first point of every run, starting with zero
+        :param values: label of every run
+        :param shape: shape of the label image
+        """
+        self.starts = np.asarray(starts, np.int64)
+        self.values = np.asarray(values)
+        self.shape = tuple(shape)
+
+    @classmethod
+    def from_labels(cls, labels: NDArray[Any, np.int32]) -> "RunLengthLabels":
+        """
+        :param labels: label image or list of labels of points
+        :return: runs of equal labels
+        """
+        labels = np.asarray(labels)
+        flat_labels = labels.reshape(-1)
+        starts = np.flatnonzero(flat_labels[1:] != flat_labels[:-1]) + 1
+        if flat_labels.size != 0:
+            starts = np.concatenate([[0], starts])
+
+        return cls(starts, flat_labels[starts], labels.shape)
+
+    @property
+    def size(self) -> int:
+        return int(np.prod(self.shape))
+
+    @property
+    def lengths(self) -> NDArray[Any, np.int64]:
+        return np.diff(self.starts, append=self.size)
+
+    def labels_array(self) -> NDArray[Any, np.int32]:
+        """
+        :return: label image
+        """
+        return np.repeat(self.values, self.lengths).reshape(self.shape)
+
+
+def is_organized(labels: Any) -> bool:
+    """
+    :param labels: labels of points
+    :return: true for label images and their runs
+    """
+    return isinstance(labels, RunLengthLabels) or (
+        isinstance(labels, np.ndarray) and labels.ndim == 2
+    )
+
+
+def merge_runs(
+    pred_runs: RunLengthLabels,
+    gt_runs: RunLengthLabels,
+) -> Tuple[NDArray[Any, np.int32], NDArray[Any, np.int32], NDArray[Any, np.int64]]:
+    """
+    :param pred_runs: runs of predicted labels
+    :param gt_runs: runs of reference labels of the same image
+    :return: predicted label, reference label and length of every run of equal
+        pairs of labels, pairs may repeat
+    """
+    starts = np.union1d(pred_runs.starts, gt_runs.starts)
+    pred_values = pred_runs.values[
+        np.searchsorted(pred_runs.starts, starts, "right") - 1
+    ]
+    gt_values = gt_runs.values[np.searchsorted(gt_runs.starts, starts, "right") - 1]
+
+    return pred_values, gt_values, np.diff(starts, append=pred_runs.size)
@@ -0,0 +1,118 @@
+# Copyright (c) 2022, Skolkovo Institute of Science and Technology (Skoltech)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from concurrent.futures import ThreadPoolExecutor
+
+import asyncio
+import time
+
+import numpy as np
+import pytest
+
+from evops.metrics import AsyncEvaluator, EvaluationConfig, evaluate
+
+config = EvaluationConfig(unsegmented_labels=0, iou_threshold=0.5)
+
+
+def __frames(frames_amount: int):
+    generator = np.random.default_rng(frames_amount)
+    return [
+        (generator.integers(0, 8, 2000), generator.integers(0, 6, 2000))
+        for _ in range(frames_amount)
+    ]
+
+
+def test_async_evaluator_batches_clients():
+    frames = __frames(40)
+
+    async def client(evaluator, pred_labels, gt_labels):
+        await asyncio.sleep(0)
+        return await evaluator.evaluate(pred_labels, gt_labels)
+
+    async def serve():
+        async with AsyncEvaluator(config, max_batch_size=8, workers=2) as evaluator:
+            results = await asyncio.gather(
+                *(client(evaluator, *frame) for frame in frames)
+            )
+            return results, evaluator.batches
+
+    results, batches = asyncio.run(serve())
+
+    assert 5 <= batches < len(frames)
+    for (pred_labels, gt_labels), result in zip(frames, results):
+        expected = evaluate(pred_labels, gt_labels, config=config)
+        assert expected["fScore"] == pytest.approx(result["fScore"])
+        assert expected["multi_value"] == pytest.approx(result["multi_value"])
+
+
+def test_async_evaluator_timeout_and_backpressure():
+    frames = __frames(6)
+    pool = ThreadPoolExecutor(1)
+
+    async def serve():
+        evaluator = AsyncEvaluator(
+            config, max_batch_size=2, max_pending=1, workers=1, executor=pool
+        )
+        blocked = pool.submit(time.sleep, 0.5)
+        with pytest.raises(asyncio.TimeoutError):
+            await evaluator.evaluate(*frames[0], timeout=0.05)
+        results = await asyncio.gather(
+            *(evaluator.evaluate(*frame) for frame in frames)
+        )
+        await evaluator.close()
+        blocked.result()
+        return results
+
+    results = asyncio.run(serve())
+    pool.shutdown()
+
+    assert [evaluate(*frame, config=config)["true_positive"] for frame in frames] == [
+        result["true_positive"] for result in results
+    ]
+
+
+def test_async_evaluator_organized_labels():
+    pred_labels, gt_labels = __frames(1)[0]
+
+    async def serve():
+        async with AsyncEvaluator(config) as evaluator:
+            return await asyncio.gather(
+                evaluator.evaluate(
+                    pred_labels.reshape(40, 50), gt_labels.reshape(40, 50)
+                ),
+                evaluator.evaluate(np.ones((2, 3)), np.ones((2, 3))),
+            )
+
+    organized, ones = asyncio.run(serve())
+
+    expected = evaluate(pred_labels, gt_labels, config=config)
+    assert expected["fScore"] == pytest.approx(organized["fScore"])
+    assert expected["mean_iou"] == pytest.approx(organized["mean_iou"])
+    assert 1 == ones["true_positive"]
+
+
+def test_async_evaluator_asserts():
+    with pytest.raises(AssertionError) as excinfo:
+        AsyncEvaluator(max_batch_size=0)
+    assert str(excinfo.value) == "Batch size must be positive"
+
+    async def serve():
+        async with AsyncEvaluator(config) as evaluator:
+            await evaluator.evaluate(np.zeros(3), np.zeros(4))
+
+    with pytest.raises(AssertionError) as excinfo:
+        asyncio.run(serve())
+    assert (
+        str(excinfo.value)
+        == "Predicted and ground truth label arrays must have the same size"
+    )
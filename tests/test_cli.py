@@ -0,0 +1,199 @@
+# Copyright (c) 2022, Skolkovo Institute of Science and Technology (Skoltech)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import csv
+import json
+
+import numpy as np
+import pytest
+
+from evops.cli import main
+from evops.metrics import EvaluationConfig, evaluate
+
+
+def __write_frames(directory, frames_amount):
+    pred_directory = directory / "pred"
+    gt_directory = directory / "gt" / "sequence"
+    pred_directory.joinpath("sequence").mkdir(parents=True)
+    gt_directory.mkdir(parents=True)
+    generator = np.random.default_rng(0)
+    frames = []
+    for index in range(frames_amount):
+        gt_labels = generator.integers(0, 5, 500).astype(np.uint32)
+        pred_labels = np.where(generator.random(500) < 0.8, gt_labels, 1)
+        pred_labels.astype(np.uint32).tofile(
+            pred_directory / "sequence" / "{:03}.label".format(index)
+        )
+        np.save(gt_directory / "{:03}.npy".format(index), gt_labels)
+        frames.append((pred_labels, gt_labels))
+
+    return frames
+
+
+def test_cli_directories(tmp_path, capsys):
+    frames = __write_frames(tmp_path, 3)
+    output = tmp_path / "results.csv"
+
+    assert 0 == main(
+        [
+            "--pred-dir",
+            str(tmp_path / "pred"),
+            "--gt-dir",
+            str(tmp_path / "gt"),
+            "--output",
+            str(output),
+            "--workers",
+            "0",
+            "--iou-threshold",
+            "0.5",
+        ]
+    )
+
+    with open(output, newline="") as file:
+        rows = list(csv.DictReader(file))
+    config = EvaluationConfig(iou_threshold=0.5)
+    assert ["sequence/000", "sequence/001", "sequence/002"] == [
+        row["frame"] for row in rows
+    ]
+    for row, (pred_labels, gt_labels) in zip(rows, frames):
+        report = evaluate(pred_labels, gt_labels, config=config)
+        assert report["fScore"] == pytest.approx(float(row["fScore"]))
+        assert report["multi_value"]["noise"] == pytest.approx(
+            float(row["multi_value.noise"])
+        )
+    dataset = json.loads(capsys.readouterr().out)
+    assert np.mean([float(row["recall"]) for row in rows]) == pytest.approx(
+        dataset["recall"]
+    )
+
+
+def test_cli_resume(tmp_path, capsys):
+    __write_frames(tmp_path, 4)
+    arguments = [
+        "--pred-dir",
+        str(tmp_path / "pred"),
+        "--gt-dir",
+        str(tmp_path / "gt"),
+        "--workers",
+        "0",
+        "--metrics",
+        "precision",
+        "mean_iou",
+    ]
+    main(arguments + ["--output", str(tmp_path / "full.jsonl")])
+    with open(tmp_path / "full.jsonl") as file:
+        lines = file.readlines()
+    # Run interrupted while writing the third frame
+    with open(tmp_path / "resumed.jsonl", "w") as file:
+        file.writelines(lines[:2])
+        file.write(lines[2][:10])
+
+    with pytest.raises(SystemExit):
+        main(arguments + ["--output", str(tmp_path / "resumed.jsonl")])
+    with pytest.raises(SystemExit):
+        main(arguments + ["iou", "--output", str(tmp_path / "other.jsonl")])
+    assert "got iou" in capsys.readouterr().err
+    main(arguments + ["--output", str(tmp_path / "resumed.jsonl"), "--resume"])
+
+    with open(tmp_path / "resumed.jsonl") as file:
+        assert lines == file.readlines()
+    assert "2 frames were already" in capsys.readouterr().err
+
+
+def test_cli_resume_csv(tmp_path, capsys):
+    __write_frames(tmp_path, 3)
+    output = tmp_path / "results.csv"
+    arguments = [
+        "--pred-dir",
+        str(tmp_path / "pred"),
+        "--gt-dir",
+        str(tmp_path / "gt"),
+        "--output",
+        str(output),
+        "--workers",
+        "0",
+        "--metrics",
+        "precision",
+        "mean_iou",
+    ]
+    main(arguments)
+    with open(output) as file:
+        lines = file.readlines()
+    # The first frame lost a value and the last one was not written
+    header = lines[0].strip().split(",")
+    values = lines[1].strip().split(",")
+    values[header.index("mean_iou")] = ""
+    with open(output, "w") as file:
+        file.writelines([lines[0], ",".join(values) + "\n", lines[2]])
+
+    with pytest.raises(AssertionError) as excinfo:
+        main(arguments[:-3] + ["--resume"])
+    assert "resume it with the same --metrics" in str(excinfo.value)
+    capsys.readouterr()
+    main(arguments + ["--resume"])
+
+    assert "1 frames with missing values" in capsys.readouterr().err
+    with open(output) as file:
+        assert 4 == len(file.readlines())
+
+
+def test_cli_frame_names(tmp_path):
+    __write_frames(tmp_path, 2)
+    np.zeros(500, np.uint32).tofile(tmp_path / "gt" / "sequence" / "000.label")
+
+    with pytest.raises(AssertionError) as excinfo:
+        main(
+            [
+                "--pred-dir",
+                str(tmp_path / "pred"),
+                "--gt-dir",
+                str(tmp_path / "gt"),
+                "--output",
+                str(tmp_path / "results.jsonl"),
+            ]
+        )
+    assert "same frame name sequence/000" in str(excinfo.value)
+
+
+def test_cli_manifest(tmp_path):
+    frames = __write_frames(tmp_path, 2)
+    with open(tmp_path / "frames.csv", "w") as file:
+        file.write("# pred,gt,frame\n")
+        file.write("pred/sequence/001.label,gt/sequence/001.npy,second\n")
+        file.write("pred/sequence/000.label,gt/sequence/000.npy\n")
+
+    main(
+        [
+            "--manifest",
+            str(tmp_path / "frames.csv"),
+            "--output",
+            str(tmp_path / "results.jsonl"),
+            "--workers",
+            "1",
+            "--executor",
+            "thread",
+            "--unsegmented-labels",
+            "0",
+            "4",
+        ]
+    )
+
+    with open(tmp_path / "results.jsonl") as file:
+        rows = [json.loads(line) for line in file]
+    assert ["second", "pred/sequence/000.label"] == [row["frame"] for row in rows]
+    pred_labels, gt_labels = frames[1]
+    report = evaluate(
+        pred_labels, gt_labels, config=EvaluationConfig(unsegmented_labels=(0, 4))
+    )
+    assert report["gt_amount"] == rows[0]["gt_amount"]
+    assert report["mean_dice"] == pytest.approx(rows[0]["mean_dice"])
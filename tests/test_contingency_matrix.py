@@ -0,0 +1,81 @@
+# Copyright (c) 2022, Skolkovo Institute of Science and Technology (Skoltech)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import numpy as np
+import pytest
+
+import evops.metrics.constants
+from evops.metrics import ContingencyMatrix
+
+
+def test_contingency_counts():
+    evops.metrics.constants.UNSEGMENTED_LABEL = 0
+
+    pred_labels = np.array([1, 1, 3, 3, 0])
+    gt_labels = np.array([2, 2, 0, 3, 3])
+    contingency = ContingencyMatrix(pred_labels, gt_labels)
+
+    assert [1, 3] == contingency.pred_labels.tolist()
+    assert [2, 3] == contingency.gt_labels.tolist()
+    assert [2, 2] == contingency.pred_sizes.tolist()
+    assert [2, 2] == contingency.gt_sizes.tolist()
+    assert [[2, 0], [0, 1]] == contingency.intersection.tolist()
+
+
+def test_contingency_iou_and_dice():
+    evops.metrics.constants.UNSEGMENTED_LABEL = 0
+
+    pred_labels = np.array([1, 1, 1, 1])
+    gt_labels = np.array([1, 1, 2, 2])
+    contingency = ContingencyMatrix(pred_labels, gt_labels)
+
+    assert [[0.5, 0.5]] == pytest.approx(contingency.iou())
+    assert [[2 / 3, 2 / 3]] == pytest.approx(contingency.dice())
+
+
+def test_contingency_true_positive():
+    evops.metrics.constants.IOU_THRESHOLD = 0.75
+    evops.metrics.constants.UNSEGMENTED_LABEL = 0
+
+    pred_labels = np.array([1, 2, 3, 4])
+    gt_labels = np.array([5, 6, 7, 8])
+    contingency = ContingencyMatrix(pred_labels, gt_labels)
+
+    assert 4 == contingency.true_positive()
+    assert 1 == pytest.approx(contingency.f_score())
+
+
+def test_contingency_size_assert():
+    with pytest.raises(AssertionError) as excinfo:
+        ContingencyMatrix(np.array([1, 2]), np.array([1]))
+
+    assert (
+        str(excinfo.value)
+        == "Predicted and ground truth label arrays must have the same size"
+    )
+
+
+def test_contingency_real_data():
+    evops.metrics.constants.IOU_THRESHOLD = 0.5
+    evops.metrics.constants.UNSEGMENTED_LABEL = 0
+
+    pred_labels = np.load("tests/data/pred_0.npy")
+    gt_labels = np.load("tests/data/gt_0.npy")
+    contingency = ContingencyMatrix(pred_labels, gt_labels)
+    result = contingency.multi_value()
+
+    assert 0.8 == pytest.approx(contingency.precision(), 0.01)
+    assert 0.235 == pytest.approx(contingency.recall(), 0.01)
+    assert 0.87 == pytest.approx(contingency.mean("iou"), 0.01)
+    assert 0.176 == pytest.approx(result["over_segmented"], 0.01)
+    assert 0.76 == pytest.approx(result["missed"], 0.01)
@@ -0,0 +1,77 @@
+# Copyright (c) 2022, Skolkovo Institute of Science and Technology (Skoltech)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import numpy as np
+import pytest
+
+import evops.metrics.constants
+from evops.metrics import (
+    average_precision,
+    multi_value,
+    multi_value_curve,
+    precision,
+    precision_recall_curve,
+    recall,
+)
+
+
+def test_precision_recall_curve_matches_scalar_metrics():
+    evops.metrics.constants.UNSEGMENTED_LABEL = 0
+
+    pred_labels = np.array([1, 1, 1, 1, 2, 2, 3, 3, 3, 0])
+    gt_labels = np.array([1, 1, 1, 2, 2, 2, 3, 3, 0, 0])
+    iou_thresholds = [0.2, 0.5, 0.7, 0.9]
+    curve = precision_recall_curve(pred_labels, gt_labels, "iou", iou_thresholds)
+
+    for index, iou_threshold in enumerate(iou_thresholds):
+        evops.metrics.constants.IOU_THRESHOLD = iou_threshold
+        assert precision(pred_labels, gt_labels, "iou") == pytest.approx(
+            curve["precision"][index]
+        )
+        assert recall(pred_labels, gt_labels, "iou") == pytest.approx(
+            curve["recall"][index]
+        )
+
+
+def test_average_precision():
+    evops.metrics.constants.UNSEGMENTED_LABEL = 0
+
+    pred_labels = np.array([1, 1, 1, 1, 2, 2, 2, 2, 2, 2])
+    gt_labels = np.array([1, 1, 1, 0, 2, 2, 2, 2, 2, 2])
+
+    # Plane 1 has IoU 0.75 and is matched at the first six thresholds
+    assert 0.8 == pytest.approx(average_precision(pred_labels, gt_labels))
+    assert 1 == pytest.approx(average_precision(pred_labels, gt_labels, "iou", [0.5]))
+
+
+def test_multi_value_curve_real_data():
+    evops.metrics.constants.UNSEGMENTED_LABEL = 0
+
+    pred_labels = np.load("tests/data/pred_0.npy")
+    gt_labels = np.load("tests/data/gt_0.npy")
+    overlap_thresholds = [0.3, 0.5, 0.8, 0.95]
+    curve = multi_value_curve(pred_labels, gt_labels, overlap_thresholds)
+
+    for index, overlap_threshold in enumerate(overlap_thresholds):
+        result = multi_value(pred_labels, gt_labels, overlap_threshold)
+        for name, value in result.items():
+            assert value == pytest.approx(curve[name][index])
+
+
+def test_curve_thresholds_assert():
+    with pytest.raises(AssertionError) as excinfo:
+        multi_value_curve(np.array([1, 2]), np.array([1, 2]), [])
+
+    assert (
+        str(excinfo.value) == "Incorrect threshold array size, expected non-empty (n)"
+    )
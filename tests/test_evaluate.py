@@ -0,0 +1,77 @@
+# Copyright (c) 2022, Skolkovo Institute of Science and Technology (Skoltech)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import numpy as np
+import pytest
+
+import evops.metrics.constants
+from evops.metrics import (
+    evaluate,
+    precision,
+    recall,
+    fScore,
+    mean,
+    iou,
+    dice,
+    multi_value,
+)
+
+
+def test_evaluate_matches_single_metrics():
+    evops.metrics.constants.IOU_THRESHOLD = 0.5
+    evops.metrics.constants.UNSEGMENTED_LABEL = 0
+
+    pred_labels = np.load("tests/data/pred_0.npy")
+    gt_labels = np.load("tests/data/gt_0.npy")
+    report = evaluate(pred_labels, gt_labels)
+
+    assert precision(pred_labels, gt_labels, "iou") == pytest.approx(
+        report["precision"]
+    )
+    assert recall(pred_labels, gt_labels, "iou") == pytest.approx(report["recall"])
+    assert fScore(pred_labels, gt_labels, "iou") == pytest.approx(report["fScore"])
+    assert mean(pred_labels, gt_labels, iou) == pytest.approx(report["mean_iou"])
+    assert mean(pred_labels, gt_labels, dice) == pytest.approx(report["mean_dice"])
+    assert multi_value(pred_labels, gt_labels) == pytest.approx(report["multi_value"])
+
+
+def test_evaluate_plane_counts():
+    evops.metrics.constants.IOU_THRESHOLD = 0.75
+    evops.metrics.constants.UNSEGMENTED_LABEL = 0
+
+    pred_labels = np.array([1, 1, 3, 3])
+    gt_labels = np.array([2, 2, 0, 3])
+    report = evaluate(pred_labels, gt_labels)
+
+    assert 1 == report["true_positive"]
+    assert 2 == report["predicted_amount"]
+    assert 2 == report["gt_amount"]
+
+
+def test_evaluate_unsegmented_only():
+    evops.metrics.constants.UNSEGMENTED_LABEL = 0
+
+    pred_labels = np.array([0, 0, 0, 0])
+    gt_labels = np.array([1, 1, 1, 1])
+    report = evaluate(pred_labels, gt_labels)
+
+    assert 0 == report["precision"]
+    assert 0 == report["fScore"]
+    assert 0 == report["mean_iou"]
+
+
+def test_evaluate_tp_condition_assert():
+    with pytest.raises(AssertionError) as excinfo:
+        evaluate(np.array([1, 2]), np.array([1, 2]), "dice")
+
+    assert str(excinfo.value) == "Incorrect name of tp condition"
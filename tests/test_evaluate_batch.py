@@ -0,0 +1,81 @@
+# Copyright (c) 2022, Skolkovo Institute of Science and Technology (Skoltech)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import numpy as np
+import pytest
+
+import evops.metrics.constants
+from evops.metrics import evaluate, evaluate_batch
+
+
+def test_evaluate_batch_matches_evaluate():
+    evops.metrics.constants.IOU_THRESHOLD = 0.5
+    evops.metrics.constants.UNSEGMENTED_LABEL = 0
+
+    pred_frames = [
+        np.load("tests/data/pred_0.npy"),
+        np.array([1, 1, 3, 3]),
+        np.array([1, 2, 1, 2]),
+    ]
+    gt_frames = [
+        np.load("tests/data/gt_0.npy"),
+        np.array([2, 2, 0, 3]),
+        np.array([1, 1, 1, 1]),
+    ]
+    report = evaluate_batch(pred_frames, gt_frames)
+
+    for index, (pred_labels, gt_labels) in enumerate(zip(pred_frames, gt_frames)):
+        frame_report = evaluate(pred_labels, gt_labels)
+        for name in ("precision", "recall", "fScore", "mean_iou", "mean_dice"):
+            assert frame_report[name] == pytest.approx(report["frames"][name][index])
+        for name, value in frame_report["multi_value"].items():
+            assert value == pytest.approx(report["frames"]["multi_value"][name][index])
+
+
+def test_evaluate_batch_frame_offsets():
+    evops.metrics.constants.IOU_THRESHOLD = 0.75
+    evops.metrics.constants.UNSEGMENTED_LABEL = 0
+
+    pred_frames = [np.array([1, 2, 3, 4]), np.array([1, 1, 1, 1])]
+    gt_frames = [np.array([5, 6, 7, 8]), np.array([1, 2, 3, 4])]
+    report = evaluate_batch(
+        np.concatenate(pred_frames), np.concatenate(gt_frames), np.array([0, 4, 8])
+    )
+
+    assert [1, 0] == pytest.approx(report["frames"]["recall"])
+    assert [4, 1] == report["frames"]["predicted_amount"].tolist()
+    assert 0.5 == pytest.approx(report["dataset"]["recall"])
+    assert 0.5 == pytest.approx(report["dataset"]["micro"]["recall"])
+    assert 0.8 == pytest.approx(report["dataset"]["micro"]["precision"])
+
+
+def test_evaluate_batch_empty_frame():
+    evops.metrics.constants.UNSEGMENTED_LABEL = 0
+
+    report = evaluate_batch(
+        [np.array([1, 1]), np.array([], np.int64), np.array([0, 0])],
+        [np.array([1, 1]), np.array([], np.int64), np.array([1, 1])],
+    )
+
+    assert [1, 0, 0] == pytest.approx(report["frames"]["precision"])
+    assert [1, 0, 1] == report["frames"]["gt_amount"].tolist()
+
+
+def test_evaluate_batch_frame_offsets_assert():
+    with pytest.raises(AssertionError) as excinfo:
+        evaluate_batch(np.array([1, 2, 3]), np.array([1, 2, 3]), np.array([0, 2]))
+
+    assert (
+        str(excinfo.value)
+        == "Incorrect frame offsets, expected non-decreasing array from 0 to label array size"
+    )
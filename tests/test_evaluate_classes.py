@@ -0,0 +1,121 @@
+# Copyright (c) 2022, Skolkovo Institute of Science and Technology (Skoltech)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import numpy as np
+import pytest
+
+from evops.metrics import (
+    EvaluationConfig,
+    GroundTruth,
+    evaluate,
+    evaluate_batch,
+    evaluate_classes,
+)
+
+config = EvaluationConfig(unsegmented_labels=0, iou_threshold=0.5)
+
+
+def __scene(seed: int):
+    generator = np.random.default_rng(seed)
+    gt_labels = np.repeat(np.arange(0, 12), 200)
+    pred_labels = gt_labels.copy()
+    changed = generator.random(gt_labels.size) < 0.3
+    pred_labels[changed] = generator.integers(0, 15, changed.sum())
+    label_classes = {
+        label: ("floor", "wall", "ceiling")[label % 3] for label in range(1, 12)
+    }
+
+    return pred_labels, gt_labels, label_classes
+
+
+def __class_frames(pred_labels, gt_labels, point_classes, names):
+    # Every class frame holds all points, the points outside of the class are
+    # unsegmented and only planes overlapping the class or unclassified points stay
+    pred_frames, gt_frames = [], []
+    for name in names:
+        frame_points = (point_classes == name) | (point_classes == "")
+        pred_frames.append(
+            np.where(np.isin(pred_labels, pred_labels[frame_points]), pred_labels, 0)
+        )
+        gt_frames.append(np.where(point_classes == name, gt_labels, 0))
+
+    return pred_frames, gt_frames
+
+
+def test_evaluate_classes_of_points():
+    pred_labels, gt_labels, label_classes = __scene(0)
+    point_classes = np.array(
+        [label_classes.get(label, "floor") for label in gt_labels.tolist()]
+    )
+
+    result = evaluate_classes(pred_labels, gt_labels, point_classes, config=config)
+    expected = evaluate_batch(
+        *__class_frames(
+            pred_labels, gt_labels, point_classes, ("ceiling", "floor", "wall")
+        ),
+        config=config,
+    )
+
+    assert ["ceiling", "floor", "wall"] == result["classes"].tolist()
+    for metric in ("precision", "recall", "fScore", "mean_iou", "true_positive"):
+        assert expected["frames"][metric] == pytest.approx(result["per_class"][metric])
+    assert expected["frames"]["multi_value"]["noise"] == pytest.approx(
+        result["per_class"]["multi_value"]["noise"]
+    )
+    assert expected["dataset"]["micro"]["fScore"] == pytest.approx(
+        result["dataset"]["micro"]["fScore"]
+    )
+    assert expected["dataset"]["recall"] == pytest.approx(result["dataset"]["recall"])
+
+
+def test_evaluate_classes_of_labels():
+    pred_labels, gt_labels, label_classes = __scene(1)
+
+    result = evaluate_classes(
+        pred_labels, GroundTruth(gt_labels), label_classes, config=config
+    )
+    point_classes = np.array(
+        [label_classes.get(label, "") for label in gt_labels.tolist()]
+    )
+    expected = evaluate_batch(
+        *__class_frames(
+            pred_labels, gt_labels, point_classes, ("ceiling", "floor", "wall")
+        ),
+        config=config,
+    )
+
+    assert ["ceiling", "floor", "wall"] == result["classes"].tolist()
+    for metric in ("precision", "mean_iou", "true_positive", "predicted_amount"):
+        assert expected["frames"][metric] == pytest.approx(result["per_class"][metric])
+    assert [4, 3, 4] == result["per_class"]["gt_amount"].tolist()
+
+
+def test_evaluate_classes_with_unsegmented_points():
+    pred_labels = np.array([1, 1, 1, 2, 2, 2, 3, 3])
+    gt_labels = np.array([1, 1, 1, 1, 0, 0, 0, 0])
+
+    result = evaluate_classes(pred_labels, gt_labels, {1: "wall"}, config=config)
+    expected = evaluate(pred_labels, gt_labels, config=config)
+
+    assert [3] == result["per_class"]["predicted_amount"].tolist()
+    for metric in ("precision", "recall", "mean_iou", "mean_dice"):
+        assert expected[metric] == pytest.approx(result["per_class"][metric][0])
+
+
+def test_evaluate_classes_asserts():
+    with pytest.raises(AssertionError) as excinfo:
+        evaluate_classes(np.ones(4), np.ones(4), np.ones(3))
+    assert str(excinfo.value) == (
+        "Incorrect class array size, expected a class of every point "
+        "or a dictionary of classes of labels"
+    )
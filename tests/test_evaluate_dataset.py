@@ -0,0 +1,75 @@
+# Copyright (c) 2022, Skolkovo Institute of Science and Technology (Skoltech)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import numpy as np
+import pytest
+
+import evops.metrics.constants
+from evops.metrics import evaluate_batch, evaluate_dataset, iterate_dataset
+
+
+def __random_frames(frames_amount):
+    generator = np.random.default_rng(0)
+    pred_frames = [generator.integers(0, 4, 50) for _ in range(frames_amount)]
+    gt_frames = [np.sort(generator.integers(0, 4, 50)) for _ in range(frames_amount)]
+
+    return pred_frames, gt_frames
+
+
+def test_evaluate_dataset_independent_of_workers():
+    evops.metrics.constants.IOU_THRESHOLD = 0.25
+    evops.metrics.constants.UNSEGMENTED_LABEL = 0
+
+    pred_frames, gt_frames = __random_frames(20)
+    inline_report = evaluate_dataset(pred_frames, gt_frames, workers=0)
+    process_report = evaluate_dataset(pred_frames, gt_frames, workers=3, chunk_size=2)
+
+    for name in ("precision", "recall", "fScore", "mean_iou", "mean_dice"):
+        assert inline_report["frames"][name].tolist() == (
+            process_report["frames"][name].tolist()
+        )
+        assert inline_report["dataset"][name] == process_report["dataset"][name]
+
+
+def test_evaluate_dataset_matches_batch():
+    evops.metrics.constants.IOU_THRESHOLD = 0.25
+    evops.metrics.constants.UNSEGMENTED_LABEL = 0
+
+    pred_frames, gt_frames = __random_frames(10)
+    report = evaluate_dataset(pred_frames, gt_frames, workers=2, executor="thread")
+    batch_report = evaluate_batch(pred_frames, gt_frames)
+
+    assert batch_report["frames"]["recall"] == pytest.approx(report["frames"]["recall"])
+    for name in ("precision", "recall", "fScore"):
+        assert batch_report["dataset"]["micro"][name] == pytest.approx(
+            report["dataset"]["micro"][name]
+        )
+
+
+def test_iterate_dataset_keeps_order():
+    evops.metrics.constants.UNSEGMENTED_LABEL = 0
+
+    pred_frames = (np.arange(1, size + 1) for size in range(1, 30))
+    gt_frames = (np.ones(size, np.int64) for size in range(1, 30))
+    reports = iterate_dataset(
+        pred_frames, gt_frames, metrics=["mean_iou"], workers=4, executor="thread"
+    )
+
+    assert list(range(1, 30)) == [report["predicted_amount"] for report in reports]
+
+
+def test_evaluate_dataset_metric_assert():
+    with pytest.raises(AssertionError) as excinfo:
+        evaluate_dataset([np.array([1])], [np.array([1])], metrics=["iou"])
+
+    assert str(excinfo.value).startswith("Incorrect metric name")
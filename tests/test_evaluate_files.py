@@ -0,0 +1,107 @@
+# Copyright (c) 2022, Skolkovo Institute of Science and Technology (Skoltech)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import numpy as np
+import pytest
+
+from evops.metrics import EvaluationConfig, evaluate_batch, evaluate_files
+
+
+def test_evaluate_label_files(tmp_path):
+    pred_labels = np.load("tests/data/pred_0.npy").astype(np.uint32)
+    gt_labels = np.load("tests/data/gt_0.npy").astype(np.uint32)
+    pred_labels.tofile(tmp_path / "pred.label")
+    gt_labels.tofile(tmp_path / "gt.label")
+    config = EvaluationConfig(unsegmented_labels=0, iou_threshold=0.5)
+    expected = evaluate_batch([pred_labels], [gt_labels], config=config)
+    result = evaluate_files(
+        tmp_path / "pred.label",
+        tmp_path / "gt.label",
+        chunk_points=10000,
+        config=config,
+    )
+
+    assert expected["frames"]["true_positive"].tolist() == (
+        result["frames"]["true_positive"].tolist()
+    )
+    assert expected["frames"]["mean_dice"] == pytest.approx(
+        result["frames"]["mean_dice"]
+    )
+    assert expected["frames"]["multi_value"]["missed"] == pytest.approx(
+        result["frames"]["multi_value"]["missed"]
+    )
+
+
+def test_evaluate_label_fields(tmp_path):
+    instance_labels = np.repeat(np.arange(1, 5, dtype=np.uint32), 100) << 16
+    (instance_labels | 10).tofile(tmp_path / "pred.label")
+    (instance_labels | 20).tofile(tmp_path / "gt.label")
+    config = EvaluationConfig(unsegmented_labels=0, iou_threshold=0.5)
+
+    instance = evaluate_files(
+        [tmp_path / "pred.label"],
+        [tmp_path / "gt.label"],
+        label_field="instance",
+        chunk_points=64,
+        config=config,
+    )
+    semantic = evaluate_files(
+        [tmp_path / "pred.label"],
+        [tmp_path / "gt.label"],
+        label_field="semantic",
+        config=config,
+    )
+
+    assert 4 == instance["dataset"]["true_positive"]
+    assert 1 == pytest.approx(instance["dataset"]["precision"])
+    assert 1 == semantic["dataset"]["true_positive"]
+
+
+def test_evaluate_npy_and_memmap_frames(tmp_path):
+    generator = np.random.default_rng(0)
+    pred_frames = [generator.integers(0, 5, size) for size in (1000, 0, 300)]
+    gt_frames = [labels // 2 for labels in pred_frames]
+    for index, (pred_labels, gt_labels) in enumerate(zip(pred_frames, gt_frames)):
+        np.save(tmp_path / "pred_{}.npy".format(index), pred_labels)
+        np.save(tmp_path / "gt_{}.npy".format(index), gt_labels)
+    config = EvaluationConfig(unsegmented_labels=0, iou_threshold=0.3)
+    expected = evaluate_batch(pred_frames, gt_frames, config=config)
+    result = evaluate_files(
+        [tmp_path / "pred_{}.npy".format(index) for index in range(3)],
+        [
+            np.load(tmp_path / "gt_{}.npy".format(index), mmap_mode="r")
+            for index in range(3)
+        ],
+        chunk_points=128,
+        config=config,
+    )
+
+    assert expected["frames"]["recall"] == pytest.approx(result["frames"]["recall"])
+    assert expected["dataset"]["micro"]["fScore"] == pytest.approx(
+        result["dataset"]["micro"]["fScore"]
+    )
+
+
+def test_evaluate_files_asserts(tmp_path):
+    with pytest.raises(AssertionError) as excinfo:
+        evaluate_files([np.zeros(3)], [], label_field="instance")
+    assert (
+        str(excinfo.value) == "Predicted and ground truth frame amounts must be equal"
+    )
+
+    with pytest.raises(AssertionError) as excinfo:
+        evaluate_files(np.zeros(3), np.zeros(3), label_field="rgb")
+    assert (
+        str(excinfo.value)
+        == "Incorrect label field, expected full, semantic or instance"
+    )
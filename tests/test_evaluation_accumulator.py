@@ -0,0 +1,104 @@
+# Copyright (c) 2022, Skolkovo Institute of Science and Technology (Skoltech)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import numpy as np
+import pytest
+
+from evops.metrics import EvaluationAccumulator, EvaluationConfig, evaluate_batch
+
+
+def __random_frames(frames_amount: int):
+    generator = np.random.default_rng(0)
+    pred_frames = [
+        generator.integers(0, 8, generator.integers(1, 500))
+        for _ in range(frames_amount)
+    ]
+    gt_frames = [
+        np.where(generator.random(labels.size) < 0.7, labels, labels // 2)
+        for labels in pred_frames
+    ]
+
+    return pred_frames, gt_frames
+
+
+def test_accumulator_matches_batch():
+    pred_frames, gt_frames = __random_frames(6)
+    config = EvaluationConfig(iou_threshold=0.5)
+    accumulator = EvaluationAccumulator(config)
+    for pred_labels, gt_labels in zip(pred_frames, gt_frames):
+        accumulator.add_frame(pred_labels, gt_labels)
+    expected = evaluate_batch(pred_frames, gt_frames, config=config)
+    result = accumulator.report()
+
+    assert 6 == accumulator.frames_amount
+    assert expected["frames"]["true_positive"].tolist() == (
+        result["frames"]["true_positive"].tolist()
+    )
+    assert expected["frames"]["mean_iou"] == pytest.approx(result["frames"]["mean_iou"])
+    assert expected["dataset"]["micro"]["recall"] == pytest.approx(
+        result["dataset"]["micro"]["recall"]
+    )
+
+
+def test_accumulator_chunks_in_any_order():
+    pred_frames, gt_frames = __random_frames(1)
+    pred_labels, gt_labels = pred_frames[0], gt_frames[0]
+    accumulator = EvaluationAccumulator(unsegmented_labels=0, iou_threshold=0.3)
+    for start in [300, 0, 100]:
+        accumulator.add_chunk(
+            pred_labels[start : start + 100], gt_labels[start : start + 100], start
+        )
+    accumulator.add_chunk(pred_labels[200:300], gt_labels[200:300], 200)
+    accumulator.add_chunk(pred_labels[400:], gt_labels[400:])
+    accumulator.end_frame()
+    expected = evaluate_batch(
+        pred_frames, gt_frames, config=EvaluationConfig(iou_threshold=0.3)
+    )
+    result = accumulator.report()
+
+    for name, value in expected["frames"]["multi_value_counts"].items():
+        assert value.tolist() == result["frames"]["multi_value_counts"][name].tolist()
+    assert expected["frames"]["precision"] == pytest.approx(
+        result["frames"]["precision"]
+    )
+
+
+def test_accumulator_running_report():
+    accumulator = EvaluationAccumulator(unsegmented_labels=0, iou_threshold=0.5)
+
+    assert 0 == accumulator.report()["dataset"]["predicted_amount"]
+
+    accumulator.add_frame(np.array([1, 1, 2, 2]), np.array([1, 1, 2, 2]))
+    assert 1 == pytest.approx(accumulator.report()["dataset"]["precision"])
+
+    accumulator.add_frame(np.array([1, 1, 1, 1]), np.array([1, 2, 3, 4]))
+    result = accumulator.report()
+    assert [2, 0] == result["frames"]["true_positive"].tolist()
+    assert 0.5 == pytest.approx(result["dataset"]["precision"])
+    assert 2 / 3 == pytest.approx(result["dataset"]["micro"]["precision"])
+
+
+def test_accumulator_chunk_asserts():
+    accumulator = EvaluationAccumulator(unsegmented_labels=0)
+    accumulator.add_chunk(np.array([1, 1, 2]), np.array([1, 1, 2]), 10)
+
+    with pytest.raises(AssertionError) as excinfo:
+        accumulator.add_chunk(np.array([1, 2]), np.array([1, 2]), 11)
+    assert str(excinfo.value) == "Chunk points overlap points added before"
+
+    with pytest.raises(AssertionError) as excinfo:
+        accumulator.add_frame(np.array([1, 2]), np.array([1, 2]))
+    assert (
+        str(excinfo.value)
+        == "Frame added in chunks is not finished, call end_frame() first"
+    )
@@ -0,0 +1,79 @@
+# Copyright (c) 2022, Skolkovo Institute of Science and Technology (Skoltech)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+import evops.metrics.constants
+from evops.metrics import EvaluationConfig, Evaluator, evaluate
+
+
+def test_config_from_constants():
+    evops.metrics.constants.IOU_THRESHOLD = 0.5
+    evops.metrics.constants.UNSEGMENTED_LABEL = -1
+
+    config = EvaluationConfig.from_constants(matching="optimal")
+
+    assert (-1,) == config.unsegmented_labels
+    assert 0.5 == config.iou_threshold
+    assert "optimal" == config.matching
+    assert (0, 1) == config.replace(unsegmented_labels=[0, 1]).unsegmented_labels
+
+
+def test_config_ignores_constants():
+    evops.metrics.constants.IOU_THRESHOLD = 0.9
+    evops.metrics.constants.UNSEGMENTED_LABEL = 1
+
+    pred_labels = np.array([1, 1, 2, 2, 2, 0])
+    gt_labels = np.array([1, 1, 2, 2, 0, 0])
+    config = EvaluationConfig(unsegmented_labels=0, iou_threshold=0.5)
+    result = evaluate(pred_labels, gt_labels, config=config)
+
+    assert 2 == result["predicted_amount"]
+    assert 1 == pytest.approx(result["precision"])
+
+
+def test_multiple_unsegmented_labels():
+    pred_labels = np.array([1, 1, 2, 2, 3, 3])
+    gt_labels = np.array([1, 1, 2, 2, 3, 3])
+    evaluator = Evaluator(unsegmented_labels=(0, 3), iou_threshold=0.5)
+    result = evaluator.evaluate(pred_labels, gt_labels)
+    contingency = evaluator.contingency(pred_labels, gt_labels)
+
+    assert [1, 2] == contingency.pred_labels.tolist()
+    assert [1, 2] == contingency.gt_labels.tolist()
+    assert 2 == result["gt_amount"]
+    assert 1 == pytest.approx(result["recall"])
+
+
+def test_concurrent_evaluators():
+    pred_labels = np.array([1, 1, 1, 1, 2, 2, 0, 0])
+    gt_labels = np.array([1, 1, 1, 0, 0, 2, 2, 2])
+    evaluators = [
+        Evaluator(EvaluationConfig(iou_threshold=iou_threshold))
+        for iou_threshold in (0.2, 0.5, 0.8)
+    ] * 20
+
+    with ThreadPoolExecutor(4) as pool:
+        results = list(
+            pool.map(
+                lambda evaluator: evaluator.evaluate(pred_labels, gt_labels)[
+                    "true_positive"
+                ],
+                evaluators,
+            )
+        )
+
+    assert [2, 1, 0] * 20 == results
@@ -0,0 +1,99 @@
+# Copyright (c) 2022, Skolkovo Institute of Science and Technology (Skoltech)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import gc
+
+import numpy as np
+import pytest
+
+import evops.metrics.constants
+from evops.metrics import (
+    GroundTruth,
+    evaluate,
+    fScore,
+    match,
+    mean,
+    multi_value,
+    precision_recall_curve,
+)
+
+
+def __random_labels(seed: int, labels_amount: int = 8):
+    generator = np.random.default_rng(seed)
+    return generator.integers(0, labels_amount, 2000) * 3
+
+
+def test_ground_truth_metrics():
+    evops.metrics.constants.IOU_THRESHOLD = 0.5
+    evops.metrics.constants.UNSEGMENTED_LABEL = 0
+    gt_labels = __random_labels(0, 4)
+    ground_truth = GroundTruth(gt_labels)
+
+    assert gt_labels.tolist() == ground_truth.labels_array().tolist()
+    for seed in range(1, 4):
+        pred_labels = np.minimum(gt_labels, __random_labels(seed))
+        assert fScore(pred_labels, ground_truth, "iou") == pytest.approx(
+            fScore(pred_labels, gt_labels, "iou")
+        )
+        assert multi_value(pred_labels, ground_truth) == pytest.approx(
+            multi_value(pred_labels, gt_labels)
+        )
+        assert evaluate(pred_labels, ground_truth)["mean_dice"] == pytest.approx(
+            evaluate(pred_labels, gt_labels)["mean_dice"]
+        )
+        for curve, expected in zip(
+            precision_recall_curve(pred_labels, ground_truth),
+            precision_recall_curve(pred_labels, gt_labels),
+        ):
+            assert curve == pytest.approx(expected)
+        assert [array.tolist() for array in match(pred_labels, ground_truth)] == [
+            array.tolist() for array in match(pred_labels, gt_labels)
+        ]
+
+
+def test_ground_truth_custom_mean():
+    evops.metrics.constants.UNSEGMENTED_LABEL = 0
+    gt_labels = __random_labels(0)
+    pred_labels = __random_labels(1)
+
+    def overlap(pred_indices, gt_indices):
+        return np.intersect1d(pred_indices, gt_indices).size / gt_indices.size
+
+    assert mean(pred_labels, GroundTruth(gt_labels), overlap) == pytest.approx(
+        mean(pred_labels, gt_labels, overlap)
+    )
+
+
+def test_ground_truth_cache():
+    GroundTruth.clear_cache()
+    gt_labels = __random_labels(0)
+
+    ground_truth = GroundTruth.of(gt_labels)
+
+    assert ground_truth is GroundTruth.of(gt_labels)
+    assert ground_truth is GroundTruth.of(ground_truth)
+    assert ground_truth is not GroundTruth.of(gt_labels.copy())
+
+    del gt_labels
+    gc.collect()
+    assert ground_truth is not GroundTruth.of(__random_labels(0))
+
+
+def test_ground_truth_cache_size():
+    GroundTruth.clear_cache()
+    arrays = [__random_labels(seed) for seed in range(40)]
+
+    encodings = [GroundTruth.of(gt_labels) for gt_labels in arrays]
+
+    assert encodings[-1] is GroundTruth.of(arrays[-1])
+    assert encodings[0] is not GroundTruth.of(arrays[0])
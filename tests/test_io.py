@@ -0,0 +1,197 @@
+# Copyright (c) 2022, Skolkovo Institute of Science and Technology (Skoltech)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+from evops.io import read_labels, write_labels
+from evops.metrics import EvaluationConfig, evaluate, evaluate_files
+
+
+def __write_pcd(path, labels, data):
+    points = np.zeros(
+        labels.size,
+        [("x", "<f4"), ("y", "<f4"), ("z", "<f4"), ("_", "u1", 4), ("label", "<u4")],
+    )
+    points["x"] = np.arange(labels.size)
+    points["label"] = labels
+    header = (
+        "# .PCD v0.7 - Point Cloud Data file format\n"
+        "VERSION 0.7\nFIELDS x y z _ label\nSIZE 4 4 4 1 4\nTYPE F F F U U\n"
+        "COUNT 1 1 1 4 1\nWIDTH {0}\nHEIGHT 1\nVIEWPOINT 0 0 0 1 0 0 0\n"
+        "POINTS {0}\nDATA {1}\n".format(labels.size, data)
+    )
+    with open(path, "wb") as file:
+        file.write(header.encode("ascii"))
+        if data == "binary":
+            points.tofile(file)
+        else:
+            for point in points:
+                file.write(
+                    "{} 0 0 0 0 0 0 {}\n".format(point["x"], point["label"]).encode()
+                )
+
+
+def __write_pcd_colors(path, colors, data):
+    points = np.zeros(
+        len(colors), [("x", "<f4"), ("red", "u1"), ("green", "u1"), ("blue", "u1")]
+    )
+    points["red"], points["green"], points["blue"] = np.transpose(colors)
+    header = (
+        "VERSION 0.7\nFIELDS x red green blue\nSIZE 4 1 1 1\nTYPE F U U U\n"
+        "COUNT 1 1 1 1\nWIDTH {0}\nHEIGHT 1\nPOINTS {0}\nDATA {1}\n"
+    ).format(len(colors), data)
+    with open(path, "wb") as file:
+        file.write(header.encode("ascii"))
+        if data == "binary":
+            points.tofile(file)
+        else:
+            for point in points:
+                file.write(" ".join(str(value) for value in point).encode() + b"\n")
+
+
+def __write_ply(path, colors, data):
+    vertices = np.zeros(
+        len(colors),
+        [("x", "f4"), ("red", "u1"), ("green", "u1"), ("blue", "u1"), ("y", "f8")],
+    )
+    vertices["red"], vertices["green"], vertices["blue"] = np.transpose(colors)
+    header = (
+        "ply\nformat {} 1.0\ncomment labels as colors\nelement vertex {}\n"
+        "property float x\nproperty uchar red\nproperty uchar green\n"
+        "property uchar blue\nproperty double y\nelement face 0\n"
+        "property list uchar int vertex_indices\nend_header\n"
+    ).format(data, len(colors))
+    with open(path, "wb") as file:
+        file.write(header.encode("ascii"))
+        if data == "ascii":
+            for vertex in vertices:
+                file.write(" ".join(str(value) for value in vertex).encode() + b"\n")
+        else:
+            byte_order = "<" if data == "binary_little_endian" else ">"
+            vertices.astype(vertices.dtype.newbyteorder(byte_order)).tofile(file)
+
+
+def test_read_binary_and_text_labels(tmp_path):
+    labels = np.array([0, 5, 5, 70000, 3], np.uint32)
+    labels.tofile(tmp_path / "labels.label")
+    np.save(tmp_path / "labels.npy", labels)
+    np.savetxt(tmp_path / "labels.txt", labels, fmt="%d")
+    np.savetxt(tmp_path / "points.txt", np.c_[np.ones((5, 3)) / 3, labels])
+    np.savetxt(tmp_path / "points.csv", np.c_[labels, np.zeros(5)], delimiter=",")
+    np.savetxt(
+        tmp_path / "header.csv",
+        np.c_[np.zeros((5, 3)), labels],
+        fmt="%d",
+        delimiter=",",
+        header="x,y,z,label",
+        comments="",
+    )
+
+    for name, column in (
+        ("labels.label", -1),
+        ("labels.npy", -1),
+        ("labels.txt", -1),
+        ("points.txt", 3),
+        ("points.csv", 0),
+        ("header.csv", -1),
+    ):
+        result = read_labels(tmp_path / name, column=column)
+        assert np.issubdtype(result.dtype, np.integer)
+        assert labels.tolist() == result.tolist()
+
+
+@pytest.mark.parametrize("data", ["ascii", "binary"])
+def test_read_pcd(tmp_path, data):
+    labels = np.array([1, 1, 0, 4294967295, 2], np.uint32)
+    __write_pcd(tmp_path / "frame.pcd", labels, data)
+
+    result = read_labels(tmp_path / "frame.pcd")
+
+    assert labels.tolist() == result.tolist()
+    if data == "binary":
+        assert isinstance(result.base, np.memmap)
+    with pytest.raises(AssertionError):
+        read_labels(tmp_path / "frame.pcd", field="instance")
+
+
+@pytest.mark.parametrize("data", ["ascii", "binary_little_endian", "binary_big_endian"])
+def test_read_ply_colors(tmp_path, data):
+    colors = [[255, 0, 0], [0, 0, 0], [255, 0, 0], [1, 2, 3]]
+    __write_ply(tmp_path / "frame.ply", colors, data)
+
+    assert [0xFF0000, 0, 0xFF0000, 0x010203] == read_labels(
+        tmp_path / "frame.ply"
+    ).tolist()
+
+
+@pytest.mark.parametrize("data", ["ascii", "binary"])
+def test_read_pcd_color_channels(tmp_path, data):
+    colors = [[255, 0, 0], [0, 0, 0], [255, 0, 0], [1, 2, 3]]
+    __write_pcd_colors(tmp_path / "frame.pcd", colors, data)
+
+    assert [0xFF0000, 0, 0xFF0000, 0x010203] == read_labels(
+        tmp_path / "frame.pcd"
+    ).tolist()
+
+
+def test_label_cache(tmp_path):
+    labels = np.array([3, 0, 3, 200], np.int64)
+    np.savetxt(tmp_path / "labels.txt", labels, fmt="%d")
+
+    result = read_labels(tmp_path / "labels.txt", cache_directory=tmp_path / "cache")
+    cached = list((tmp_path / "cache").iterdir())
+
+    assert 1 == len(cached)
+    assert np.uint8 == result.dtype
+    assert labels.tolist() == result.tolist()
+    assert (
+        labels.tolist()
+        == read_labels(
+            tmp_path / "labels.txt", cache_directory=tmp_path / "cache"
+        ).tolist()
+    )
+    assert cached == list((tmp_path / "cache").iterdir())
+
+    write_labels(tmp_path / "negative.npy", np.array([-1, 100, 5]))
+    assert np.int8 == np.load(tmp_path / "negative.npy").dtype
+
+
+def test_label_cache_concurrent_writers(tmp_path):
+    labels = np.arange(100000) % 300
+
+    with ThreadPoolExecutor(8) as pool:
+        list(
+            pool.map(lambda _: write_labels(tmp_path / "labels.npy", labels), range(32))
+        )
+
+    assert ["labels.npy"] == [path.name for path in tmp_path.iterdir()]
+    assert labels.tolist() == np.load(tmp_path / "labels.npy").tolist()
+
+
+def test_evaluate_pcd_files(tmp_path):
+    pred_labels = np.load("tests/data/pred_0.npy").astype(np.uint32)
+    gt_labels = np.load("tests/data/gt_0.npy").astype(np.uint32)
+    __write_pcd(tmp_path / "pred.pcd", pred_labels, "binary")
+    __write_pcd(tmp_path / "gt.pcd", gt_labels, "binary")
+    config = EvaluationConfig(unsegmented_labels=0, iou_threshold=0.5)
+
+    result = evaluate_files(
+        tmp_path / "pred.pcd", tmp_path / "gt.pcd", chunk_points=10000, config=config
+    )
+
+    assert evaluate(pred_labels, gt_labels, config=config)["fScore"] == pytest.approx(
+        result["dataset"]["fScore"]
+    )
@@ -0,0 +1,87 @@
+# Copyright (c) 2022, Skolkovo Institute of Science and Technology (Skoltech)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import numpy as np
+import pytest
+
+import evops.metrics.constants
+from evops.metrics import EvaluationConfig, LabelEncoder, evaluate, match, pack_rgb
+
+
+def test_encode_instance_hashes():
+    hashes = np.array(
+        [2**63 + 5, 7, 2**63 + 5, 2**40, 0, 7, 2**40], dtype=np.uint64
+    )
+
+    encoder = LabelEncoder()
+    codes = encoder.fit_transform(hashes)
+
+    assert [3, 1, 3, 2, 0, 1, 2] == codes.tolist()
+    assert 4 == encoder.codes_amount
+    assert hashes.tolist() == encoder.inverse_transform(codes).tolist()
+    assert codes.tolist() == encoder.transform(hashes).tolist()
+
+
+def test_encode_dense_labels_above_int64():
+    labels = np.array([2**63 + 2, 2**63 + 1, 0, 2**63 + 2], dtype=np.uint64)
+
+    encoder = LabelEncoder(0).fit(np.array([2**63 + 1, 2**63 + 2], np.uint64))
+
+    assert [2, 1, 0, 2] == encoder.transform(labels).tolist()
+    assert [0, 0] == encoder.transform(np.array([0, 0], np.int8)).tolist()
+
+
+def test_encode_negative_labels_with_lookup():
+    encoder = LabelEncoder(unsegmented_labels=[-1, 100]).fit(
+        np.array([-1, -5, 3]), np.array([3, 4, 100])
+    )
+
+    assert [0, 1, 2, 3, 0] == encoder.transform(np.array([-1, -5, 3, 4, 100])).tolist()
+    with pytest.raises(AssertionError):
+        encoder.transform(np.array([2]))
+
+
+def test_encode_colors():
+    colors = np.array([[255, 0, 0], [0, 0, 0], [0, 128, 255], [255, 0, 0]])
+
+    assert [0xFF0000, 0, 0x0080FF, 0xFF0000] == pack_rgb(colors).tolist()
+    assert pack_rgb(colors).tolist() == pack_rgb(colors / 255).tolist()
+    assert (
+        pack_rgb(colors).tolist()
+        == pack_rgb(pack_rgb(colors).view(np.float32)).tolist()
+    )
+    assert [2, 0, 1, 2] == LabelEncoder().fit_transform(colors).tolist()
+
+
+def test_metrics_of_encoded_labels():
+    evops.metrics.constants.IOU_THRESHOLD = 0.5
+    evops.metrics.constants.UNSEGMENTED_LABEL = 0
+    generator = np.random.default_rng(0)
+    pred_labels = generator.integers(0, 6, 1000).astype(np.uint64) << np.uint64(40)
+    gt_labels = generator.integers(0, 4, 1000) * 7 - 3
+
+    pred_encoder = LabelEncoder()
+    gt_encoder = LabelEncoder(unsegmented_labels=-3)
+    pred_codes = pred_encoder.fit_transform(pred_labels)
+    gt_codes = gt_encoder.fit_transform(gt_labels)
+
+    encoded = evaluate(pred_codes, gt_codes)
+    original = evaluate(
+        pred_labels, gt_labels, config=EvaluationConfig(unsegmented_labels=(0, -3))
+    )
+    for metric in ("precision", "recall", "mean_iou", "mean_dice"):
+        assert encoded[metric] == pytest.approx(original[metric])
+
+    pred_matched, gt_matched, _ = match(pred_codes, gt_codes, iou_threshold=0)
+    assert set(pred_encoder.inverse_transform(pred_matched)) <= set(pred_labels)
+    assert set(gt_encoder.inverse_transform(gt_matched)) <= set(gt_labels)
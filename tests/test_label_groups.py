@@ -0,0 +1,60 @@
+# Copyright (c) 2022, Skolkovo Institute of Science and Technology (Skoltech)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import numpy as np
+import pytest
+
+import evops.metrics.constants
+from evops.metrics import GroundTruth, iou, mean
+from evops.utils.LabelGroups import LabelGroups
+from evops.utils.MetricsUtils import __group_indices_by_labels
+
+
+def test_label_groups():
+    labels = np.array([7, -1, 7, 3, 3, 7, 1000])
+
+    groups = LabelGroups.from_labels(labels)
+
+    assert [-1, 3, 7, 1000] == groups.labels.tolist()
+    assert [0, 1, 3, 6, 7] == groups.offsets.tolist()
+    assert [0, 2, 5] == groups[2].tolist()
+    assert groups.indices is groups[2].base
+    assert {-1: [1], 3: [3, 4], 7: [0, 2, 5], 1000: [6]} == {
+        label: indices.tolist() for label, indices in groups
+    }
+
+
+@pytest.mark.parametrize("labels_amount", [10, 300, 70000])
+def test_group_indices_by_labels(labels_amount):
+    generator = np.random.default_rng(labels_amount)
+    labels = generator.integers(0, labels_amount, 100000) * 5
+
+    groups = __group_indices_by_labels(labels)
+
+    assert np.unique(labels).tolist() == list(groups.keys())
+    for label in list(groups.keys())[:20]:
+        assert np.flatnonzero(labels == label).tolist() == groups[label].tolist()
+
+
+def test_mean_groups_of_ground_truth():
+    evops.metrics.constants.UNSEGMENTED_LABEL = 0
+    generator = np.random.default_rng(0)
+    pred_labels = generator.integers(0, 6, 3000)
+    gt_labels = generator.integers(0, 4, 3000)
+
+    def custom_iou(pred_indices, gt_indices):
+        return iou(pred_indices, gt_indices)
+
+    assert mean(pred_labels, gt_labels, iou) == pytest.approx(
+        mean(pred_labels, GroundTruth(gt_labels), custom_iou)
+    )
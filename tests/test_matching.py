@@ -0,0 +1,89 @@
+# Copyright (c) 2022, Skolkovo Institute of Science and Technology (Skoltech)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import numpy as np
+import pytest
+
+import evops.metrics.constants
+from evops.metrics import ContingencyMatrix, evaluate, match
+
+
+def test_match_optimal_beats_first_fit():
+    evops.metrics.constants.UNSEGMENTED_LABEL = 0
+
+    # First fit gives predicted plane 1 to ground truth plane 1 and leaves
+    # ground truth plane 2 without a match
+    pred_labels = np.array([1, 1, 1, 1, 2, 2])
+    gt_labels = np.array([1, 1, 2, 2, 1, 1])
+    contingency = ContingencyMatrix(pred_labels, gt_labels)
+
+    assert 1 == contingency.true_positive(0.3, "first_fit")
+    assert 2 == contingency.true_positive(0.3, "optimal")
+
+    pred_matched, gt_matched, pair_iou = match(pred_labels, gt_labels, "optimal", 0.3)
+    assert [1, 2] == pred_matched.tolist()
+    assert [2, 1] == gt_matched.tolist()
+    assert [0.5, 0.5] == pytest.approx(pair_iou)
+
+
+def test_match_greedy_by_score():
+    evops.metrics.constants.UNSEGMENTED_LABEL = 0
+
+    pred_labels = np.array([1, 2, 2, 2, 3, 3])
+    gt_labels = np.array([1, 1, 1, 1, 3, 3])
+
+    pred_matched, gt_matched, _ = match(pred_labels, gt_labels, "greedy", 0.2)
+    assert [2, 3] == pred_matched.tolist()
+    assert [1, 3] == gt_matched.tolist()
+
+    pred_matched, gt_matched, _ = match(pred_labels, gt_labels, "first_fit", 0.2)
+    assert [1, 3] == pred_matched.tolist()
+
+
+@pytest.mark.parametrize("matching", ["first_fit", "greedy", "optimal"])
+def test_match_one_to_one(matching):
+    evops.metrics.constants.UNSEGMENTED_LABEL = -1
+
+    generator = np.random.default_rng(0)
+    pred_labels = generator.integers(0, 30, 2000)
+    gt_labels = np.where(
+        generator.random(2000) < 0.6, pred_labels // 2, generator.integers(0, 30, 2000)
+    )
+    pred_matched, gt_matched, pair_iou = match(pred_labels, gt_labels, matching, 0.1)
+    optimal_amount = match(pred_labels, gt_labels, "optimal", 0.1)[0].size
+
+    assert np.unique(pred_matched).size == pred_matched.size
+    assert np.unique(gt_matched).size == gt_matched.size
+    assert np.all(pair_iou >= 0.1)
+    assert optimal_amount >= pred_matched.size
+
+
+def test_evaluate_matching():
+    evops.metrics.constants.IOU_THRESHOLD = 0.3
+    evops.metrics.constants.UNSEGMENTED_LABEL = 0
+
+    pred_labels = np.array([1, 1, 1, 1, 2, 2])
+    gt_labels = np.array([1, 1, 2, 2, 1, 1])
+
+    assert 0.5 == pytest.approx(evaluate(pred_labels, gt_labels)["recall"])
+    assert 1 == pytest.approx(
+        evaluate(pred_labels, gt_labels, matching="optimal")["precision"]
+    )
+
+    with pytest.raises(AssertionError) as excinfo:
+        evaluate(pred_labels, gt_labels, matching="hungarian")
+
+    assert (
+        str(excinfo.value)
+        == "Incorrect name of matching strategy, expected one of first_fit, greedy, optimal"
+    )
@@ -40,7 +40,10 @@ def test_mean_pred_labels_assert():
         metric = iou
         mean(pred_labels, gt_labels, metric)
 
-    assert str(excinfo.value) == "Incorrect predicted label array size, expected (n)"
+    assert (
+        str(excinfo.value)
+        == "Incorrect predicted label array size, expected (n) or organized (h, w)"
+    )
 
 
 def test_mean_gt_labels_assert():
@@ -51,7 +54,10 @@ def test_mean_gt_labels_assert():
         metric = iou
         mean(pred_labels, gt_labels, metric)
 
-    assert str(excinfo.value) == "Incorrect ground truth label array size, expected (n)"
+    assert (
+        str(excinfo.value)
+        == "Incorrect ground truth label array size, expected (n) or organized (h, w)"
+    )
 
 
 def test_mean_iou_real_data():
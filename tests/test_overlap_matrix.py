@@ -0,0 +1,80 @@
+# Copyright (c) 2022, Skolkovo Institute of Science and Technology (Skoltech)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import numpy as np
+import pytest
+
+import evops.metrics.constants
+from evops.metrics import dice, dice_matrix, iou, iou_matrix
+
+
+def __set_iou(first_indices, second_indices):
+    intersection = np.intersect1d(first_indices, second_indices).size
+    return intersection / np.union1d(first_indices, second_indices).size
+
+
+def test_matrices_of_labels():
+    evops.metrics.constants.UNSEGMENTED_LABEL = 0
+    generator = np.random.default_rng(0)
+    pred_labels = generator.integers(0, 6, 400)
+    gt_labels = generator.integers(0, 4, 400) * 5
+
+    result = iou_matrix(pred_labels, gt_labels)
+
+    assert (5, 3) == result.shape
+    for row, pred_label in enumerate(range(1, 6)):
+        for column, gt_label in enumerate((5, 10, 15)):
+            assert result[row, column] == pytest.approx(
+                __set_iou(
+                    np.flatnonzero(pred_labels == pred_label),
+                    np.flatnonzero(gt_labels == gt_label),
+                )
+            )
+    assert 2 * result / (1 + result) == pytest.approx(
+        dice_matrix(pred_labels, gt_labels)
+    )
+
+
+def test_matrices_of_index_sets():
+    generator = np.random.default_rng(1)
+    # Sets of one side overlap, are unsorted and have repeated indices
+    pred_sets = [generator.integers(0, 300, size) for size in (50, 120, 1, 80)]
+    gt_sets = [np.arange(0, 100), np.arange(90, 250), np.array([], np.int64)]
+
+    result = iou_matrix(pred_sets, gt_sets)
+
+    assert (4, 3) == result.shape
+    for row, pred_indices in enumerate(pred_sets):
+        for column, gt_indices in enumerate(gt_sets):
+            assert result[row, column] == pytest.approx(
+                __set_iou(pred_indices, gt_indices)
+            )
+    assert (0, 3) == dice_matrix([], gt_sets).shape
+
+
+def test_sorted_pair_fast_path():
+    first_indices = np.array([1, 4, 5, 9, 12])
+    second_indices = np.array([0, 4, 5, 12, 13, 14])
+
+    assert 3 / 8 == pytest.approx(iou(first_indices, second_indices))
+    assert 6 / 11 == pytest.approx(dice(first_indices, second_indices))
+    assert 3 / 8 == pytest.approx(
+        iou(first_indices[::-1].copy(), np.repeat(second_indices, 2))
+    )
+
+
+def test_mixed_inputs():
+    with pytest.raises(AssertionError):
+        iou_matrix([np.arange(3)], np.arange(3))
+    with pytest.raises(AssertionError):
+        iou_matrix(np.arange(3), np.arange(4))
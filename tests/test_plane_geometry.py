@@ -0,0 +1,141 @@
+# Copyright (c) 2022, Skolkovo Institute of Science and Technology (Skoltech)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import numpy as np
+import pytest
+
+from evops.metrics import EvaluationConfig, plane_fits, plane_geometry
+
+
+def __planes_cloud(seed: int, planes_amount: int = 4, plane_size: int = 600):
+    generator = np.random.default_rng(seed)
+    normals = generator.normal(size=(planes_amount, 3))
+    normals /= np.linalg.norm(normals, axis=1)[:, np.newaxis]
+    points = []
+    for normal in normals:
+        first_axis = np.cross(normal, generator.normal(size=3))
+        first_axis /= np.linalg.norm(first_axis)
+        second_axis = np.cross(normal, first_axis)
+        coordinates = generator.uniform(-2, 2, (plane_size, 2))
+        distances = generator.normal(scale=0.01, size=(plane_size, 1))
+        points.append(
+            generator.uniform(-50, 50, 3)
+            + coordinates[:, :1] * first_axis
+            + coordinates[:, 1:] * second_axis
+            + distances * normal
+        )
+    labels = np.repeat(np.arange(1, planes_amount + 1), plane_size)
+
+    return np.concatenate(points), labels, normals
+
+
+def test_plane_fits():
+    points, labels, normals = __planes_cloud(0)
+    labels[::50] = 0
+
+    table = plane_fits(points, labels, EvaluationConfig(unsegmented_labels=0))
+
+    assert [1, 2, 3, 4] == table["label"].tolist()
+    assert [588] * 4 == table["size"].tolist()
+    assert np.abs(np.sum(table["normal"] * normals, axis=1)) == pytest.approx(
+        1, abs=1e-3
+    )
+    assert table["rmse"] == pytest.approx(0.01, rel=0.2)
+    assert table["fitted"].all()
+    for plane in table:
+        plane_points = points[labels == plane["label"]]
+        assert plane["centroid"] == pytest.approx(plane_points.mean(axis=0))
+
+
+def test_plane_fits_of_few_points():
+    points, labels, _ = __planes_cloud(3, planes_amount=2, plane_size=10)
+    labels[2:10] = 3
+
+    table = plane_fits(points, labels, EvaluationConfig(unsegmented_labels=0))
+
+    assert [1, 2, 3] == table["label"].tolist()
+    assert [False, True, True] == table["fitted"].tolist()
+    assert np.isnan(table["normal"][0]).all()
+    assert np.isnan(table["rmse"][0])
+    assert table["centroid"][0] == pytest.approx(points[:2].mean(axis=0))
+
+
+def test_plane_geometry_brute_force():
+    points, gt_labels, _ = __planes_cloud(1)
+    pred_labels = gt_labels.copy()
+    pred_labels[:400] = 2
+    config = EvaluationConfig(unsegmented_labels=0, iou_threshold=0.5)
+
+    table = plane_geometry(points, pred_labels, gt_labels, config=config)
+
+    assert [2, 3, 4] == table["pred_label"].tolist()
+    assert [2, 3, 4] == table["gt_label"].tolist()
+    fits = {
+        name: {plane["label"]: plane for plane in plane_fits(points, labels, config)}
+        for name, labels in (("pred", pred_labels), ("gt", gt_labels))
+    }
+    for pair in table:
+        pred_plane = fits["pred"][pair["pred_label"]]
+        gt_plane = fits["gt"][pair["gt_label"]]
+        pred_points = points[pred_labels == pair["pred_label"]]
+        distances = (pred_points - gt_plane["centroid"]) @ gt_plane["normal"]
+        cosine = abs(pred_plane["normal"] @ gt_plane["normal"])
+        assert np.degrees(np.arccos(min(cosine, 1))) == pytest.approx(
+            pair["normal_angle"], abs=1e-6
+        )
+        assert np.abs(distances.mean()) == pytest.approx(pair["centroid_distance"])
+        assert np.sqrt(np.mean(distances**2)) == pytest.approx(pair["rmse"])
+        assert pred_plane["rmse"] == pytest.approx(pair["pred_rmse"])
+    assert table["normal_angle"][1:] == pytest.approx(0, abs=1e-6)
+    assert table["normal_angle"][0] > 1
+
+
+def test_plane_geometry_organized_points():
+    points, gt_labels, _ = __planes_cloud(2, plane_size=240)
+    pred_labels = np.where(np.arange(gt_labels.size) % 7 == 0, 0, gt_labels)
+    config = EvaluationConfig(unsegmented_labels=0, iou_threshold=0.5)
+
+    expected = plane_geometry(points, pred_labels, gt_labels, config=config)
+    result = plane_geometry(
+        points.reshape(24, 40, 3),
+        pred_labels.reshape(24, 40),
+        gt_labels.reshape(24, 40),
+        config=config,
+    )
+
+    assert 4 == expected.size
+    for field in expected.dtype.names:
+        assert expected[field] == pytest.approx(result[field])
+
+
+def test_plane_geometry_asserts():
+    with pytest.raises(AssertionError) as excinfo:
+        plane_geometry(np.zeros((4, 2)), np.ones(4), np.ones(4))
+    assert (
+        str(excinfo.value)
+        == "Incorrect point array size, expected (n, 3) or organized (h, w, 3)"
+    )
+
+    with pytest.raises(AssertionError) as excinfo:
+        plane_fits(np.zeros((8, 3)), np.ones((2, 2, 2)))
+    assert (
+        str(excinfo.value)
+        == "Incorrect label array size, expected (n) or organized (h, w)"
+    )
+
+    with pytest.raises(AssertionError) as excinfo:
+        plane_fits(np.zeros((5, 3)), np.ones(4))
+    assert (
+        str(excinfo.value)
+        == "Point and label arrays must have the same amount of points"
+    )
@@ -0,0 +1,76 @@
+# Copyright (c) 2022, Skolkovo Institute of Science and Technology (Skoltech)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import json
+
+import numpy as np
+
+from evops.metrics import EvaluationConfig, Profiler, evaluate, mean, multi_value
+
+
+def __labels(seed: int):
+    generator = np.random.default_rng(seed)
+    return generator.integers(0, 10, 5000)
+
+
+def test_profiler_stages():
+    config = EvaluationConfig(unsegmented_labels=0, iou_threshold=0.5)
+    pred_labels, gt_labels = __labels(0), __labels(1)
+
+    with Profiler() as profiler:
+        evaluate(pred_labels, gt_labels, config=config)
+
+    names = [record["name"] for record in profiler.records]
+    assert "evaluate" == names[-1]
+    assert {"asserts", "contingency", "encode_labels", "match"} <= set(names)
+    evaluate_record = profiler.records[-1]
+    assert 0 == evaluate_record["depth"]
+    assert 5000 == evaluate_record["values"]["pred_labels_size"]
+    contingency_record = profiler.records[names.index("contingency")]
+    assert 9 == contingency_record["values"]["pred_planes"]
+    assert all(
+        record["duration"] <= evaluate_record["duration"] for record in profiler.records
+    )
+    assert 1 == profiler.summary()["evaluate"]["calls"]
+
+
+def test_profiler_disabled():
+    pred_labels, gt_labels = __labels(2), __labels(3)
+    with Profiler() as profiler:
+        multi_value(pred_labels, gt_labels)
+    records_amount = len(profiler.records)
+
+    multi_value(pred_labels, gt_labels)
+
+    assert not Profiler.enabled()
+    assert records_amount == len(profiler.records)
+    with Profiler.stage("disabled"):
+        Profiler.annotate(points=1)
+    assert records_amount == len(profiler.records)
+
+
+def test_profiler_export(tmp_path):
+    pred_labels, gt_labels = __labels(4), __labels(5)
+
+    with Profiler(memory=True) as profiler:
+        with Profiler.stage("frame", frame=7):
+            mean(pred_labels, gt_labels, lambda pred, gt: 0.5)
+    profiler.export(tmp_path / "trace.json")
+
+    with open(tmp_path / "trace.json") as file:
+        events = json.load(file)["traceEvents"]
+    assert "frame" == events[-1]["name"]
+    assert all(event["ph"] == "X" and event["dur"] >= 0 for event in events)
+    assert 7 == events[-1]["args"]["frame"]
+    assert all(event["args"]["memory_peak"] >= 0 for event in events)
+    assert "group_indices" in [event["name"] for event in events]
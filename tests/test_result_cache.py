@@ -0,0 +1,180 @@
+# Copyright (c) 2022, Skolkovo Institute of Science and Technology (Skoltech)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+from concurrent.futures import ThreadPoolExecutor
+
+import os
+import threading
+
+import numpy as np
+import pytest
+
+import evops
+import evops.metrics.constants
+from evops.metrics import (
+    EvaluationConfig,
+    GroundTruth,
+    ResultCache,
+    average_precision,
+    evaluate,
+    evaluate_dataset,
+    iou,
+    mean,
+    precision,
+)
+
+
+def __frames(frames_amount: int):
+    generator = np.random.default_rng(frames_amount)
+    return [
+        (generator.integers(0, 8, 1000), generator.integers(0, 6, 1000))
+        for _ in range(frames_amount)
+    ]
+
+
+def __stored_results(directory):
+    return sorted(
+        name
+        for _, _, names in os.walk(directory)
+        for name in names
+        if name.endswith(".pkl")
+    )
+
+
+def test_result_cache_keys(tmp_path):
+    evops.metrics.constants.UNSEGMENTED_LABEL = 0
+    evops.metrics.constants.IOU_THRESHOLD = 0.5
+    (pred_labels, gt_labels), _ = __frames(2)
+    config = EvaluationConfig(unsegmented_labels=0, iou_threshold=0.5)
+
+    with ResultCache(tmp_path) as cache:
+        expected = evaluate(pred_labels, gt_labels, config=config)
+        stored = __stored_results(tmp_path)
+        assert expected == evaluate(pred_labels, gt_labels, config=config)
+        assert stored == __stored_results(tmp_path)
+
+        evaluate(pred_labels, gt_labels, config=config.replace(iou_threshold=0.6))
+        evaluate(pred_labels.astype(np.int32), gt_labels, config=config)
+        precision(pred_labels, gt_labels, "iou")
+        evops.metrics.constants.IOU_THRESHOLD = 0.6
+        precision(pred_labels, gt_labels, "iou")
+        evops.metrics.constants.IOU_THRESHOLD = 0.5
+        mean(pred_labels, gt_labels, iou)
+        mean(pred_labels, gt_labels, iou)
+        assert 6 == len(__stored_results(tmp_path))
+        assert cache is ResultCache.active()
+
+    assert ResultCache.active() is None
+    assert 1 == len(stored)
+
+
+def test_result_cache_key_values(tmp_path, monkeypatch):
+    (pred_labels, gt_labels), _ = __frames(2)
+    cache = ResultCache(tmp_path)
+    ground_truth = GroundTruth(gt_labels)
+    key = cache.key("frame", pred_labels, gt_labels)
+
+    assert key == cache.key("frame", pred_labels, ground_truth)
+    assert ground_truth.labels_digest() is ground_truth.labels_digest()
+    assert cache.key("mean", iou) is not None
+    assert cache.key("classes", {1: "a", "b": 2}) == cache.key(
+        "classes", {"b": 2, 1: "a"}
+    )
+    monkeypatch.setattr(evops, "__version__", "0.0.0")
+    assert key != cache.key("frame", pred_labels, gt_labels)
+
+
+def test_result_cache_average_precision(tmp_path, monkeypatch):
+    ((pred_labels, gt_labels),) = __frames(1)
+
+    with ResultCache(tmp_path):
+        expected = average_precision(pred_labels, gt_labels)
+        stored = __stored_results(tmp_path)
+        assert expected == average_precision(pred_labels, gt_labels)
+        assert stored == __stored_results(tmp_path)
+
+        monkeypatch.setattr(
+            evops.metrics.constants, "AVERAGE_PRECISION_IOU_THRESHOLDS", (0.5,)
+        )
+        average_precision(pred_labels, gt_labels)
+        assert len(stored) < len(__stored_results(tmp_path))
+
+
+def test_result_cache_threads(tmp_path):
+    first, second = ResultCache(tmp_path / "first"), ResultCache(tmp_path / "second")
+    entered, exiting = threading.Barrier(2), threading.Barrier(2)
+
+    def use(cache):
+        with cache:
+            entered.wait()
+            active = ResultCache.active()
+            exiting.wait()
+        return active, ResultCache.active()
+
+    with first:
+        with ThreadPoolExecutor(2) as pool:
+            results = list(pool.map(use, (first, second)))
+            assert ResultCache.active() is first
+            assert pool.submit(ResultCache.active).result() is None
+
+    assert [(first, None), (second, None)] == results
+    assert ResultCache.active() is None
+
+
+@pytest.mark.parametrize("executor", ["thread", "process"])
+def test_result_cache_dataset(tmp_path, executor):
+    pred_frames, gt_frames = zip(*__frames(6))
+    config = EvaluationConfig(unsegmented_labels=0, iou_threshold=0.5)
+    expected = evaluate_dataset(pred_frames, gt_frames, config=config, workers=0)
+
+    with ResultCache(tmp_path):
+        first = evaluate_dataset(
+            pred_frames, gt_frames, config=config, workers=2, executor=executor
+        )
+        stored = __stored_results(tmp_path)
+        second = evaluate_dataset(
+            pred_frames, gt_frames, config=config, workers=2, executor=executor
+        )
+
+    assert 6 == len(stored)
+    assert stored == __stored_results(tmp_path)
+    for result in (first, second):
+        assert expected["frames"]["true_positive"].tolist() == (
+            result["frames"]["true_positive"].tolist()
+        )
+        assert expected["dataset"]["mean_iou"] == pytest.approx(
+            result["dataset"]["mean_iou"]
+        )
+
+
+def test_result_cache_eviction(tmp_path):
+    cache = ResultCache(tmp_path, max_bytes=20000)
+    for index in range(40):
+        key = cache.key("frame", np.full(100, index))
+        cache.put(key, np.zeros(100))
+        assert cache.get(key).tolist() == [0] * 100
+        os.utime(cache._ResultCache__path(key), ns=(index, index))
+    cache.evict()
+
+    stored_bytes = sum(
+        os.path.getsize(os.path.join(directory, name))
+        for directory, _, names in os.walk(tmp_path)
+        for name in names
+    )
+    assert stored_bytes <= 20000
+    assert cache.get(cache.key("frame", np.full(100, 39))) is not None
+    assert cache.get(cache.key("frame", np.full(100, 0))) is None
+    assert cache.key("frame", lambda: None) is None
+
+    cache.clear()
+    assert [] == __stored_results(tmp_path)
@@ -0,0 +1,120 @@
+# Copyright (c) 2022, Skolkovo Institute of Science and Technology (Skoltech)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import numpy as np
+import pytest
+
+import evops.metrics.constants
+from evops.metrics import (
+    ContingencyMatrix,
+    EvaluationConfig,
+    GroundTruth,
+    RunLengthLabels,
+    evaluate,
+    iou,
+    mean,
+    multi_value,
+)
+
+
+def __image_labels(seed: int, planes_amount: int = 6):
+    generator = np.random.default_rng(seed)
+    labels = np.zeros((48, 64), np.int64)
+    for label in range(1, planes_amount + 1):
+        top, left = generator.integers(0, 40), generator.integers(0, 56)
+        height, width = generator.integers(4, 24, 2)
+        labels[top : top + height, left : left + width] = label * 7
+    noise = generator.random(labels.shape) < 0.02
+    labels[noise] = generator.integers(0, planes_amount, noise.sum()) * 7
+
+    return labels
+
+
+def test_runs_of_labels():
+    labels = np.array([[3, 3, 0, 0], [0, 5, 5, 5]])
+
+    runs = RunLengthLabels.from_labels(labels)
+
+    assert [0, 2, 5] == runs.starts.tolist()
+    assert [3, 0, 5] == runs.values.tolist()
+    assert [2, 3, 3] == runs.lengths.tolist()
+    assert 8 == runs.size
+    assert labels.tolist() == runs.labels_array().tolist()
+    assert 0 == RunLengthLabels.from_labels(np.array([], np.int64)).values.size
+
+
+@pytest.mark.parametrize("sparse", [False, True])
+def test_organized_contingency(sparse):
+    for seed in range(3):
+        pred_labels = __image_labels(seed)
+        gt_labels = __image_labels(seed + 10)
+        expected = ContingencyMatrix(
+            pred_labels.reshape(-1), gt_labels.reshape(-1), 0, sparse
+        )
+
+        for pred, gt in (
+            (pred_labels, gt_labels),
+            (RunLengthLabels.from_labels(pred_labels), gt_labels),
+            (pred_labels, GroundTruth(gt_labels)),
+        ):
+            contingency = ContingencyMatrix(pred, gt, 0, sparse)
+            assert expected.pred_labels.tolist() == contingency.pred_labels.tolist()
+            assert expected.gt_sizes.tolist() == contingency.gt_sizes.tolist()
+            assert expected.intersection.tolist() == contingency.intersection.tolist()
+
+
+def test_organized_contingency_shape_assert():
+    labels = __image_labels(0)
+
+    for pred, gt in (
+        (labels, labels.T),
+        (RunLengthLabels.from_labels(labels), labels.reshape(-1)),
+    ):
+        with pytest.raises(AssertionError) as excinfo:
+            ContingencyMatrix(pred, gt)
+        assert "expected the same (h, w)" in str(excinfo.value)
+
+
+def test_evaluate_organized_labels():
+    config = EvaluationConfig(unsegmented_labels=0, iou_threshold=0.5)
+    for seed in range(3):
+        pred_labels = __image_labels(seed)
+        gt_labels = np.where(pred_labels % 2 == 0, pred_labels, 0)
+        expected = evaluate(
+            pred_labels.reshape(-1), gt_labels.reshape(-1), config=config
+        )
+
+        result = evaluate(
+            RunLengthLabels.from_labels(pred_labels),
+            RunLengthLabels.from_labels(gt_labels),
+            config=config,
+        )
+
+        for metric in ("precision", "recall", "fScore", "mean_iou", "mean_dice"):
+            assert expected[metric] == pytest.approx(result[metric])
+        assert expected["fScore"] == pytest.approx(
+            evaluate(pred_labels, gt_labels, config=config)["fScore"]
+        )
+
+
+def test_mean_organized_labels():
+    evops.metrics.constants.UNSEGMENTED_LABEL = 0
+    pred_labels = __image_labels(0)
+    gt_labels = __image_labels(1)
+
+    assert mean(pred_labels.reshape(-1), gt_labels.reshape(-1), iou) == pytest.approx(
+        mean(RunLengthLabels.from_labels(pred_labels), gt_labels, lambda *x: iou(*x))
+    )
+    assert multi_value(pred_labels.reshape(-1), gt_labels.reshape(-1)) == pytest.approx(
+        multi_value(pred_labels, gt_labels)
+    )
@@ -0,0 +1,108 @@
+# Copyright (c) 2022, Skolkovo Institute of Science and Technology (Skoltech)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import numpy as np
+import pytest
+
+import evops.metrics.constants
+from evops.metrics import (
+    ContingencyMatrix,
+    EvaluationConfig,
+    Evaluator,
+    dice,
+    iou,
+    match,
+    mean,
+    segment_tables,
+)
+
+
+def test_segment_tables():
+    evops.metrics.constants.IOU_THRESHOLD = 0.5
+    evops.metrics.constants.UNSEGMENTED_LABEL = 0
+    pred_labels = np.array([1, 1, 1, 1, 2, 2, 0, 0])
+    gt_labels = np.array([1, 1, 1, 1, 1, 1, 2, 2])
+
+    pred_table, gt_table = segment_tables(pred_labels, gt_labels, 0.6)
+
+    assert [1, 2] == pred_table["label"].tolist()
+    assert [4, 2] == pred_table["size"].tolist()
+    assert [1, 1] == pred_table["overlaps"].tolist()
+    assert [1, 1] == pred_table["best_label"].tolist()
+    assert [4 / 6, 2 / 6] == pytest.approx(pred_table["best_iou"])
+    assert [8 / 10, 4 / 8] == pytest.approx(pred_table["best_dice"])
+    assert [True, False] == pred_table["matched"].tolist()
+    assert [True, False] == pred_table["correctly_segmented"].tolist()
+    assert [False, False] == pred_table["under_segmented"].tolist()
+    assert [False, True] == pred_table["noise"].tolist()
+
+    assert [6, 2] == gt_table["size"].tolist()
+    assert [2, 0] == gt_table["overlaps"].tolist()
+    assert [1, 0] == gt_table["matched_label"].tolist()
+    assert [4 / 6, 0] == pytest.approx(gt_table["matched_iou"])
+    assert [True, False] == gt_table["over_segmented"].tolist()
+    assert [False, True] == gt_table["missed"].tolist()
+
+
+@pytest.mark.parametrize("sparse", [False, True])
+def test_segment_tables_agree_with_metrics(sparse):
+    evops.metrics.constants.IOU_THRESHOLD = 0.25
+    evops.metrics.constants.UNSEGMENTED_LABEL = 0
+    generator = np.random.default_rng(0)
+    gt_labels = generator.integers(0, 30, 3000)
+    pred_labels = np.where(
+        generator.random(3000) < 0.7, gt_labels // 2, generator.integers(0, 40, 3000)
+    )
+
+    contingency = ContingencyMatrix(pred_labels, gt_labels, sparse=sparse)
+    pred_table, gt_table = contingency.segment_tables(0.25, 0.5, "optimal")
+    multi_value_counts = contingency.multi_value_counts(0.5)
+
+    assert pred_table["best_iou"].mean() == pytest.approx(
+        mean(pred_labels, gt_labels, iou)
+    )
+    assert pred_table["best_dice"].mean() == pytest.approx(
+        mean(pred_labels, gt_labels, dice)
+    )
+    assert multi_value_counts["correctly_segmented"] == np.count_nonzero(
+        pred_table["correctly_segmented"]
+    )
+    for name, table in (
+        ("under_segmented", pred_table),
+        ("noise", pred_table),
+        ("over_segmented", gt_table),
+        ("missed", gt_table),
+    ):
+        assert multi_value_counts[name] == np.count_nonzero(table[name])
+
+    matched_pred, matched_gt, _ = match(pred_labels, gt_labels, "optimal", 0.25)
+    assert sorted(zip(matched_pred, matched_gt)) == sorted(
+        zip(
+            pred_table["label"][pred_table["matched"]],
+            pred_table["matched_label"][pred_table["matched"]],
+        )
+    )
+
+
+def test_segment_tables_of_evaluator():
+    pred_labels = np.array([1, 1, 2, 2, 3])
+    gt_labels = np.array([1, 1, 1, 2, 2])
+
+    pred_table, gt_table = Evaluator(
+        EvaluationConfig(unsegmented_labels=3, iou_threshold=0.5)
+    ).segment_tables(pred_labels, gt_labels)
+
+    assert [1, 2] == pred_table["label"].tolist()
+    assert [True, False] == pred_table["matched"].tolist()
+    assert [1, 2] == gt_table["label"].tolist()
+    assert [3, 2] == gt_table["size"].tolist()
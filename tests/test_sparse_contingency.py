@@ -0,0 +1,92 @@
+# Copyright (c) 2022, Skolkovo Institute of Science and Technology (Skoltech)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import numpy as np
+import pytest
+
+import evops.metrics.constants
+from evops.metrics import ContingencyMatrix
+
+
+def test_sparse_pairs():
+    evops.metrics.constants.UNSEGMENTED_LABEL = 0
+
+    pred_labels = np.array([1, 1, 3, 3, 0])
+    gt_labels = np.array([2, 2, 0, 3, 3])
+    contingency = ContingencyMatrix(pred_labels, gt_labels, sparse=True)
+    pair_pred, pair_gt, pair_intersection = contingency.pairs()
+
+    assert contingency.sparse
+    assert [0, 1] == pair_pred.tolist()
+    assert [0, 1] == pair_gt.tolist()
+    assert [2, 1] == pair_intersection.tolist()
+    assert [[2, 0], [0, 1]] == contingency.intersection.tolist()
+
+
+def test_sparse_chosen_for_many_planes():
+    evops.metrics.constants.UNSEGMENTED_LABEL = -1
+
+    labels = np.arange(100000)
+
+    assert ContingencyMatrix(labels, labels).sparse
+    assert not ContingencyMatrix(labels % 10, labels % 7).sparse
+
+
+def test_sparse_many_planes_metrics():
+    evops.metrics.constants.IOU_THRESHOLD = 0.5
+    evops.metrics.constants.UNSEGMENTED_LABEL = -1
+
+    pred_labels = np.arange(100000) // 2
+    gt_labels = np.arange(100000) // 4
+    contingency = ContingencyMatrix(pred_labels, gt_labels)
+    result = contingency.multi_value()
+
+    assert 25000 == contingency.true_positive()
+    assert 0.5 == pytest.approx(contingency.mean("iou"))
+    assert 0 == pytest.approx(result["precision"])
+    assert 1 == pytest.approx(result["over_segmented"])
+
+
+@pytest.mark.parametrize("iou_threshold", [0, 0.3, 0.5, 0.75])
+def test_sparse_equals_dense(iou_threshold):
+    evops.metrics.constants.UNSEGMENTED_LABEL = 0
+
+    generator = np.random.default_rng(0)
+    pred_labels = generator.integers(0, 20, 500)
+    gt_labels = np.where(
+        generator.random(500) < 0.7, pred_labels, generator.integers(0, 20, 500)
+    )
+    dense = ContingencyMatrix(pred_labels, gt_labels, sparse=False)
+    sparse = ContingencyMatrix(pred_labels, gt_labels, sparse=True)
+
+    assert dense.true_positive(iou_threshold) == sparse.true_positive(iou_threshold)
+    assert dense.mean("dice") == pytest.approx(sparse.mean("dice"))
+    assert dense.multi_value_counts(iou_threshold) == sparse.multi_value_counts(
+        iou_threshold
+    )
+
+
+def test_sparse_real_data():
+    evops.metrics.constants.IOU_THRESHOLD = 0.5
+    evops.metrics.constants.UNSEGMENTED_LABEL = 0
+
+    pred_labels = np.load("tests/data/pred_0.npy")
+    gt_labels = np.load("tests/data/gt_0.npy")
+    contingency = ContingencyMatrix(pred_labels, gt_labels, sparse=True)
+    result = contingency.multi_value()
+
+    assert 0.8 == pytest.approx(contingency.precision(), 0.01)
+    assert 0.235 == pytest.approx(contingency.recall(), 0.01)
+    assert 0.87 == pytest.approx(contingency.mean("iou"), 0.01)
+    assert 0.176 == pytest.approx(result["over_segmented"], 0.01)
+    assert 0.76 == pytest.approx(result["missed"], 0.01)
@@ -0,0 +1,90 @@
+# Copyright (c) 2022, Skolkovo Institute of Science and Technology (Skoltech)
+#
+# Licensed under the Apache License, Version 2.0 (the "License");
+# you may not use this file except in compliance with the License.
+# You may obtain a copy of the License at
+#
+#     http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing, software
+# distributed under the License is distributed on an "AS IS" BASIS,
+# WITHOUT WARRANTIES OR CONDITIONS OF ANY KIND, either express or implied.
+# See the License for the specific language governing permissions and
+# limitations under the License.
+import numpy as np
+import pytest
+
+from evops.metrics import (
+    EvaluationConfig,
+    confidence_intervals,
+    evaluate_batch,
+    paired_test,
+)
+
+config = EvaluationConfig(unsegmented_labels=0, iou_threshold=0.5)
+
+
+def __results(seed: int, noise: float, frames_amount: int = 60):
+    generator = np.random.default_rng(seed)
+    gt_frames = [np.repeat(np.arange(1, 9), 50) for _ in range(frames_amount)]
+    pred_frames = []
+    for gt_labels in gt_frames:
+        pred_labels = gt_labels.copy()
+        changed = generator.random(gt_labels.size) < generator.random() * noise
+        pred_labels[changed] = generator.integers(0, 12, changed.sum())
+        pred_frames.append(pred_labels)
+
+    return evaluate_batch(pred_frames, gt_frames, config=config)
+
+
+def test_confidence_intervals():
+    results = __results(0, 0.8)
+    frames = results["frames"]
+
+    intervals = confidence_intervals(results, resamples=2000, seed=1)
+
+    assert results["dataset"]["fScore"] == pytest.approx(intervals["fScore"]["value"])
+    assert results["dataset"]["micro"]["multi_value"]["noise"] == pytest.approx(
+        intervals["micro"]["multi_value"]["noise"]["value"]
+    )
+    for metric in ("precision", "mean_iou"):
+        assert intervals[metric]["low"] <= intervals[metric]["value"]
+        assert intervals[metric]["value"] <= intervals[metric]["high"]
+
+    generator = np.random.default_rng(1)
+    resampled = generator.integers(0, 60, (2000, 60))
+    micro_recall = frames["true_positive"][resampled].sum(axis=1) / frames["gt_amount"][
+        resampled
+    ].sum(axis=1)
+    assert np.quantile(micro_recall, [0.025, 0.975]) == pytest.approx(
+        [intervals["micro"]["recall"]["low"], intervals["micro"]["recall"]["high"]]
+    )
+
+
+def test_paired_test():
+    results = __results(0, 0.8)
+    better_results = __results(0, 0.2)
+
+    same = paired_test(results, results, resamples=500, seed=0)
+    different = paired_test(better_results["frames"], results, resamples=500, seed=0)
+
+    assert 0 == same["micro"]["fScore"]["difference"]
+    assert 1 == same["micro"]["fScore"]["p_value"]
+    assert different["mean_iou"]["difference"] > 0
+    assert different["mean_iou"]["low"] > 0
+    assert different["mean_iou"]["p_value"] < 0.01
+    assert results["dataset"]["recall"] - better_results["dataset"][
+        "recall"
+    ] == pytest.approx(-different["recall"]["difference"])
+
+
+def test_statistics_asserts():
+    results = __results(0, 0.5, frames_amount=3)
+
+    with pytest.raises(AssertionError) as excinfo:
+        confidence_intervals(results, confidence=1)
+    assert str(excinfo.value) == "Confidence must be between 0 and 1"
+
+    with pytest.raises(AssertionError) as excinfo:
+        paired_test(results, __results(0, 0.5, frames_amount=4))
+    assert str(excinfo.value) == "Compared results must have the same amount of frames"